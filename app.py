@@ -1,15 +1,29 @@
 #!/usr/bin/env python3
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, Response, request, jsonify, render_template, send_from_directory
+from werkzeug.http import http_date
 import uuid
 import os
 import json
+import mimetypes
 import random
+import signal
+import threading
 import time
-from datetime import datetime, timedelta
 
-app = Flask(__name__)
+from config import CACHE_SETTINGS, DATA_DIR, GAME_SETTINGS
+from utils.game_store import get_game_store, GameNotFoundError
+from utils.asset_manifest import AssetManifest
+from utils.metrics import metrics, install_request_hooks
+from core import lifecycle, stats_engine
+from core.turn_ring import TurnRing, is_eliminated
+from utils.stats_aggregator import get_stats_aggregator
+from utils.vote_scheduler import DeadlineScheduler
+
+# /static/ bedient versioned_static (Cache-Header, vorkomprimierte Varianten)
+# statt Flasks eingebauter Static-Route, die sonst Vorrang hätte
+app = Flask(__name__, static_folder=None)
+install_request_hooks(app)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATA_DIR = os.path.join(BASE_DIR, "games")
 SECRET_WORDS = [
     "Ampel", "Ananas", "Badehose", "Ballon", "Banane", "Banjo", "Besen", "Besenstiel", "Bleistift", "Blitz",
     "Brille", "Brunnen", "Buch", "Drachen", "Eimer", "Einhorn", "Eule", "Fernbedienung", "Feuerzeug", "Flasche",
@@ -26,56 +40,148 @@ SECRET_WORDS = [
 if not os.path.exists(DATA_DIR):
     os.makedirs(DATA_DIR)
 
+game_store = get_game_store()
+stats_aggregator = get_stats_aggregator()
+
+class GameActionError(Exception):
+    """Ungültige Spielaktion - bricht die laufende Transaktion ohne Speichern ab"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+@app.errorhandler(GameActionError)
+def handle_game_action_error(e):
+    return jsonify({"error": e.message}), e.status_code
+
+@app.errorhandler(GameNotFoundError)
+def handle_game_not_found(e):
+    return jsonify({"error": "game not found"}), 404
+
 # ===== CACHE-BUSTING FUNKTIONEN =====
 
+asset_manifest = AssetManifest(os.path.join(BASE_DIR, 'static', 'version_manifest.json'),
+                               dist_dir=CACHE_SETTINGS['fingerprint_dir'],
+                               bundle_sources=CACHE_SETTINGS['bundles'],
+                               vendor=CACHE_SETTINGS['vendor'])
+
 def get_app_version():
     """Gibt die aktuelle App-Version zurück"""
-    try:
-        with open(os.path.join(BASE_DIR, 'static', 'version_manifest.json'), 'r') as f:
-            manifest = json.load(f)
-        return manifest.get('global_version', '1')
-    except:
-        return str(int(time.time()))[:8]
+    return asset_manifest.info()["version"]
 
 def get_versioned_static_url(asset_path):
     """Gibt versionierte URL für statische Assets zurück"""
-    try:
-        with open(os.path.join(BASE_DIR, 'static', 'version_manifest.json'), 'r') as f:
-            manifest = json.load(f)
-
-        clean_path = asset_path.lstrip('/')
-        if clean_path in manifest.get("files", {}):
-            return f"/{manifest['files'][clean_path]['versioned_path']}"
-        else:
-            version = manifest.get("global_version", "1")
-            return f"/{asset_path}?v={version}"
-    except:
-        return f"/{asset_path}?v={get_app_version()}"
+    return asset_manifest.url(asset_path)
 
 def get_build_time():
     """Gibt Build-Zeit zurück"""
+    return asset_manifest.info()["build_time"]
+
+# Templates: versioned_url() und bundle_urls() als Jinja-Globals, Version und
+# die fertige Asset-Tabelle (asset_urls) pro Rendern aus dem aktuellen Manifest
+app.jinja_env.globals["versioned_url"] = get_versioned_static_url
+app.jinja_env.globals["bundle_urls"] = asset_manifest.bundle_urls
+
+@app.context_processor
+def inject_version():
+    info = asset_manifest.info()
+    return {"app_version": info["version"], "build_time": info["build_time"],
+            "asset_urls": asset_manifest.urls}
+
+# Nach einem Deploy: kill -HUP <pid> lädt das Manifest neu
+if hasattr(signal, "SIGHUP"):
     try:
-        with open(os.path.join(BASE_DIR, 'static', 'version_manifest.json'), 'r') as f:
-            manifest = json.load(f)
-        return manifest.get('build_time', 'unknown')
-    except:
-        return time.strftime('%Y-%m-%dT%H:%M:%S')
+        signal.signal(signal.SIGHUP, lambda signum, frame: asset_manifest.reload())
+    except ValueError:  # nicht im Haupt-Thread importiert
+        pass
 
 # ===== HELPER FUNCTIONS FOR VOTING SYSTEM =====
 
-def check_vote_timeout(game_data):
-    """Prüft ob Vote abgelaufen ist und beendet es automatisch"""
+def is_vote_expired(game_data):
+    """Prüft ohne Seiteneffekte ob ein aktives Vote abgelaufen ist"""
     votes = game_data.get("votes")
     if not votes or votes.get("status") != "active":
         return False
 
     elapsed = time.time() - votes.get("started_at", 0)
-    if elapsed >= votes.get("duration", 30):
-        # Vote automatisch beenden
-        process_vote_result(game_data)
-        votes["status"] = "completed"
-        return True
-    return False
+    return elapsed >= votes.get("duration", 30)
+
+def check_vote_timeout(game_data):
+    """Prüft ob Vote abgelaufen ist und beendet es automatisch"""
+    if not is_vote_expired(game_data):
+        return False
+
+    # Vote automatisch beenden
+    process_vote_result(game_data)
+    game_data["votes"]["status"] = "completed"
+    return True
+
+def seconds_until_vote_deadline(game_data):
+    """Sekunden bis ein aktives Vote abläuft (None ohne aktives Vote)"""
+    votes = game_data.get("votes")
+    if not votes or votes.get("status") != "active":
+        return None
+    return max(0, votes.get("started_at", 0) + votes.get("duration", 30) - time.time())
+
+def on_vote_deadline(game_id):
+    """Scheduler-Callback: beendet ein abgelaufenes Vote genau einmal
+
+    check_vote_timeout prüft unter dem Spiel-Lock erneut, ein bereits
+    beendetes, gelöschtes oder neu gestartetes Vote bleibt unberührt.
+    Der Commit weckt wartende SSE-Streams und Long-Polls.
+    """
+    game_data = game_store.get(game_id)
+    if game_data is None:
+        return
+
+    if is_vote_expired(game_data):
+        try:
+            game_store.update_game(game_id, check_vote_timeout)
+        except GameNotFoundError:
+            pass
+    else:
+        # Zu früh geweckt (Uhr-Auflösung) oder inzwischen ein neues Vote
+        schedule_vote_deadline(game_id, game_data)
+
+def schedule_vote_deadline(game_id, game_data=None):
+    """Plant das Ende des aktiven Votes eines Spiels ein"""
+    game_data = game_data or game_store.get(game_id)
+    remaining = seconds_until_vote_deadline(game_data) if game_data else None
+    if remaining is not None:
+        vote_scheduler.schedule(game_id, time.time() + remaining)
+
+def schedule_active_votes():
+    """Kaltstart: laufende Votes aus dem Speicher wieder einplanen"""
+    for summary in game_store.summaries(statuses=['started']):
+        schedule_vote_deadline(summary["id"])
+
+vote_scheduler = DeadlineScheduler(on_vote_deadline, name="vote-deadlines")
+
+metrics.gauge("suswords_active_games", "Games in lobby or started.",
+              lambda: stats_aggregator.totals()['active_games'])
+metrics.gauge("suswords_longpoll_waiting_clients", "Long-poll and SSE clients waiting for a game change.",
+              game_store.waiting_clients)
+metrics.gauge("suswords_vote_deadlines_pending", "Active votes waiting for their deadline.",
+              vote_scheduler.pending)
+
+def assign_roles_and_start(game_data):
+    """Wählt Wort und Impostor, verteilt Rollen und legt die Reihenfolge fest"""
+    game_data["status"] = "started"
+    game_data["word"] = random.choice(SECRET_WORDS)
+
+    player_ids = list(game_data["players"].keys())
+    impostor_id = random.choice(player_ids)
+    game_data["impostorId"] = impostor_id
+
+    for pid in player_ids:
+        role = "impostor" if pid == impostor_id else "normal"
+        game_data["players"][pid]["role"] = role
+
+    random.shuffle(player_ids)
+    game_data["turn_order"] = player_ids
+    TurnRing.create(game_data, player_ids)
+    lifecycle.mark_started(game_data)
 
 def process_vote_result(game_data):
     """Berechnet das Vote-Ergebnis nach Ablauf der Zeit"""
@@ -94,139 +200,57 @@ def process_vote_result(game_data):
     if vote_counts["up"] > vote_counts["down"]:
         # Spieler eliminieren
         suspect_id = votes_data["suspect"]
-        if suspect_id not in game_data.get("eliminated_players", []):
-            if "eliminated_players" not in game_data:
-                game_data["eliminated_players"] = []
-            game_data["eliminated_players"].append(suspect_id)
+        if not is_eliminated(game_data, suspect_id):
+            game_data.setdefault("eliminated_players", []).append(suspect_id)
             game_data["players"][suspect_id]["eliminated"] = True
+        # Aus dem Ring nehmen - war er dran, ist sein Nachfolger dran
+        update_turn_after_elimination(game_data, suspect_id)
 
         # Spiel-Ende prüfen
         if suspect_id == game_data.get("impostorId"):
             game_data["status"] = "finished"
             game_data["winner"] = "players"
             game_data["end_reason"] = "impostor_found"
+            lifecycle.mark_finished(game_data)
             votes_data["result"] = "impostor_eliminated"
         else:
             # Prüfen ob nur noch Impostor + 1 Spieler übrig
-            active_players = [pid for pid, p in game_data["players"].items()
-                            if not p.get("eliminated", False) and
-                            pid not in game_data.get("eliminated_players", [])]
+            active_players = TurnRing.of(game_data)
 
             # Check if impostor is still in game
-            impostor_id = game_data.get("impostorId")
-            impostor_still_in_game = (impostor_id in active_players)
+            impostor_still_in_game = game_data.get("impostorId") in active_players
 
             if impostor_still_in_game and len(active_players) <= 2:
                 game_data["status"] = "finished"
                 game_data["winner"] = "impostor"
                 game_data["end_reason"] = "not_enough_players"
+                lifecycle.mark_finished(game_data)
                 votes_data["result"] = "impostor_wins"
             else:
                 votes_data["result"] = "player_eliminated"
-                # Update turn order if needed
-                update_turn_after_elimination(game_data, suspect_id)
     else:
         votes_data["result"] = "vote_failed"
 
+    lifecycle.mark_vote_ended(game_data)
+
 def update_turn_after_elimination(game_data, eliminated_player_id):
-    """Aktualisiert die Spielreihenfolge nach einer Elimination"""
-    current_index = game_data.get("current_turn_index", 0)
-    turn_order = game_data.get("turn_order", [])
-
-    # Get updated active players after elimination
-    active_turn_order = [pid for pid in turn_order
-                       if not game_data["players"].get(pid, {}).get("eliminated", False)
-                       and pid not in game_data.get("eliminated_players", [])]
-
-    if active_turn_order:
-        # Get the current player
-        if current_index < len(turn_order):
-            current_player_id = turn_order[current_index]
-        else:
-            current_player_id = turn_order[0] if turn_order else None
-
-        # If current player was eliminated or is no longer in active turn order
-        if current_player_id not in active_turn_order or current_player_id == eliminated_player_id:
-            # Find the index of the current player in the original turn order
-            current_idx_in_original = -1
-            for i, pid in enumerate(turn_order):
-                if pid == current_player_id:
-                    current_idx_in_original = i
-                    break
-
-            # Find the next active player in the turn order
-            next_idx_in_original = (current_idx_in_original + 1) % len(turn_order)
-            attempts = 0
-            while attempts < len(turn_order):
-                next_player_id = turn_order[next_idx_in_original]
-                if next_player_id in active_turn_order:
-                    game_data["current_turn_index"] = next_idx_in_original
-                    break
-                next_idx_in_original = (next_idx_in_original + 1) % len(turn_order)
-                attempts += 1
+    """Aktualisiert die Spielreihenfolge nach einer Elimination
+
+    O(1) im Turn-Ring: der aktuelle Spieler bleibt dran, außer er wurde
+    selbst eliminiert - dann rückt sein Nachfolger auf.
+    """
+    TurnRing.of(game_data, persist=True).remove(eliminated_player_id)
 
 # ===== STATS & ANALYTICS FUNCTIONS =====
 
-# Erweiterte calculate_game_stats() Funktion für app.py
+# Berechnung in core/stats_engine.py, Zähler laufend im StatsAggregator
 
 def calculate_game_stats():
     """Berechnet umfassende Spielstatistiken inklusive Launch-Tracking"""
     try:
-        games = []
-        if os.path.exists(DATA_DIR):
-            for filename in os.listdir(DATA_DIR):
-                if filename.endswith('.json'):
-                    try:
-                        with open(os.path.join(DATA_DIR, filename), 'r') as f:
-                            game_data = json.load(f)
-                            games.append(game_data)
-                    except:
-                        continue
-
-        # Launch-Datum: 20. Mai 2025
-        from datetime import datetime, date
-        launch_date = date(2025, 5, 20)
-        today = date.today()
-        days_since_launch = (today - launch_date).days
-
-        total_games = len(games)
-        active_games = len([g for g in games if g.get('status') not in ['finished', 'abandoned']])
-        finished_games = len([g for g in games if g.get('status') == 'finished'])
-
-        # Spieler-Statistiken
-        total_players = 0
-        impostor_wins = 0
-        player_wins = 0
-
-        for game in games:
-            if game.get('status') == 'finished':
-                player_count = len(game.get('players', {}))
-                total_players += player_count
-
-                winner = game.get('winner')
-                if winner == 'impostor':
-                    impostor_wins += 1
-                elif winner == 'players':
-                    player_wins += 1
-
-        # Launch-Statistiken berechnen
-        launch_stats = calculate_launch_stats(games, launch_date)
-
-        # Timeline für letzte 30 Tage
-        timeline = calculate_timeline_stats(games, 30)
-
-        return {
-            'total_games': total_games,
-            'active_games': active_games,
-            'finished_games': finished_games,
-            'total_players': total_players,
-            'impostor_wins': impostor_wins,
-            'player_wins': player_wins,
-            'impostor_win_rate': round((impostor_wins / max(impostor_wins + player_wins, 1)) * 100, 1),
-            'timeline': timeline,
-            'launch_stats': launch_stats,
-            'days_since_launch': days_since_launch
-        }
+        # Laufende Zähler des Aggregators statt Scan über alle Spiele
+        return stats_engine.game_stats(stats_aggregator.totals(),
+                                       stats_aggregator.daily_buckets())
     except Exception as e:
         print(f"Error calculating stats: {e}")
         return {
@@ -248,189 +272,87 @@ def calculate_game_stats():
             'days_since_launch': 0
         }
 
-def calculate_launch_stats(games, launch_date):
-    """Berechnet Launch-spezifische Statistiken"""
-    from datetime import datetime, timedelta
-
-    today = datetime.now().date()
-    total_days = (today - launch_date).days + 1  # +1 um Launch-Tag mitzuzählen
-
-    # Tägliche Spiel-Counts
-    daily_counts = {}
-
-    for game in games:
-        try:
-            # Game ID oder Datei-Änderungszeit für Datum verwenden
-            game_file = os.path.join(DATA_DIR, f"{game.get('id', 'unknown')}.json")
-            if os.path.exists(game_file):
-                file_time = datetime.fromtimestamp(os.path.getmtime(game_file))
-                game_date = file_time.date()
-
-                # Nur Spiele seit Launch zählen
-                if game_date >= launch_date:
-                    daily_counts[game_date] = daily_counts.get(game_date, 0) + 1
-        except:
-            continue
-
-    # Statistiken berechnen
-    active_days = len([count for count in daily_counts.values() if count > 0])
-    total_games_since_launch = sum(daily_counts.values())
-    avg_games_per_day = total_games_since_launch / max(total_days, 1)
-
-    # Bester Tag finden
-    best_day = {'date': 'N/A', 'games': 0}
-    if daily_counts:
-        best_date = max(daily_counts, key=daily_counts.get)
-        best_day = {
-            'date': best_date.strftime('%d.%m.%Y'),
-            'games': daily_counts[best_date]
-        }
-
-    # Wachstumstrend (letzte 7 Tage)
-    growth_trend = []
-    for i in range(7):
-        date = today - timedelta(days=6-i)
-        if date >= launch_date:
-            games_count = daily_counts.get(date, 0)
-            growth_trend.append({
-                'date': date.strftime('%d.%m'),
-                'games': games_count
-            })
+def calculate_launch_stats(daily, launch_date):
+    """Berechnet Launch-spezifische Statistiken aus den Tages-Buckets"""
+    return stats_engine.launch_stats(daily, launch_date)
 
-    return {
-        'total_days': total_days,
-        'active_days': active_days,
-        'avg_games_per_day': round(avg_games_per_day, 1),
-        'best_day': best_day,
-        'growth_trend': growth_trend,
-        'total_games_since_launch': total_games_since_launch
-    }
-def calculate_timeline_stats(games, days=30):
-    """Berechnet Timeline-Statistiken für die letzten X Tage"""
+def calculate_timeline_stats(daily, days=30):
+    """Berechnet Timeline-Statistiken für die letzten X Tage aus den Tages-Buckets"""
     try:
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-
-        timeline = []
-
-        for i in range(days):
-            date = start_date + timedelta(days=i)
-            date_str = date.strftime('%Y-%m-%d')
-
-            # Spiele für diesen Tag zählen
-            games_today = 0
-            players_today = 0
-
-            for game in games:
-                # Einfache Heuristik: Game ID als Zeitstempel verwenden oder Datei-Änderungszeit
-                try:
-                    game_file = os.path.join(DATA_DIR, f"{game.get('id', 'unknown')}.json")
-                    if os.path.exists(game_file):
-                        file_time = datetime.fromtimestamp(os.path.getmtime(game_file))
-                        if file_time.date() == date.date():
-                            games_today += 1
-                            players_today += len(game.get('players', {}))
-                except:
-                    continue
-
-            timeline.append({
-                'date': date_str,
-                'games': games_today,
-                'players': players_today
-            })
-
-        return timeline
+        return stats_engine.timeline(daily, days)
     except Exception as e:
         print(f"Error calculating timeline: {e}")
         return []
 
 def get_cleanup_stats():
-    """Cleanup-Statistiken - Fallback wenn cleanup.py nicht verfügbar"""
+    """Cleanup-Statistiken aus dem Stats-Aggregator (nur aktive Spiele werden betrachtet)"""
     try:
-        # Versuche cleanup.py zu importieren
-        from cleanup import get_cleanup_stats as cleanup_get_stats
-        return cleanup_get_stats()
-    except ImportError:
-        # Fallback: Basic cleanup stats berechnen
-        try:
-            games = []
-            if os.path.exists(DATA_DIR):
-                for filename in os.listdir(DATA_DIR):
-                    if filename.endswith('.json'):
-                        try:
-                            with open(os.path.join(DATA_DIR, filename), 'r') as f:
-                                game_data = json.load(f)
-                                games.append(game_data)
-                        except:
-                            continue
-
-            total_games = len(games)
-            active_games = len([g for g in games if g.get('status') not in ['finished', 'abandoned']])
-            abandoned_candidates = 0
-            already_abandoned = len([g for g in games if g.get('status') == 'abandoned'])
-
-            # Einfache Age-Kategorisierung
-            now = time.time()
-            games_by_age = {'<1h': 0, '1-6h': 0, '6-24h': 0, '>24h': 0}
-
-            for game in games:
-                try:
-                    game_file = os.path.join(DATA_DIR, f"{game.get('id', 'unknown')}.json")
-                    if os.path.exists(game_file):
-                        file_time = os.path.getmtime(game_file)
-                        age_hours = (now - file_time) / 3600
-
-                        if age_hours < 1:
-                            games_by_age['<1h'] += 1
-                        elif age_hours < 6:
-                            games_by_age['1-6h'] += 1
-                        elif age_hours < 24:
-                            games_by_age['6-24h'] += 1
-                        else:
-                            games_by_age['>24h'] += 1
-                            if game.get('status') not in ['finished', 'abandoned']:
-                                abandoned_candidates += 1
-                except:
-                    continue
-
-            return {
-                'total_games': total_games,
-                'active_games': active_games,
-                'abandoned_candidates': abandoned_candidates,
-                'already_abandoned': already_abandoned,
-                'games_by_age': games_by_age
-            }
-        except Exception as e:
-            print(f"Error calculating cleanup stats: {e}")
-            return {
-                'total_games': 0,
-                'active_games': 0,
-                'abandoned_candidates': 0,
-                'already_abandoned': 0,
-                'games_by_age': {'<1h': 0, '1-6h': 0, '6-24h': 0, '>24h': 0}
-            }
+        return stats_aggregator.cleanup_stats()
+    except Exception as e:
+        print(f"Error calculating cleanup stats: {e}")
+        return {
+            'total_games': 0,
+            'active_games': 0,
+            'abandoned_candidates': 0,
+            'already_abandoned': 0,
+            'games_by_age': {'<1h': 0, '1-6h': 0, '6-24h': 0, '>24h': 0}
+        }
 
 # ===== STATIC ROUTES =====
 
 @app.route('/sw.js')
 def serve_sw():
-    return send_from_directory('.', 'sw.js', mimetype='application/javascript')
+    response = send_from_directory('.', 'sw.js', mimetype='application/javascript')
+    # Browser sollen Updates des Service Workers sofort sehen
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def send_static_asset(filename, max_age, immutable=False):
+    """Liefert eine Datei unter static/ aus, vorkomprimiert wenn möglich
+
+    Gibt es im Manifest eine vorkomprimierte Variante (.br/.gz), die der
+    Client per Accept-Encoding annimmt, wird diese Datei ausgeliefert.
+    send_from_directory reicht die Datei an wsgi.file_wrapper weiter
+    (sendfile beim WSGI-Server), sie wird nicht in Python gelesen.
+    """
+    variants = asset_manifest.encodings_for(filename)
+    encoding, served = None, filename
+    for candidate, path in variants:
+        if request.accept_encodings[candidate] > 0 and os.path.isfile(os.path.join(BASE_DIR, 'static', path)):
+            encoding, served = candidate, path
+            break
+
+    mimetype = mimetypes.guess_type(filename)[0] if encoding else None
+    response = send_from_directory('static', served, mimetype=mimetype)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if variants:
+        # Caches müssen je Accept-Encoding getrennt speichern
+        response.vary.add('Accept-Encoding')
+
+    response.headers['Cache-Control'] = f"public, max-age={max_age}{', immutable' if immutable else ''}"
+    response.headers['Expires'] = http_date(time.time() + max_age)
+    return response
 
 @app.route('/static/<path:filename>')
 def versioned_static(filename):
     """Serviert statische Dateien mit Cache-Headers"""
     try:
-        response = send_from_directory('static', filename)
-
-        # Aggressive Caching für versionierte Assets
         if request.args.get('v'):
-            response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'  # 1 Jahr
-            response.headers['Expires'] = 'Thu, 31 Dec 2025 23:59:59 GMT'
-        else:
-            # Kurzes Caching für unverlierte Assets
-            response.headers['Cache-Control'] = 'public, max-age=300'  # 5 Minuten
+            # Aggressive Caching für versionierte Assets
+            return send_static_asset(filename, CACHE_SETTINGS['versioned_max_age'], immutable=True)
+        # Kurzes Caching für unversionierte Assets
+        return send_static_asset(filename, CACHE_SETTINGS['unversioned_max_age'])
+    except Exception as e:
+        print(f"Static file error: {e}")
+        return "File not found", 404
 
-        return response
+@app.route(f"/{CACHE_SETTINGS['fingerprint_dir']}/<path:filename>")
+def fingerprinted_static(filename):
+    """Serviert Assets mit Hash im Dateinamen (game.3fa1b2c9.js) - ändern sich nie"""
+    try:
+        return send_static_asset(f"{CACHE_SETTINGS['fingerprint_dir']}/{filename}",
+                                 CACHE_SETTINGS['versioned_max_age'], immutable=True)
     except Exception as e:
         print(f"Static file error: {e}")
         return "File not found", 404
@@ -438,43 +360,21 @@ def versioned_static(filename):
 @app.route('/version')
 def version_info():
     """API Endpoint für Version-Informationen"""
-    try:
-        with open(os.path.join(BASE_DIR, 'static', 'version_manifest.json'), 'r') as f:
-            manifest = json.load(f)
-        return jsonify({
-            "version": manifest.get("global_version"),
-            "build_time": manifest.get("build_time"),
-            "build_timestamp": manifest.get("build_timestamp")
-        })
-    except:
-        return jsonify({
-            "version": get_app_version(),
-            "build_time": get_build_time(),
-            "build_timestamp": int(time.time())
-        })
+    return jsonify(asset_manifest.info())
 
 # ===== TEMPLATE ROUTES =====
 
 @app.route("/")
 def landing_page():
-    return render_template("index.html",
-                         app_version=get_app_version(),
-                         versioned_url=get_versioned_static_url,
-                         build_time=get_build_time())
+    return render_template("index.html")
 
 @app.route("/ui")
 def test_ui():
-    return render_template("test_ui.html",
-                         app_version=get_app_version(),
-                         versioned_url=get_versioned_static_url,
-                         build_time=get_build_time())
+    return render_template("test_ui.html")
 
 @app.route("/create")
 def create_game_ui():
-    return render_template("create_game.html",
-                         app_version=get_app_version(),
-                         versioned_url=get_versioned_static_url,
-                         build_time=get_build_time())
+    return render_template("create_game.html")
 
 @app.route("/game")
 def game():
@@ -482,10 +382,7 @@ def game():
     player_id = request.args.get("player_id")
     return render_template("game.html",
                          game_id=game_id,
-                         player_id=player_id,
-                         app_version=get_app_version(),
-                         versioned_url=get_versioned_static_url,
-                         build_time=get_build_time())
+                         player_id=player_id)
 
 @app.route("/game_ended")
 def game_ended():
@@ -501,26 +398,17 @@ def game_ended():
                          result=result,
                          winner=winner,
                          word=word,
-                         is_impostor=is_impostor,
-                         app_version=get_app_version(),
-                         versioned_url=get_versioned_static_url,
-                         build_time=get_build_time())
+                         is_impostor=is_impostor)
 
 @app.route("/games/<game_id>/join")
 def join_page(game_id):
     return render_template("join.html",
-                         game_id=game_id,
-                         app_version=get_app_version(),
-                         versioned_url=get_versioned_static_url,
-                         build_time=get_build_time())
+                         game_id=game_id)
 
 @app.route("/join")
 def join_page_general():
     return render_template("join.html",
-                         game_id=None,  # Kein Game-ID
-                         app_version=get_app_version(),
-                         versioned_url=get_versioned_static_url,
-                         build_time=get_build_time())
+                         game_id=None)  # Kein Game-ID
 
 # ===== STATS ROUTES =====
 
@@ -637,7 +525,7 @@ def debug_stats():
                 <p><strong>App Version:</strong> {get_app_version()}</p>
                 <p><strong>Build Time:</strong> {get_build_time()}</p>
                 <p><strong>Data Directory:</strong> {DATA_DIR}</p>
-                <p><strong>Games Directory Size:</strong> {len(os.listdir(DATA_DIR)) if os.path.exists(DATA_DIR) else 0} files</p>
+                <p><strong>Storage Backend:</strong> {game_store.backend.name} ({len(game_store.list_ids())} games)</p>
             </div>
         </body>
         </html>
@@ -648,14 +536,17 @@ def debug_stats():
     except Exception as e:
         return f"<h1>Error</h1><pre>{str(e)}</pre>", 500
 
+@app.route("/metrics")
+def prometheus_metrics():
+    """Request-, Latenz- und I/O-Metriken im Prometheus-Textformat"""
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4; charset=utf-8")
+
 @app.route("/stats")
 def public_stats():
     stats = calculate_game_stats()
     return render_template("stats.html",
                          stats=stats,
-                         app_version=get_app_version(),
-                         versioned_url=get_versioned_static_url,
-                         build_time=get_build_time())
+                         phase_stats=stats_aggregator.phase_stats())
 
 
 # ===== DEBUG ROUTES =====
@@ -715,18 +606,22 @@ def debug_template():
 
 @app.route("/create_game", methods=["POST"])
 def create_game():
-    game_id = uuid.uuid4().hex[:4].upper()
-    game_data = {
-        "id": game_id,
-        "status": "lobby",
-        "players": {},
-        "votes": None,
-        "history": [],
-        "eliminated_players": []
-    }
-    with open(f"{DATA_DIR}/{game_id}.json", "w") as f:
-        json.dump(game_data, f)
-    return jsonify({"game_id": game_id})
+    while True:
+        game_id = uuid.uuid4().hex[:4].upper()
+        game_data = {
+            "id": game_id,
+            "status": "lobby",
+            "players": {},
+            "votes": None,
+            "history": [],
+            "eliminated_players": []
+        }
+        lifecycle.mark_created(game_data)
+        try:
+            game_store.create_game(game_id, game_data)
+        except FileExistsError:
+            continue  # Game-ID bereits vergeben, neu würfeln
+        return jsonify({"game_id": game_id})
 
 @app.route("/join_game", methods=["POST"])
 def join_game():
@@ -737,41 +632,35 @@ def join_game():
     if not game_id or not player_name:
         return jsonify({"error": "game_id and name required"}), 400
 
-    filepath = f"{DATA_DIR}/{game_id}.json"
-    if not os.path.exists(filepath):
-        return jsonify({"error": "game not found"}), 404
-
-    with open(filepath, "r") as f:
-        game_data = json.load(f)
-
-    existing_names = [p["name"] for p in game_data["players"].values()]
-    original_name = player_name
-    suffix = 2
-    while player_name in existing_names:
-        player_name = f"{original_name} ({suffix})"
-        suffix += 1
-
-    player_id = uuid.uuid4().hex[:8]
-    is_first = len(game_data["players"]) == 0
-
-    game_data["players"][player_id] = {
-        "name": player_name,
-        "role": "pending",
-        "vote": None,
-        "ready": False,
-        "is_master": is_first,
-        "eliminated": False
-    }
+    def apply(game_data):
+        name = player_name
+        existing_names = [p["name"] for p in game_data["players"].values()]
+        suffix = 2
+        while name in existing_names:
+            name = f"{player_name} ({suffix})"
+            suffix += 1
+
+        player_id = uuid.uuid4().hex[:8]
+        is_first = len(game_data["players"]) == 0
+
+        game_data["players"][player_id] = {
+            "name": name,
+            "role": "pending",
+            "vote": None,
+            "ready": False,
+            "is_master": is_first,
+            "eliminated": False
+        }
+        lifecycle.touch(game_data)
 
-    with open(filepath, "w") as f:
-        json.dump(game_data, f)
+        return {
+            "player_id": player_id,
+            "name": name,
+            "game_id": game_id,
+            "is_master": is_first
+        }
 
-    return jsonify({
-        "player_id": player_id,
-        "name": player_name,
-        "game_id": game_id,
-        "is_master": is_first
-    })
+    return jsonify(game_store.update_game(game_id, apply))
 
 @app.route("/player_ready", methods=["POST"])
 def player_ready():
@@ -782,43 +671,23 @@ def player_ready():
     if not game_id or not player_id:
         return jsonify({"error": "game_id and player_id required"}), 400
 
-    filepath = f"{DATA_DIR}/{game_id}.json"
-    if not os.path.exists(filepath):
-        return jsonify({"error": "game not found"}), 404
-
-    with open(filepath, "r") as f:
-        game_data = json.load(f)
+    def apply(game_data):
+        if game_data.get("status") != "lobby":
+            raise GameActionError("game already started")
 
-    if game_data.get("status") != "lobby":
-        return jsonify({"error": "game already started"}), 400
-
-    if player_id not in game_data["players"]:
-        return jsonify({"error": "player not found"}), 404
+        if player_id not in game_data["players"]:
+            raise GameActionError("player not found", 404)
 
-    game_data["players"][player_id]["ready"] = True
+        game_data["players"][player_id]["ready"] = True
+        lifecycle.touch(game_data)
 
-    all_ready = all(p["ready"] for p in game_data["players"].values())
-    if all_ready and len(game_data["players"]) >= 3:
-        game_data["status"] = "started"
-        secret_word = random.choice(SECRET_WORDS)
-        game_data["word"] = secret_word
+        all_ready = all(p["ready"] for p in game_data["players"].values())
+        if all_ready and len(game_data["players"]) >= 3:
+            assign_roles_and_start(game_data)
 
-        player_ids = list(game_data["players"].keys())
-        impostor_id = random.choice(player_ids)
-        game_data["impostorId"] = impostor_id
+        return {"status": "ready registered", "game_started": all_ready}
 
-        for pid in player_ids:
-            role = "impostor" if pid == impostor_id else "normal"
-            game_data["players"][pid]["role"] = role
-
-        random.shuffle(player_ids)
-        game_data["turn_order"] = player_ids
-        game_data["current_turn_index"] = 0
-
-    with open(filepath, "w") as f:
-        json.dump(game_data, f)
-
-    return jsonify({"status": "ready registered", "game_started": all_ready})
+    return jsonify(game_store.update_game(game_id, apply))
 
 @app.route("/start_game", methods=["POST"])
 def start_game():
@@ -828,63 +697,74 @@ def start_game():
     if not game_id:
         return jsonify({"error": "game_id required"}), 400
 
-    filepath = f"{DATA_DIR}/{game_id}.json"
-    if not os.path.exists(filepath):
-        return jsonify({"error": "game not found"}), 404
-
-    with open(filepath, "r") as f:
-        game_data = json.load(f)
+    def apply(game_data):
+        if len(game_data["players"]) < 3:
+            raise GameActionError("at least 3 players required")
 
-    player_ids = list(game_data["players"].keys())
-    if len(player_ids) < 3:
-        return jsonify({"error": "at least 3 players required"}), 400
+        assign_roles_and_start(game_data)
 
-    game_data["status"] = "started"
-    secret_word = random.choice(SECRET_WORDS)
-    game_data["word"] = secret_word
+        return {
+            "status": "started",
+            "impostorId": game_data["impostorId"],
+            "word": game_data["word"]
+        }
 
-    impostor_id = random.choice(player_ids)
-    game_data["impostorId"] = impostor_id
+    return jsonify(game_store.update_game(game_id, apply))
 
-    for pid in player_ids:
-        role = "impostor" if pid == impostor_id else "normal"
-        game_data["players"][pid]["role"] = role
+# ===== VERSIONIERTE ANTWORTEN (ETAG & LONG-POLL) =====
 
-    random.shuffle(player_ids)
-    game_data["turn_order"] = player_ids
-    game_data["current_turn_index"] = 0
+def wait_for_game(game_id):
+    """Lädt ein Spiel (nur lesend!), bei ?since=<version>&wait=<s> erst nach einer neueren Version
 
-    with open(filepath, "w") as f:
-        json.dump(game_data, f)
+    Ohne since wird sofort geladen. Sonst blockiert der Request bis das Spiel
+    eine Version > since hat, höchstens wait Sekunden (long_poll_max_wait_seconds).
+    Das Ende eines Votes ist ein Commit des Schedulers und weckt ebenfalls.
+    """
+    since = request.args.get("since", type=int)
+    if since is None:
+        return game_store.get(game_id)
 
-    return jsonify({
-        "status": "started",
-        "impostorId": impostor_id,
-        "word": secret_word
-    })
+    wait = request.args.get("wait", default=GAME_SETTINGS['long_poll_max_wait_seconds'], type=float)
+    wait = max(0, min(wait, GAME_SETTINGS['long_poll_max_wait_seconds']))
+    return game_store.wait_for_change(game_id, since, wait)
 
-@app.route("/game_state/<game_id>/<player_id>", methods=["GET"])
-def game_state(game_id, player_id):
-    filepath = f"{DATA_DIR}/{game_id}.json"
-    if not os.path.exists(filepath):
-        return jsonify({"error": "game not found"}), 404
+def versioned_json(game_data, build, *etag_parts):
+    """JSON-Antwort mit ETag aus der Spielversion
 
-    with open(filepath, "r") as f:
-        game_data = json.load(f)
+    Kennt der Client den Stand schon (If-None-Match), gibt es ein 304 ohne
+    dass build() aufgerufen oder etwas serialisiert wird. build() liefert
+    (payload, status); nur erfolgreiche Antworten bekommen ein ETag.
 
-    # Check for vote timeout before processing
-    vote_timeout_occurred = check_vote_timeout(game_data)
-    if vote_timeout_occurred:
-        with open(filepath, "w") as f:
-            json.dump(game_data, f)
+    Ein neu angelegtes Spiel mit derselben (kurzen) ID beginnt wieder bei
+    Version 1 - created_at im ETag verhindert ein falsches 304.
+    """
+    version = game_data.get("version", 0)
+    created = format(int((game_data.get("created_at") or 0) * 1e6), "x")
+    etag = "-".join(str(part) for part in (created, version) + etag_parts)
 
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+    else:
+        payload, status = build()
+        response = jsonify(payload)
+        response.status_code = status
+        if status == 200:
+            response.set_etag(etag)
+
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Game-Version"] = str(version)
+    return response
+
+def build_game_state(game_data, player_id):
+    """Baut die Sicht eines Spielers auf das Spiel - gibt (payload, status) zurück"""
     players = game_data.get("players", {})
     if player_id not in players:
-        return jsonify({"error": "player not found"}), 404
+        return {"error": "player not found"}, 404
 
     # Prüfen, ob das Spiel beendet ist
     if game_data.get("status") == "finished":
-        return jsonify({
+        return {
             "game_status": "finished",
             "winner": game_data.get("winner", "unknown"),
             "end_reason": game_data.get("end_reason", "unknown"),
@@ -893,44 +773,21 @@ def game_state(game_id, player_id):
             "impostor_id": game_data.get("impostorId"),
             "history": game_data.get("history", []),
             "eliminated_players": game_data.get("eliminated_players", [])
-        })
+        }, 200
 
     # Check if player is eliminated
-    if players[player_id].get("eliminated", False) or player_id in game_data.get("eliminated_players", []):
-        return jsonify({
+    if is_eliminated(game_data, player_id):
+        return {
             "status": "eliminated",
             "message": "Du wurdest aus dem Spiel eliminiert!"
-        })
+        }, 200
 
     player = players[player_id]
     is_impostor = player["role"] == "impostor"
 
-    # Get active players (not eliminated)
-    active_players = {pid: p for pid, p in players.items()
-                    if not p.get("eliminated", False) and pid not in game_data.get("eliminated_players", [])}
-
-    # Update turn if current player is eliminated
-    turn_order = game_data.get("turn_order", [])
-    current_index = game_data.get("current_turn_index", 0)
-
-    # Filter turn order to only include active players
-    active_turn_order = [pid for pid in turn_order if pid in active_players]
-
-    if not active_turn_order:
-        current_player_id = None
-        current_player_name = None
-    else:
-        # Adjust index if needed
-        if current_index >= len(active_turn_order):
-            current_index = current_index % len(active_turn_order)
-            game_data["current_turn_index"] = current_index
-
-            # Save the updated index
-            with open(filepath, "w") as f:
-                json.dump(game_data, f)
-
-        current_player_id = active_turn_order[current_index % len(active_turn_order)]
-        current_player_name = players[current_player_id]["name"] if current_player_id else None
+    # Wer dran ist, steht im Turn-Ring
+    current_player_id = TurnRing.of(game_data).current
+    current_player_name = players[current_player_id]["name"] if current_player_id else None
 
     # Get vote information
     votes = game_data.get("votes")
@@ -957,7 +814,7 @@ def game_state(game_id, player_id):
             "down_votes": votes.get("down_votes", 0)
         }
 
-    return jsonify({
+    return {
         "player_name": player["name"],
         "your_role": player["role"],
         "your_word": None if is_impostor else game_data.get("word"),
@@ -967,7 +824,16 @@ def game_state(game_id, player_id):
         "history": game_data.get("history", []),
         "eliminated_players": game_data.get("eliminated_players", []),
         "active_vote": active_vote
-    })
+    }, 200
+
+@app.route("/game_state/<game_id>/<player_id>", methods=["GET"])
+def game_state(game_id, player_id):
+    game_data = wait_for_game(game_id)
+    if game_data is None:
+        return jsonify({"error": "game not found"}), 404
+
+    # Nur lesend: den Turn-Ring halten die Mutationen aktuell
+    return versioned_json(game_data, lambda: build_game_state(game_data, player_id))
 
 @app.route("/submit_word", methods=["POST"])
 def submit_word():
@@ -979,98 +845,181 @@ def submit_word():
     if not game_id or not player_id or not word:
         return jsonify({"error": "game_id, player_id and word required"}), 400
 
-    filepath = f"{DATA_DIR}/{game_id}.json"
-    if not os.path.exists(filepath):
-        return jsonify({"error": "game not found"}), 404
+    def apply(game_data):
+        if player_id not in game_data["players"]:
+            raise GameActionError("player not found", 404)
 
-    with open(filepath, "r") as f:
-        game_data = json.load(f)
+        # Check if player is eliminated
+        if is_eliminated(game_data, player_id):
+            raise GameActionError("eliminated players cannot submit words", 403)
 
-    if player_id not in game_data["players"]:
-        return jsonify({"error": "player not found"}), 404
+        # Check if player is impostor and guessed the word correctly
+        player_role = game_data["players"][player_id]["role"]
+        secret_word = game_data.get("word", "")
 
-    # Check if player is eliminated
-    if game_data["players"][player_id].get("eliminated", False) or player_id in game_data.get("eliminated_players", []):
-        return jsonify({"error": "eliminated players cannot submit words"}), 403
+        if player_role == "impostor" and word.lower() == secret_word.lower():
+            # Impostor has guessed the word correctly!
+            game_data["status"] = "finished"
+            game_data["winner"] = "impostor"
+            game_data["end_reason"] = "word_guessed"
+            lifecycle.mark_finished(game_data)
 
-    # Check if player is impostor and guessed the word correctly
-    player_role = game_data["players"][player_id]["role"]
-    secret_word = game_data.get("word", "")
+            return {
+                "status": "game_over",
+                "winner": "impostor",
+                "reason": "word_guessed"
+            }
 
-    if player_role == "impostor" and word.lower() == secret_word.lower():
-        # Impostor has guessed the word correctly!
-        game_data["status"] = "finished"
-        game_data["winner"] = "impostor"
-        game_data["end_reason"] = "word_guessed"
+        if not game_data.get("turn_order"):
+            raise GameActionError("turn order missing")
 
-        with open(filepath, "w") as f:
-            json.dump(game_data, f)
+        ring = TurnRing.of(game_data, persist=True)
+        if not ring:
+            raise GameActionError("no active players")
 
-        return jsonify({
-            "status": "game_over",
-            "winner": "impostor",
-            "reason": "word_guessed"
-        })
+        if not ring.is_current(player_id):
+            raise GameActionError("not your turn", 403)
 
-    current_index = game_data.get("current_turn_index", 0)
-    turn_order = game_data.get("turn_order", [])
+        game_data["history"].append({
+            "player_id": player_id,
+            "word": word,
+            "at": lifecycle.touch(game_data)
+        })
 
-    if not turn_order:
-        return jsonify({"error": "turn order missing"}), 400
+        return {"status": "ok", "next_player_id": ring.advance()}
 
-    # Get active players
-    active_turn_order = [pid for pid in turn_order
-                        if not game_data["players"].get(pid, {}).get("eliminated", False)
-                        and pid not in game_data.get("eliminated_players", [])]
+    return jsonify(game_store.update_game(game_id, apply))
 
-    if not active_turn_order:
-        return jsonify({"error": "no active players"}), 400
+def build_players_list(game_data):
+    """Baut die öffentliche Spielerliste eines Spiels"""
+    players = game_data.get("players", {})
 
-    # Adjust index if needed
-    if current_index >= len(active_turn_order):
-        current_index = current_index % len(active_turn_order)
-        game_data["current_turn_index"] = current_index
+    simplified = [
+        {
+            "player_id": pid,
+            "name": pdata.get("name", ""),
+            "role": pdata.get("role", "pending"),
+            "is_master": pdata.get("is_master", False),
+            "eliminated": pdata.get("eliminated", False)
+        }
+        for pid, pdata in players.items()
+    ]
+    return {"players": simplified}
 
-    current_player_id = active_turn_order[current_index % len(active_turn_order)]
+@app.route("/players_in_game/<game_id>", methods=["GET"])
+def players_in_game(game_id):
+    game_data = wait_for_game(game_id)
+    if game_data is None:
+        return jsonify({"error": "game not found"}), 404
 
-    if player_id != current_player_id:
-        return jsonify({"error": "not your turn"}), 403
+    return versioned_json(game_data, lambda: (build_players_list(game_data), 200))
 
-    game_data["history"].append({
-        "player_id": player_id,
-        "word": word
-    })
+# ===== LIVE-UPDATES (SYNC & SERVER-SENT EVENTS) =====
 
-    game_data["current_turn_index"] = (current_index + 1) % len(active_turn_order)
+def build_player_update(game_data, player_id):
+    """Alles was der Client pro Tick braucht: Zustand, Spieler, Vote (inkl. Timer)"""
+    state, _ = build_game_state(game_data, player_id)
+    return {
+        "version": game_data.get("version", 0),
+        "state": state,
+        "players": build_players_list(game_data),
+        "vote": build_vote_status(game_data, player_id)
+    }
 
-    with open(filepath, "w") as f:
-        json.dump(game_data, f)
+def vote_etag_parts(game_data):
+    """remaining_seconds ändert sich ohne neue Version - gehört ins ETag"""
+    vote_deadline = seconds_until_vote_deadline(game_data)
+    return () if vote_deadline is None else (int(vote_deadline),)
 
-    return jsonify({"status": "ok", "next_turn_index": game_data["current_turn_index"]})
+@app.route("/sync/<game_id>/<player_id>", methods=["GET"])
+def sync_game(game_id, player_id):
+    """Spielzustand, Spielerliste und Vote-Status aus einem einzigen Ladevorgang
 
-@app.route("/players_in_game/<game_id>", methods=["GET"])
-def players_in_game(game_id):
-    filepath = f"{DATA_DIR}/{game_id}.json"
-    if not os.path.exists(filepath):
+    Unterstützt wie game_state ETag/If-None-Match und ?since=&wait=.
+    """
+    game_data = wait_for_game(game_id)
+    if game_data is None:
         return jsonify({"error": "game not found"}), 404
+    if player_id not in game_data.get("players", {}):
+        return jsonify({"error": "player not found"}), 404
 
-    with open(filepath, "r") as f:
-        game_data = json.load(f)
+    return versioned_json(game_data, lambda: (build_player_update(game_data, player_id), 200),
+                          *vote_etag_parts(game_data))
 
-    players = game_data.get("players", {})
-    eliminated = game_data.get("eliminated_players", [])
+event_streams = 0
+event_streams_lock = threading.Lock()
 
-    simplified = [
-        {
-            "player_id": pid,
-            "name": pdata.get("name", ""),
-            "role": pdata.get("role", "pending"),
-            "is_master": pdata.get("is_master", False),
-            "eliminated": pdata.get("eliminated", False) or pid in eliminated
-        }
-        for pid, pdata in players.items()
-    ]
-    return jsonify({"players": simplified})
+def acquire_event_stream():
+    """Reserviert einen SSE-Platz (False wenn max_event_streams erreicht)"""
+    global event_streams
+    with event_streams_lock:
+        if event_streams >= GAME_SETTINGS['max_event_streams']:
+            return False
+        event_streams += 1
+        return True
+
+def release_event_stream():
+    global event_streams
+    with event_streams_lock:
+        event_streams -= 1
+
+metrics.gauge("suswords_event_streams", "Open server-sent event streams.", lambda: event_streams)
+
+@app.route("/events/<game_id>/<player_id>")
+def game_events(game_id, player_id):
+    """SSE-Stream: schickt die Spieler-Sicht bei jeder neuen Spielversion
+
+    Jeder Event trägt die Spielversion als id, ein Reconnect mit
+    Last-Event-ID bekommt nur neuere Stände. Ohne Änderung kommt alle
+    events_heartbeat_seconds ein Kommentar, damit Proxies die Verbindung
+    offen halten. Jeder offene Stream belegt einen Worker-Thread - mehr als
+    max_event_streams gleichzeitig bekommen 503, der Client pollt dann.
+    """
+    game_data = game_store.get(game_id)
+    if game_data is None:
+        return jsonify({"error": "game not found"}), 404
+    if player_id not in game_data.get("players", {}):
+        return jsonify({"error": "player not found"}), 404
+    if not acquire_event_stream():
+        response = jsonify({"error": "too many event streams, use /sync"})
+        response.status_code = 503
+        response.headers["Retry-After"] = str(GAME_SETTINGS['events_retry_ms'] // 1000)
+        return response
+
+    try:
+        last_version = int(request.headers.get("Last-Event-ID", 0))
+    except ValueError:
+        last_version = 0
+    if last_version > game_data.get("version", 0):
+        last_version = 0  # Unbekannte Version (z.B. Spiel neu angelegt): alles schicken
+
+    heartbeat = GAME_SETTINGS['events_heartbeat_seconds']
+
+    def stream():
+        version = last_version
+        yield f"retry: {GAME_SETTINGS['events_retry_ms']}\n\n"
+
+        while True:
+            game_data = game_store.wait_for_change(game_id, version, heartbeat)
+            if game_data is None:
+                yield "event: gone\ndata: {}\n\n"
+                return
+
+            if game_data.get("version", 0) <= version:
+                yield ": heartbeat\n\n"
+                continue
+
+            version = game_data.get("version", 0)
+            payload = json.dumps(build_player_update(game_data, player_id))
+            yield f"id: {version}\nevent: state\ndata: {payload}\n\n"
+
+    response = Response(stream(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+    # Auch wenn der Generator nie anläuft (Client sofort weg)
+    response.call_on_close(release_event_stream)
+    return response
 
 # ===== VOTING SYSTEM ROUTES =====
 
@@ -1084,75 +1033,56 @@ def start_vote():
     if not game_id or not initiator_id or not suspect_id:
         return jsonify({"error": "game_id, initiator_id and suspect_id required"}), 400
 
-    filepath = f"{DATA_DIR}/{game_id}.json"
-    if not os.path.exists(filepath):
-        return jsonify({"error": "game not found"}), 404
+    def apply(game_data):
+        players = game_data.get("players", {})
+        if initiator_id not in players or suspect_id not in players:
+            raise GameActionError("player not found", 404)
 
-    with open(filepath, "r") as f:
-        game_data = json.load(f)
+        # Check if there's already a vote
+        if game_data.get("votes") is not None:
+            raise GameActionError("vote already in progress")
 
-    players = game_data.get("players", {})
-    if initiator_id not in players or suspect_id not in players:
-        return jsonify({"error": "player not found"}), 404
+        # Check if suspect is already eliminated
+        if is_eliminated(game_data, suspect_id):
+            raise GameActionError("player already eliminated")
 
-    # Check if there's already a vote
-    if game_data.get("votes") is not None:
-        return jsonify({"error": "vote already in progress"}), 400
-
-    # Check if suspect is already eliminated
-    if players.get(suspect_id, {}).get("eliminated", False) or suspect_id in game_data.get("eliminated_players", []):
-        return jsonify({"error": "player already eliminated"}), 400
-
-    # Get current player
-    current_index = game_data.get("current_turn_index", 0)
-    turn_order = game_data.get("turn_order", [])
-
-    # Get active players
-    active_turn_order = [pid for pid in turn_order
-                         if not players.get(pid, {}).get("eliminated", False)
-                         and pid not in game_data.get("eliminated_players", [])]
-
-    if not active_turn_order:
-        return jsonify({"error": "no active players"}), 400
-
-    # Adjust index if needed
-    if current_index >= len(active_turn_order):
-        current_index = current_index % len(active_turn_order)
-
-    current_player_id = active_turn_order[current_index % len(active_turn_order)]
-
-    if initiator_id != current_player_id:
-        return jsonify({"error": "only current player may start a vote"}), 403
-
-    # Get initiator and suspect names
-    initiator_name = players[initiator_id]["name"]
-    suspect_name = players[suspect_id]["name"]
-
-    # Create NEW vote structure with timing
-    game_data["votes"] = {
-        "initiator": initiator_id,
-        "initiator_name": initiator_name,
-        "suspect": suspect_id,
-        "suspect_name": suspect_name,
-        "votes": {},
-        "result": None,
-        "started_at": time.time(),  # Unix timestamp for timing
-        "duration": 30,  # 30 seconds voting time
-        "status": "active",  # active, completed, revealed
-        "up_votes": 0,
-        "down_votes": 0
-    }
+        ring = TurnRing.of(game_data, persist=True)
+        if not ring:
+            raise GameActionError("no active players")
 
-    with open(filepath, "w") as f:
-        json.dump(game_data, f)
+        if not ring.is_current(initiator_id):
+            raise GameActionError("only current player may start a vote", 403)
 
-    return jsonify({
-        "status": "vote_started",
-        "suspect": suspect_id,
-        "suspect_name": suspect_name,
-        "initiator_name": initiator_name,
-        "duration": 30
-    })
+        # Get initiator and suspect names
+        initiator_name = players[initiator_id]["name"]
+        suspect_name = players[suspect_id]["name"]
+
+        # Create NEW vote structure with timing
+        game_data["votes"] = {
+            "initiator": initiator_id,
+            "initiator_name": initiator_name,
+            "suspect": suspect_id,
+            "suspect_name": suspect_name,
+            "votes": {},
+            "result": None,
+            "started_at": lifecycle.mark_vote_started(game_data),  # Unix timestamp for timing
+            "duration": 30,  # 30 seconds voting time
+            "status": "active",  # active, completed, revealed
+            "up_votes": 0,
+            "down_votes": 0
+        }
+
+        return {
+            "status": "vote_started",
+            "suspect": suspect_id,
+            "suspect_name": suspect_name,
+            "initiator_name": initiator_name,
+            "duration": 30
+        }
+
+    result = game_store.update_game(game_id, apply)
+    schedule_vote_deadline(game_id)
+    return jsonify(result)
 
 @app.route("/cast_vote", methods=["POST"])
 def cast_vote():
@@ -1164,41 +1094,31 @@ def cast_vote():
     if not game_id or not voter_id or not vote:
         return jsonify({"error": "game_id, voter_id and vote required"}), 400
 
-    filepath = f"{DATA_DIR}/{game_id}.json"
-    if not os.path.exists(filepath):
-        return jsonify({"error": "game not found"}), 404
-
-    with open(filepath, "r") as f:
-        game_data = json.load(f)
-
-    # Check for timeout first
-    vote_timeout_occurred = check_vote_timeout(game_data)
-    if vote_timeout_occurred:
-        with open(filepath, "w") as f:
-            json.dump(game_data, f)
-        return jsonify({"error": "vote has timed out"}), 400
+    def apply(game_data):
+        if is_vote_expired(game_data):
+            raise GameActionError("vote has timed out")
 
-    votes_data = game_data.get("votes")
-    if not votes_data or votes_data.get("status") != "active":
-        return jsonify({"error": "no active vote"}), 400
+        votes_data = game_data.get("votes")
+        if not votes_data or votes_data.get("status") != "active":
+            raise GameActionError("no active vote")
 
-    # Check if voter is suspect
-    if voter_id == votes_data["suspect"]:
-        return jsonify({"error": "suspect cannot vote"}), 403
+        # Check if voter is suspect
+        if voter_id == votes_data["suspect"]:
+            raise GameActionError("suspect cannot vote", 403)
 
-    # Check if voter is eliminated
-    if game_data["players"][voter_id].get("eliminated", False) or voter_id in game_data.get("eliminated_players", []):
-        return jsonify({"error": "eliminated players cannot vote"}), 403
+        # Check if voter is eliminated
+        if is_eliminated(game_data, voter_id):
+            raise GameActionError("eliminated players cannot vote", 403)
 
-    # Check if already voted
-    if voter_id in votes_data["votes"]:
-        return jsonify({"error": "player has already voted"}), 403
+        # Check if already voted
+        if voter_id in votes_data["votes"]:
+            raise GameActionError("player has already voted", 403)
 
-    # Record the vote (but don't process result until timeout)
-    game_data["votes"]["votes"][voter_id] = vote
+        # Record the vote (but don't process result until timeout)
+        votes_data["votes"][voter_id] = vote
+        lifecycle.touch(game_data)
 
-    with open(filepath, "w") as f:
-        json.dump(game_data, f)
+    game_store.update_game(game_id, apply)
 
     # Return simple confirmation - no live results
     return jsonify({
@@ -1209,13 +1129,10 @@ def cast_vote():
 @app.route("/vote_time_remaining/<game_id>", methods=["GET"])
 def vote_time_remaining(game_id):
     """Gibt verbleibende Voting-Zeit zurück"""
-    filepath = f"{DATA_DIR}/{game_id}.json"
-    if not os.path.exists(filepath):
+    game_data = game_store.get(game_id)
+    if game_data is None:
         return jsonify({"error": "game not found"}), 404
 
-    with open(filepath, "r") as f:
-        game_data = json.load(f)
-
     votes = game_data.get("votes")
     if not votes or votes.get("status") != "active":
         return jsonify({"active": False})
@@ -1223,13 +1140,7 @@ def vote_time_remaining(game_id):
     elapsed = time.time() - votes.get("started_at", 0)
     remaining = max(0, votes.get("duration", 30) - elapsed)
 
-    # Auto-beenden wenn Zeit abgelaufen
-    if remaining <= 0:
-        vote_timeout_occurred = check_vote_timeout(game_data)
-        if vote_timeout_occurred:
-            with open(filepath, "w") as f:
-                json.dump(game_data, f)
-
+    # Das Beenden übernimmt der Vote-Scheduler
     return jsonify({
         "active": remaining > 0,
         "remaining_seconds": int(remaining),
@@ -1238,33 +1149,16 @@ def vote_time_remaining(game_id):
         "status": votes.get("status", "active")
     })
 
-@app.route("/vote_status/<game_id>/<player_id>", methods=["GET"])
-def vote_status(game_id, player_id):
-    """Enhanced API endpoint for checking vote status - now includes completed results"""
-    filepath = f"{DATA_DIR}/{game_id}.json"
-    if not os.path.exists(filepath):
-        return jsonify({"error": "game not found"}), 404
-
-    with open(filepath, "r") as f:
-        game_data = json.load(f)
-
-    # Check for timeout
-    vote_timeout_occurred = check_vote_timeout(game_data)
-    if vote_timeout_occurred:
-        with open(filepath, "w") as f:
-            json.dump(game_data, f)
-
+def build_vote_status(game_data, player_id):
+    """Baut den Vote-Status aus Sicht eines Spielers"""
     votes = game_data.get("votes")
 
     if not votes or "suspect" not in votes or not votes.get("suspect"):
-        return jsonify({"active": False})
+        return {"active": False}
 
-    # Count active players who can vote
-    active_players = [pid for pid, p in game_data["players"].items()
-                      if not p.get("eliminated", False)
-                      and pid not in game_data.get("eliminated_players", [])
-                      and pid != votes.get("suspect")]
-    votes_needed = len(active_players)
+    # Count active players who can vote (alle im Ring außer dem Verdächtigen)
+    active_players = TurnRing.of(game_data)
+    votes_needed = len(active_players) - (votes.get("suspect") in active_players)
     votes_cast = len(votes.get("votes", {}))
 
     # Check if the requesting player can vote
@@ -1337,7 +1231,17 @@ def vote_status(game_id, player_id):
             # Check if player is impostor to show correct message
             response_data["is_player_impostor"] = (player_id == impostor_id)
 
-    return jsonify(response_data)
+    return response_data
+
+@app.route("/vote_status/<game_id>/<player_id>", methods=["GET"])
+def vote_status(game_id, player_id):
+    """Enhanced API endpoint for checking vote status - now includes completed results"""
+    game_data = wait_for_game(game_id)
+    if game_data is None:
+        return jsonify({"error": "game not found"}), 404
+
+    return versioned_json(game_data, lambda: (build_vote_status(game_data, player_id), 200),
+                          *vote_etag_parts(game_data))
 
 @app.route("/clear_vote", methods=["POST"])
 def clear_vote():
@@ -1348,21 +1252,17 @@ def clear_vote():
     if not game_id:
         return jsonify({"error": "game_id required"}), 400
 
-    filepath = f"{DATA_DIR}/{game_id}.json"
-    if not os.path.exists(filepath):
-        return jsonify({"error": "game not found"}), 404
-
-    try:
-        with open(filepath, "r") as f:
-            game_data = json.load(f)
-
-        # Clear the vote
+    def apply(game_data):
+        # Clear the vote (ein noch laufendes Vote gilt als abgebrochen)
+        lifecycle.mark_vote_ended(game_data, result="cleared")
         game_data["votes"] = None
+        lifecycle.touch(game_data)
 
-        with open(filepath, "w") as f:
-            json.dump(game_data, f)
-
+    try:
+        game_store.update_game(game_id, apply)
         return jsonify({"status": "vote_cleared"})
+    except GameNotFoundError:
+        raise
     except Exception as e:
         return jsonify({"error": f"Failed to clear vote: {str(e)}"}), 500
 
@@ -1379,30 +1279,23 @@ def reveal_vote():
     data = request.get_json()
     game_id = data.get("game_id")
 
-    filepath = f"{DATA_DIR}/{game_id}.json"
-    if not os.path.exists(filepath):
-        return jsonify({"error": "game not found"}), 404
-
-    with open(filepath, "r") as f:
-        game_data = json.load(f)
+    def apply(game_data):
+        votes = game_data.get("votes")
+        if not votes or "votes" not in votes:
+            raise GameActionError("no active vote")
 
-    votes = game_data.get("votes")
-    if not votes or "votes" not in votes:
-        return jsonify({"error": "no active vote"}), 400
-
-    # Force process the result
-    process_vote_result(game_data)
-    game_data["votes"]["status"] = "completed"
+        # Force process the result
+        process_vote_result(game_data)
+        votes["status"] = "completed"
 
-    with open(filepath, "w") as f:
-        json.dump(game_data, f)
+        return {
+            "result": votes.get("result", "no_consensus"),
+            "votes": votes.get("votes", {}),
+            "up_votes": votes.get("up_votes", 0),
+            "down_votes": votes.get("down_votes", 0)
+        }
 
-    return jsonify({
-        "result": votes.get("result", "no_consensus"),
-        "votes": votes.get("votes", {}),
-        "up_votes": votes.get("up_votes", 0),
-        "down_votes": votes.get("down_votes", 0)
-    })
+    return jsonify(game_store.update_game(game_id, apply))
 
 # ===== GAME MANAGEMENT ROUTES =====
 
@@ -1413,19 +1306,13 @@ def end_game():
     winner = data.get("winner", "unknown")  # "impostor" oder "players"
     reason = data.get("reason", "unknown")  # "impostor_found", "not_enough_players", etc.
 
-    filepath = f"{DATA_DIR}/{game_id}.json"
-    if not os.path.exists(filepath):
-        return jsonify({"error": "game not found"}), 404
-
-    with open(filepath, "r") as f:
-        game_data = json.load(f)
-
-    game_data["status"] = "finished"
-    game_data["winner"] = winner
-    game_data["end_reason"] = reason
+    def apply(game_data):
+        game_data["status"] = "finished"
+        game_data["winner"] = winner
+        game_data["end_reason"] = reason
+        lifecycle.mark_finished(game_data)
 
-    with open(filepath, "w") as f:
-        json.dump(game_data, f)
+    game_store.update_game(game_id, apply)
 
     return jsonify({
         "status": "game_ended",
@@ -1438,33 +1325,28 @@ def restart_game():
     data = request.get_json()
     game_id = data.get("game_id")
 
-    filepath = f"{DATA_DIR}/{game_id}.json"
-    if not os.path.exists(filepath):
-        return jsonify({"error": "game not found"}), 404
-
-    with open(filepath, "r") as f:
-        game_data = json.load(f)
-
-    for pid in game_data["players"]:
-        game_data["players"][pid]["role"] = "pending"
-        game_data["players"][pid]["vote"] = None
-        game_data["players"][pid]["ready"] = False
-        game_data["players"][pid]["eliminated"] = False
+    def apply(game_data):
+        for pid in game_data["players"]:
+            game_data["players"][pid]["role"] = "pending"
+            game_data["players"][pid]["vote"] = None
+            game_data["players"][pid]["ready"] = False
+            game_data["players"][pid]["eliminated"] = False
 
-    game_data["status"] = "lobby"
-    game_data["word"] = None
-    game_data["votes"] = None
-    game_data["history"] = []
-    game_data["eliminated_players"] = []
+        game_data["status"] = "lobby"
+        game_data["word"] = None
+        game_data["votes"] = None
+        game_data["history"] = []
+        game_data["eliminated_players"] = []
+        game_data.pop("turn_ring", None)
 
-    # Remove game end data
-    if "winner" in game_data:
-        del game_data["winner"]
-    if "end_reason" in game_data:
-        del game_data["end_reason"]
+        # Remove game end data
+        if "winner" in game_data:
+            del game_data["winner"]
+        if "end_reason" in game_data:
+            del game_data["end_reason"]
+        lifecycle.mark_restarted(game_data)
 
-    with open(filepath, "w") as f:
-        json.dump(game_data, f)
+    game_store.update_game(game_id, apply)
 
     return jsonify({"status": "restarted"})
 
@@ -1475,21 +1357,20 @@ def timeline_api():
     """Timeline API für die letzten 30 Tage"""
     try:
         days = int(request.args.get('days', 30))
-        days = min(max(days, 7), 90)  # Zwischen 7 und 90 Tagen
-
-        stats = calculate_game_stats()
-        return jsonify(stats['timeline'])
+        return jsonify(stats_aggregator.timeline(days))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route("/api/stats/phases")
+def phase_stats_api():
+    """Dauer der Spielphasen (Sekunden, p50/p90/p99) und Vote-Ergebnisse"""
+    return jsonify(stats_aggregator.phase_stats())
+
 @app.route("/api/timeline/<int:days>")
 def timeline_api_days(days):
     """Timeline API für spezifische Anzahl Tage"""
     try:
-        days = min(max(days, 7), 90)  # Zwischen 7 und 90 Tagen
-        stats = calculate_game_stats()
-        timeline_stats = calculate_timeline_stats([], days)
-        return jsonify(timeline_stats)
+        return jsonify(stats_aggregator.timeline(days))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -1604,30 +1485,14 @@ def cleanup_dry_run():
                 print(f"🔍 DRY RUN: Cleanup Simulation ({hours}h threshold)")
                 print("=" * 50)
 
-                games = []
-                if os.path.exists(DATA_DIR):
-                    for filename in os.listdir(DATA_DIR):
-                        if filename.endswith('.json'):
-                            try:
-                                with open(os.path.join(DATA_DIR, filename), 'r') as f:
-                                    game_data = json.load(f)
-                                    games.append((filename, game_data))
-                            except:
-                                continue
-
                 candidates = 0
                 now = time.time()
 
-                for filename, game in games:
-                    game_file = os.path.join(DATA_DIR, filename)
-                    if os.path.exists(game_file):
-                        file_time = os.path.getmtime(game_file)
-                        age_hours = (now - file_time) / 3600
-
-                        if (age_hours > hours and
-                            game.get('status') not in ['finished', 'abandoned']):
-                            candidates += 1
-                            print(f"📄 {filename}: {game.get('id', 'N/A')} - {age_hours:.1f}h alt - Status: {game.get('status', 'unknown')}")
+                for game in game_store.summaries(statuses=['lobby', 'started'],
+                                                 updated_before=now - hours * 3600):
+                    age_hours = (now - game['updated_at']) / 3600
+                    candidates += 1
+                    print(f"📄 {game['id']} - {age_hours:.1f}h alt - Status: {game.get('status', 'unknown')}")
 
                 print(f"\n📊 Ergebnis: {candidates} Spiele würden bereinigt werden")
 
@@ -1686,39 +1551,24 @@ def cleanup_execute():
                 print("🧹 CLEANUP: Ausführung gestartet (24h threshold)")
                 print("=" * 50)
 
-                games = []
-                if os.path.exists(DATA_DIR):
-                    for filename in os.listdir(DATA_DIR):
-                        if filename.endswith('.json'):
-                            try:
-                                with open(os.path.join(DATA_DIR, filename), 'r') as f:
-                                    game_data = json.load(f)
-                                    games.append((filename, game_data))
-                            except:
-                                continue
-
                 cleaned = 0
                 now = time.time()
 
-                for filename, game in games:
-                    game_file = os.path.join(DATA_DIR, filename)
-                    if os.path.exists(game_file):
-                        file_time = os.path.getmtime(game_file)
-                        age_hours = (now - file_time) / 3600
+                for game in game_store.summaries(statuses=['lobby', 'started'],
+                                                 updated_before=now - 24 * 3600):
+                    age_hours = (now - game['updated_at']) / 3600
 
-                        if (age_hours > 24 and
-                            game.get('status') not in ['finished', 'abandoned']):
+                    # Spiel als abandoned markieren
+                    def apply(game_data):
+                        game_data['status'] = 'finished'
+                        game_data['end_reason'] = 'game_abandoned'
+                        game_data['winner'] = 'abandoned'
+                        lifecycle.mark_finished(game_data, activity=False)
 
-                            # Spiel als abandoned markieren
-                            game['status'] = 'finished'
-                            game['end_reason'] = 'game_abandoned'
-                            game['winner'] = 'abandoned'
+                    game_store.update_game(game['id'], apply)
 
-                            with open(game_file, 'w') as f:
-                                json.dump(game, f)
-
-                            cleaned += 1
-                            print(f"✅ {filename}: {game.get('id', 'N/A')} - bereinigt ({age_hours:.1f}h alt)")
+                    cleaned += 1
+                    print(f"✅ {game['id']} - bereinigt ({age_hours:.1f}h alt)")
 
                 print(f"\n🎯 Cleanup abgeschlossen: {cleaned} Spiele bereinigt")
 
@@ -1746,6 +1596,12 @@ def cleanup_execute():
     except Exception as e:
         return f"<h1>Error</h1><pre>{str(e)}</pre>", 500
 
+# Vote-Deadlines im Hintergrund abarbeiten - nur im Prozess, der Requests
+# bedient (nicht im Überwachungsprozess des Debug-Reloaders)
+if __name__ != "__main__" or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+    vote_scheduler.start()
+    schedule_active_votes()
+
 if __name__ == "__main__":
     # Version Manifest bei Entwicklung automatisch erstellen
     if not os.path.exists(os.path.join(BASE_DIR, 'static', 'version_manifest.json')):
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+# loadtest.py - Lasttest für SusWords über den echten REST-Ablauf
+"""
+Spielt M Spiele gleichzeitig komplett durch:
+
+    create_game -> join_game xN -> player_ready xN (startet das Spiel)
+    -> Wort-Runden (submit_word) -> start_vote / cast_vote -> Vote-Timeout
+    -> end_game
+
+Pro Spiel fragt ein Poller /sync für jeden Spieler im Takt von game.js ab
+(alle 3 Sekunden). Gemessen werden Durchsatz, p50/p95/p99 pro Endpoint und
+die Spielstand-I/O pro Spiel (aus /metrics). Das Ergebnis landet als JSON in
+benchmarks/results/ und kann mit --compare gegen einen früheren Lauf
+verglichen werden.
+
+Modi (alle offline lauffähig):
+    --mode client   Flask-Test-Client im selben Prozess (Standard)
+    --mode server   lokaler Werkzeug-Server im selben Prozess, echtes HTTP
+    --url URL       bereits laufender Server (I/O nur wenn /metrics erreichbar)
+
+Im selben Prozess landen Spiele und Stats-Snapshot in einem temporären
+Verzeichnis (SUSWORDS_DATA_DIR), nicht in games/.
+
+Beispiele:
+    python3 -m benchmarks.loadtest --games 50 --players 6
+    python3 -m benchmarks.loadtest --mode server --games 200 --vote-end reveal
+    python3 -m benchmarks.loadtest --compare benchmarks/results/loadtest-20250601-120000.json
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BASE_DIR, "benchmarks", "results")
+
+WORDS = ["Ampel", "Banane", "Drachen", "Gurke", "Kaktus", "Laterne", "Pizza", "Rakete", "Wolke", "Zebra"]
+IO_METRICS = ("suswords_store_reads_total", "suswords_store_read_bytes_total",
+              "suswords_store_writes_total", "suswords_store_write_bytes_total")
+
+
+# ===== TRANSPORT =====
+
+class FlaskTransport:
+    """Flask-Test-Client, einer pro Thread"""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def request(self, method, path, body=None):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, json=body)
+        if response.mimetype == "application/json":
+            return response.status_code, response.get_json(silent=True)
+        return response.status_code, response.get_data(as_text=True)
+
+
+class HttpTransport:
+    """Echte HTTP-Requests gegen base_url"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+
+    def request(self, method, path, body=None):
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                     headers={"Content-Type": "application/json"} if data else {})
+        try:
+            with urllib.request.urlopen(req, timeout=60) as response:
+                status, raw, ctype = response.status, response.read(), response.headers.get_content_type()
+        except urllib.error.HTTPError as e:
+            status, raw, ctype = e.code, e.read(), e.headers.get_content_type()
+
+        if ctype == "application/json":
+            return status, json.loads(raw or b"null")
+        return status, raw.decode("utf-8", "replace")
+
+
+def start_local_server(app):
+    """Startet die App auf einem freien Port, gibt (server, base_url) zurück"""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass  # Zugriffslog pro Request würde die Messung verfälschen
+
+    server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, name="loadtest-server", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+# ===== MESSUNG =====
+
+class Recorder:
+    """Latenzen und Fehler pro Endpoint"""
+
+    def __init__(self, transport):
+        self.transport = transport
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.votes_completed = 0
+
+    def count_vote(self):
+        with self._lock:
+            self.votes_completed += 1
+
+    def call(self, name, method, path, body=None, expect=(200,)):
+        started = time.perf_counter()
+        try:
+            status, data = self.transport.request(method, path, body)
+        except Exception as e:
+            status, data = None, str(e)
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.latencies.setdefault(name, []).append(elapsed)
+            if status not in expect:
+                self.errors[name] = self.errors.get(name, 0) + 1
+        return status, data
+
+
+def percentile(sorted_values, p):
+    """Nearest-Rank-Perzentil einer sortierten Liste"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+def scrape_io(transport):
+    """Summiert die Store-I/O-Zähler aus /metrics (None ohne /metrics)"""
+    try:
+        status, text = transport.request("GET", "/metrics")
+    except Exception:
+        return None
+    if status != 200 or not isinstance(text, str):
+        return None
+
+    totals = dict.fromkeys(IO_METRICS, 0)
+    for line in text.splitlines():
+        match = re.match(r"^(suswords_store_\w+)\{[^}]*\} (\S+)$", line)
+        if match and match.group(1) in totals:
+            totals[match.group(1)] += float(match.group(2))
+    return totals
+
+
+# ===== EIN SPIEL =====
+
+def poll_game(rec, game_id, players, interval, stop):
+    """Simuliert die /sync-Abfragen von game.js für alle Spieler eines Spiels"""
+    while not stop.is_set():
+        for player_id in list(players.values()):
+            if stop.is_set():
+                return
+            rec.call("sync", "GET", f"/sync/{game_id}/{player_id}", expect=(200, 304, 404))
+            stop.wait(interval / max(len(players), 1))
+
+def current_player(rec, game_id, players):
+    """Player-ID des Spielers am Zug (None wenn das Spiel vorbei ist)"""
+    any_player = next(iter(players.values()))
+    status, state = rec.call("game_state", "GET", f"/game_state/{game_id}/{any_player}")
+    if status != 200 or not isinstance(state, dict) or state.get("game_status") != "started":
+        return None
+    return players.get(state.get("current_player"))
+
+def wait_for_vote_end(rec, game_id, player_id, max_wait):
+    """Wartet wie game.js auf das Vote-Ende: sekündlich Restzeit, danach Status"""
+    deadline = time.time() + max_wait
+    while time.time() < deadline:
+        status, data = rec.call("vote_time_remaining", "GET", f"/vote_time_remaining/{game_id}",
+                                expect=(200, 404))
+        if status != 200 or not data.get("active"):
+            break
+        time.sleep(1.0 if data.get("remaining_seconds", 0) >= 1 else 0.2)
+
+    while time.time() < deadline:
+        status, data = rec.call("vote_status", "GET", f"/vote_status/{game_id}/{player_id}",
+                                expect=(200, 304, 404))
+        if status != 200 or not data.get("active") or data.get("status") != "active":
+            return True
+        time.sleep(0.2)
+    return False
+
+def play_game(rec, args, game_ids):
+    status, data = rec.call("create_game", "POST", "/create_game")
+    if status != 200:
+        return
+    game_id = data["game_id"]
+    game_ids.append(game_id)
+
+    players = {}  # Name -> Player-ID
+    for i in range(args.players):
+        status, data = rec.call("join_game", "POST", "/join_game",
+                                {"game_id": game_id, "name": f"Bot{i}"})
+        if status == 200:
+            players[data["name"]] = data["player_id"]
+    if len(players) < 3:
+        return
+
+    stop = threading.Event()
+    poller = threading.Thread(target=poll_game, args=(rec, game_id, players, args.poll_interval, stop),
+                              daemon=True)
+    poller.start()
+
+    try:
+        # Alle bereit -> der letzte startet das Spiel
+        for player_id in players.values():
+            rec.call("player_ready", "POST", "/player_ready", {"game_id": game_id, "player_id": player_id})
+
+        for vote_round in range(args.votes + 1):
+            for _ in range(args.rounds * len(players)):
+                player_id = current_player(rec, game_id, players)
+                if player_id is None:
+                    return
+                rec.call("submit_word", "POST", "/submit_word",
+                         {"game_id": game_id, "player_id": player_id, "word": random.choice(WORDS)},
+                         expect=(200, 403))
+                time.sleep(args.think_time)
+
+            if vote_round == args.votes:
+                break  # nach dem letzten Vote noch eine Wort-Runde, dann Ende
+            initiator = current_player(rec, game_id, players)
+            if initiator is None:
+                return
+            suspect = random.choice([pid for pid in players.values() if pid != initiator])
+            status, _ = rec.call("start_vote", "POST", "/start_vote",
+                                 {"game_id": game_id, "initiator_id": initiator, "suspect_id": suspect},
+                                 expect=(200, 400, 403))
+            if status != 200:
+                continue
+
+            for player_id in players.values():
+                if player_id != suspect:
+                    vote = "up" if random.random() < args.up_ratio else "down"
+                    rec.call("cast_vote", "POST", "/cast_vote",
+                             {"game_id": game_id, "voter_id": player_id, "vote": vote},
+                             expect=(200, 400, 403))
+
+            if args.vote_end == "reveal":
+                rec.call("reveal_vote", "POST", "/reveal_vote", {"game_id": game_id})
+            else:
+                wait_for_vote_end(rec, game_id, initiator, max_wait=120)
+            rec.call("clear_vote", "POST", "/clear_vote", {"game_id": game_id})
+            rec.count_vote()
+
+        rec.call("end_game", "POST", "/end_game",
+                 {"game_id": game_id, "winner": "players", "reason": "loadtest"})
+    finally:
+        stop.set()
+        poller.join(timeout=5)
+
+
+# ===== ABLAUF & AUSWERTUNG =====
+
+def run(args):
+    server = None
+    in_process = args.url is None
+    app_module = None
+
+    if in_process:
+        # Vor dem Import: config liest das Daten-Verzeichnis beim Laden
+        data_dir = os.environ.setdefault("SUSWORDS_DATA_DIR",
+                                         tempfile.mkdtemp(prefix="suswords-loadtest-"))
+        print(f"📁 Spieldaten: {data_dir}")
+        sys.path.insert(0, BASE_DIR)
+        import app as app_module
+        if args.mode == "server":
+            server, base_url = start_local_server(app_module.app)
+            transport = HttpTransport(base_url)
+        else:
+            transport = FlaskTransport(app_module.app)
+        app_module.vote_scheduler.start()
+    else:
+        transport = HttpTransport(args.url)
+
+    rec = Recorder(transport)
+    io_before = scrape_io(transport)
+    game_ids = []
+
+    print(f"🚀 Lasttest: {args.games} Spiele x {args.players} Spieler, "
+          f"{args.rounds} Runde(n), {args.votes} Vote(s), Vote-Ende: {args.vote_end}, "
+          f"Modus: {args.url or args.mode}")
+
+    started = time.perf_counter()
+    threads = []
+    for i in range(args.games):
+        thread = threading.Thread(target=play_game, args=(rec, args, game_ids), daemon=True)
+        threads.append(thread)
+        thread.start()
+        if args.ramp_up:
+            time.sleep(args.ramp_up / args.games)
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    if in_process:
+        app_module.game_store.flush()  # Write-Behind-Schreibvorgänge mitzählen
+    io_after = scrape_io(transport)
+
+    if in_process and not args.keep_games:
+        for game_id in game_ids:
+            app_module.game_store.delete(game_id)
+    if server is not None:
+        server.shutdown()
+
+    return build_report(args, rec, wall, len(game_ids), io_before, io_after)
+
+def build_report(args, rec, wall, games, io_before, io_after):
+    endpoints = {}
+    total_requests = 0
+    for name, values in sorted(rec.latencies.items()):
+        values = sorted(values)
+        total_requests += len(values)
+        endpoints[name] = {
+            "requests": len(values),
+            "errors": rec.errors.get(name, 0),
+            "p50_ms": round(percentile(values, 50) * 1000, 3),
+            "p95_ms": round(percentile(values, 95) * 1000, 3),
+            "p99_ms": round(percentile(values, 99) * 1000, 3),
+            "max_ms": round(values[-1] * 1000, 3),
+        }
+
+    io_per_game = None
+    if io_before is not None and io_after is not None and games:
+        io_per_game = {name.replace("suswords_store_", "").replace("_total", ""):
+                       round((io_after[name] - io_before[name]) / games, 1) for name in IO_METRICS}
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "mode": args.url or args.mode,
+            "games": args.games,
+            "players": args.players,
+            "rounds": args.rounds,
+            "votes": args.votes,
+            "vote_end": args.vote_end,
+            "poll_interval": args.poll_interval,
+        },
+        "games_played": games,
+        "votes_completed": rec.votes_completed,
+        "wall_seconds": round(wall, 3),
+        "total_requests": total_requests,
+        "throughput_rps": round(total_requests / wall, 1) if wall else 0,
+        "endpoints": endpoints,
+        "io_per_game": io_per_game,
+    }
+
+def print_report(report):
+    print("=" * 78)
+    print(f"📊 {report['games_played']} Spiele, {report['votes_completed']} Votes, "
+          f"{report['total_requests']} Requests in {report['wall_seconds']}s "
+          f"-> {report['throughput_rps']} req/s")
+    print(f"{'Endpoint':<22}{'Requests':>9}{'Fehler':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, stats in report["endpoints"].items():
+        print(f"{name:<22}{stats['requests']:>9}{stats['errors']:>8}{stats['p50_ms']:>10}"
+              f"{stats['p95_ms']:>10}{stats['p99_ms']:>10}{stats['max_ms']:>10}")
+    if report["io_per_game"]:
+        io = report["io_per_game"]
+        print(f"💾 I/O pro Spiel: {io['reads']} Reads ({io['read_bytes']:.0f} B), "
+              f"{io['writes']} Writes ({io['write_bytes']:.0f} B)")
+    else:
+        print("💾 I/O pro Spiel: nicht verfügbar (/metrics nicht erreichbar)")
+
+def compare(report, baseline_path, threshold):
+    """Vergleicht p95 und Durchsatz mit einem früheren Lauf, gibt False bei Regression"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    print("=" * 78)
+    print(f"🔍 Vergleich mit {os.path.basename(baseline_path)} (Schwelle {threshold:.0%})")
+    if baseline.get("config") != report["config"]:
+        print(f"   ⚠️  Andere Konfiguration: {baseline.get('config')}")
+    ok = True
+    for name, stats in report["endpoints"].items():
+        old = baseline.get("endpoints", {}).get(name)
+        if not old or not old.get("p95_ms"):
+            continue
+        change = (stats["p95_ms"] - old["p95_ms"]) / old["p95_ms"]
+        regressed = change > threshold
+        ok = ok and not regressed
+        print(f"   {'❌' if regressed else '✅'} {name:<22} p95 {old['p95_ms']:>9} -> {stats['p95_ms']:>9} ms ({change:+.0%})")
+
+    if baseline.get("throughput_rps"):
+        change = (report["throughput_rps"] - baseline["throughput_rps"]) / baseline["throughput_rps"]
+        print(f"   {'❌' if change < -threshold else '✅'} Durchsatz {baseline['throughput_rps']} -> "
+              f"{report['throughput_rps']} req/s ({change:+.0%})")
+        ok = ok and change >= -threshold
+    return ok
+
+def save_report(report, path=None):
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"loadtest-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="SusWords Lasttest (kompletter REST-Ablauf)")
+    parser.add_argument("--games", type=int, default=20, help="gleichzeitige Spiele")
+    parser.add_argument("--players", type=int, default=5, help="Spieler pro Spiel (mind. 3)")
+    parser.add_argument("--rounds", type=int, default=2, help="Wort-Runden vor jedem Vote")
+    parser.add_argument("--votes", type=int, default=1, help="Votes pro Spiel")
+    parser.add_argument("--vote-end", choices=("timeout", "reveal"), default="timeout",
+                        help="timeout: echte 30s Vote-Zeit abwarten, reveal: sofort auflösen")
+    parser.add_argument("--up-ratio", type=float, default=0.0,
+                        help="Anteil 'up'-Stimmen (0 = niemand wird eliminiert)")
+    parser.add_argument("--poll-interval", type=float, default=3.0, help="Sekunden zwischen /sync pro Spieler")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Pause pro Wort in Sekunden")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Sekunden bis alle Spiele gestartet sind")
+    parser.add_argument("--mode", choices=("client", "server"), default="client")
+    parser.add_argument("--url", help="bereits laufender Server, z.B. http://127.0.0.1:5000")
+    parser.add_argument("--output", help="Ergebnis-Datei (Standard: benchmarks/results/loadtest-<Zeit>.json)")
+    parser.add_argument("--compare", help="früheres Ergebnis für den Regressions-Vergleich")
+    parser.add_argument("--threshold", type=float, default=0.2, help="erlaubte Verschlechterung (0.2 = 20%%)")
+    parser.add_argument("--keep-games", action="store_true", help="Spiele nach dem Lauf nicht löschen")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.players < 3:
+        print("❌ Mindestens 3 Spieler pro Spiel")
+        return 2
+
+    report = run(args)
+    print_report(report)
+    print(f"📁 Ergebnis gespeichert: {save_report(report, args.output)}")
+
+    if args.compare and not compare(report, args.compare, args.threshold):
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
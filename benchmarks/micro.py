@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# micro.py - Micro-Benchmarks für Vote- und Turn-Order-Funktionen
+"""
+Misst die Funktionen, die bei jedem Request bzw. jedem Vote-Ende laufen,
+auf synthetischen Spielen mit 3 bis 500 Spielern:
+
+    app.process_vote_result / update_turn_after_elimination / check_vote_timeout
+    VotingSystem._process_vote_result / ... (core/voting_system.py)
+    Ermittlung des aktuellen Spielers wie in submit_word/start_vote/game_state
+    TurnRing.advance (nächster Spieler nach einem Wort)
+
+Pro Fall und Spielerzahl wird wie bei timeit mehrfach gemessen (Minimum und
+Median pro Aufruf). Funktionen, die das Spiel verändern, bekommen für jeden
+Aufruf eine eigene, vorab erzeugte Kopie - das Kopieren wird nicht gemessen.
+
+Baselines liegen in benchmarks/baselines/micro.json. Ein Lauf wird gegen sie
+verglichen; ist ein Fall um mehr als --threshold langsamer, endet das Skript
+mit Exit-Code 1. Die Baseline gilt nur für die Maschine, auf der sie erzeugt
+wurde - nach einem Rechnerwechsel neu speichern.
+
+Beispiele:
+    python3 -m benchmarks.micro
+    python3 -m benchmarks.micro --sizes 10 500 -k turn
+    python3 -m benchmarks.micro --save-baseline
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from core.turn_ring import TurnRing
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(BASE_DIR, "benchmarks", "baselines", "micro.json")
+
+SIZES = (3, 10, 50, 100, 500)
+ELIMINATED_RATIO = 0.1
+# Unterschiede darunter sind Messrauschen (Timer, Caches), keine Regression
+MIN_DELTA_US = 0.5
+
+
+# ===== SYNTHETISCHE SPIELE =====
+
+def build_game(n_players, seed=0):
+    """Laufendes Spiel mit n Spielern, ~10% eliminiert und aktivem, abgelaufenem Vote
+
+    Die Mehrheit stimmt 'up' gegen einen normalen Spieler, damit der teure
+    Pfad (Elimination + neue Reihenfolge) gemessen wird.
+    """
+    rng = random.Random(seed + n_players)
+    player_ids = [f"p{i:04d}" for i in range(n_players)]
+    impostor_id = rng.choice(player_ids)
+
+    players = {pid: {"name": f"Spieler {i}", "ready": True,
+                     "role": "impostor" if pid == impostor_id else "normal"}
+               for i, pid in enumerate(player_ids)}
+
+    turn_order = list(player_ids)
+    rng.shuffle(turn_order)
+
+    normals = [pid for pid in turn_order if pid != impostor_id]
+    eliminated = normals[:int(n_players * ELIMINATED_RATIO)]
+    for pid in eliminated:
+        players[pid]["eliminated"] = True
+
+    active = [pid for pid in turn_order if pid not in eliminated]
+    suspect_id = next(pid for pid in reversed(active) if pid != impostor_id)
+    # Der Verdächtige ist gerade am Zug, damit auch der Nachrücker-Fall läuft
+    current_index = active.index(suspect_id)
+
+    now = time.time()
+    game_data = {
+        "status": "started",
+        "word": "Banane",
+        "impostorId": impostor_id,
+        "players": players,
+        "turn_order": turn_order,
+        "eliminated_players": list(eliminated),
+        "history": [{"player_id": pid, "word": "Wort", "at": now - 100} for pid in active],
+        "created_at": now - 300,
+        "started_at": now - 200,
+        "last_activity": now - 60,
+        "votes": {
+            "initiator": active[0],
+            "suspect": suspect_id,
+            "votes": {pid: "up" for pid in active},
+            "status": "active",
+            "started_at": now - 60,
+            "duration": 30
+        }
+    }
+    TurnRing.create(game_data, active[current_index:] + active[:current_index])
+    return game_data
+
+def eliminate(game_data):
+    """Markiert den Verdächtigen als eliminiert (Vorzustand für update_turn_after_elimination)"""
+    suspect_id = game_data["votes"]["suspect"]
+    game_data["players"][suspect_id]["eliminated"] = True
+    game_data["eliminated_players"].append(suspect_id)
+    return game_data
+
+
+# ===== FÄLLE =====
+
+def route_current_player(game_data):
+    """Zug-Prüfung wie in submit_word/start_vote"""
+    ring = TurnRing.of(game_data, persist=True)
+    return ring.is_current(ring.current)
+
+def game_state_current_player(game_data):
+    """Aktueller Spieler wie in /game_state"""
+    current_player_id = TurnRing.of(game_data).current
+    return game_data["players"][current_player_id]["name"] if current_player_id else None
+
+def advance_turn(game_data):
+    """Nächster Spieler nach einem Wort"""
+    return TurnRing.of(game_data, persist=True).advance()
+
+def cases():
+    """[(Name, Funktion, verändert das Spiel, Vorbereitung)]"""
+    # Vor dem Import: app legt den Store an und plant laufende Votes ein -
+    # nicht auf den echten Spielen in games/
+    os.environ.setdefault("SUSWORDS_DATA_DIR", tempfile.mkdtemp(prefix="suswords-micro-"))
+    import app
+    from core.voting_system import VotingSystem
+
+    voting = VotingSystem(file_manager=None)
+    suspect = lambda game: (game, game["votes"]["suspect"])
+
+    return [
+        ("app.process_vote_result", app.process_vote_result, True, None),
+        ("app.check_vote_timeout", app.check_vote_timeout, True, None),
+        ("app.update_turn_after_elimination",
+         lambda game, pid: app.update_turn_after_elimination(game, pid), True,
+         lambda game: suspect(eliminate(game))),
+        ("route.current_player", route_current_player, False, None),
+        ("game_state.current_player", game_state_current_player, False, None),
+        ("turn_ring.advance", advance_turn, True, None),
+        ("voting._process_vote_result", voting._process_vote_result, True, None),
+        ("voting._check_vote_timeout", voting._check_vote_timeout, True, None),
+        ("voting._update_turn_after_elimination",
+         lambda game, pid: voting._update_turn_after_elimination(game, pid), True,
+         lambda game: suspect(eliminate(game))),
+        ("voting._is_player_turn",
+         lambda game, pid: voting._is_player_turn(game, pid), False,
+         lambda game: (game, game["votes"]["initiator"])),
+    ]
+
+
+# ===== MESSUNG =====
+
+def make_args(game, prepare):
+    args = prepare(game) if prepare else game
+    return args if isinstance(args, tuple) else (args,)
+
+def measure(func, mutates, prepare, game, repeat, min_time):
+    """Sekunden pro Aufruf für jede Wiederholung"""
+    template = json.dumps(game)
+    fresh = lambda: make_args(json.loads(template), prepare)
+
+    # Aufwärmen und kalibrieren: so viele Aufrufe, dass eine Wiederholung min_time dauert
+    single = None
+    for _ in range(3):
+        args = fresh()
+        started = time.perf_counter()
+        func(*args)
+        elapsed = max(time.perf_counter() - started, 1e-7)
+        single = elapsed if single is None else min(single, elapsed)
+    number = max(1, min(int(min_time / single), 20000 if not mutates else 500))
+
+    timings = []
+    for _ in range(repeat):
+        if mutates:
+            batch = [fresh() for _ in range(number)]
+        else:
+            args = fresh()
+            batch = [args] * number
+        gc.collect()
+        gc.disable()       # wie timeit: keine Collector-Läufe in der Messung
+        try:
+            started = time.perf_counter()
+            for args in batch:
+                func(*args)
+            timings.append((time.perf_counter() - started) / number)
+        finally:
+            gc.enable()
+    return timings
+
+def run(args):
+    results = {}
+    for name, func, mutates, prepare in cases():
+        if args.k and args.k not in name:
+            continue
+        for size in args.sizes:
+            game = build_game(size)
+            timings = measure(func, mutates, prepare, game, args.repeat, args.min_time)
+            results[f"{name}[{size}]"] = {
+                "min_us": round(min(timings) * 1e6, 3),
+                "median_us": round(statistics.median(timings) * 1e6, 3),
+            }
+    return results
+
+
+# ===== BERICHT & BASELINE =====
+
+def print_report(results):
+    print("=" * 78)
+    print(f"{'Fall':<50}{'min µs':>12}{'median µs':>14}")
+    for name, stats in results.items():
+        print(f"{name:<50}{stats['min_us']:>12}{stats['median_us']:>14}")
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_baseline(results, path):
+    """Übernimmt die Ergebnisse in die Baseline (andere Fälle bleiben erhalten)"""
+    baseline = load_baseline(path) or {}
+    cases = dict(baseline.get("cases", {}))
+    cases.update(results)
+    baseline = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "saved_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "cases": dict(sorted(cases.items())),
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+def compare(results, baseline, threshold, stat):
+    """Vergleicht mit der Baseline, gibt False bei Regression"""
+    print("=" * 78)
+    print(f"🔍 Vergleich mit Baseline vom {baseline.get('saved_at', '?')} ({stat}, Schwelle {threshold:.0%})")
+    if baseline.get("python") != platform.python_version():
+        print(f"   ⚠️  Baseline mit Python {baseline.get('python')} erzeugt")
+
+    ok = True
+    for name, stats in results.items():
+        old = baseline.get("cases", {}).get(name)
+        if not old or not old.get(stat):
+            print(f"   ➕ {name:<48} neu")
+            continue
+        change = (stats[stat] - old[stat]) / old[stat]
+        regressed = change > threshold and stats[stat] - old[stat] > MIN_DELTA_US
+        ok = ok and not regressed
+        print(f"   {'❌' if regressed else '✅'} {name:<48} {old[stat]:>10} -> {stats[stat]:>10} µs ({change:+.0%})")
+    return ok
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="SusWords Micro-Benchmarks (Votes und Spielreihenfolge)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="Spielerzahlen")
+    parser.add_argument("-k", help="nur Fälle, deren Name diesen Text enthält")
+    parser.add_argument("--repeat", type=int, default=7, help="Wiederholungen pro Fall")
+    parser.add_argument("--min-time", type=float, default=0.02, help="Sekunden pro Wiederholung (Kalibrierung)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline-Datei")
+    parser.add_argument("--save-baseline", action="store_true", help="Ergebnis als neue Baseline speichern")
+    parser.add_argument("--threshold", type=float, default=0.25, help="erlaubte Verschlechterung (0.25 = 25%%)")
+    parser.add_argument("--stat", choices=("min_us", "median_us"), default="min_us",
+                        help="Kennzahl für den Vergleich")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if min(args.sizes) < 3:
+        print("❌ Mindestens 3 Spieler pro Spiel")
+        return 2
+
+    results = run(args)
+    print_report(results)
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"📁 Baseline gespeichert: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"ℹ️  Keine Baseline unter {args.baseline} - mit --save-baseline anlegen")
+        return 0
+    return 0 if compare(results, baseline, args.threshold, args.stat) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
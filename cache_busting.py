@@ -1,89 +1,704 @@
 #!/usr/bin/env python3
 """
 Cache-Busting System für SusWords
-Erstellt automatisch Versionshashes für statische Assets
+Erstellt automatisch Versionshashes für statische Assets und legt für
+Text-Assets vorkomprimierte Geschwister an (game.js.gz, game.js.br), die
+versioned_static je nach Accept-Encoding ausliefert.
+
+Alle Dateien unter static/ werden automatisch gefunden, dazu kommen
+CACHE_SETTINGS['extra_files'] (z.B. sw.js). Größe, mtime und Hash jeder
+Datei landen in einem Sidecar (CACHE_SETTINGS['hash_cache_file']) - beim
+nächsten Build werden unveränderte Dateien weder gehasht noch neu
+komprimiert, geänderte parallel verarbeitet.
+
+Zusätzlich bekommt jedes Asset unter static/ eine Kopie mit dem Hash im
+Dateinamen (static/dist/js/game.3fa1b2c9.js, samt .gz/.br), die per /dist/
+mit "immutable" ausgeliefert wird. Nicht mehr referenzierte Fingerprints
+bleiben CACHE_SETTINGS['fingerprint_grace_days'] Tage liegen, damit Clients
+mitten im Spiel keine 404 bekommen.
+
+Vor dem Hashen lädt der Build CDN-Bibliotheken nach static/vendor/
+(CACHE_SETTINGS['vendor'], jede gegen ihren gepinnten sha384 geprüft) und schreibt pro Seite minifizierte Bündel
+(CACHE_SETTINGS['bundles'] -> static/bundles/game.min.js usw.). Die
+Bündel laufen danach wie jedes Asset durch Hash, Kompression und
+Fingerprint; ihre Größen stehen als size_report im Manifest.
+
+Die Ausgaben (.gz/.br, dist/, bundles/, vendor/) gehören ins Repo: deploy.sh
+baut und committet sie, der Server macht nur git pull. --list-outputs gibt
+aus, welche Dateien das aktuelle Manifest braucht.
+
+Brotli braucht das Paket 'brotli' (pip install brotli) - ohne wird nur
+gzip erzeugt.
 """
 
+import base64
+import fnmatch
+import gzip
 import hashlib
 import os
 import json
+import shutil
+import sys
 import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from config import CACHE_SETTINGS
+
+try:
+    import brotli
+except ImportError:  # nur gzip
+    brotli = None
+
+try:
+    import rcssmin
+    import rjsmin
+except ImportError:  # eingebaute, konservative Minifier
+    rcssmin = rjsmin = None
+
+# Text-Assets, die sich komprimieren lassen (PNG, MP3 sind es schon)
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.json', '.svg', '.txt', '.html')
+# Darunter lohnt sich Komprimieren nicht (Header-Overhead)
+MIN_COMPRESS_SIZE = 512
+# hashlib gibt bei großen Blöcken den GIL frei - Threads hashen wirklich parallel
+HASH_BUFFER_SIZE = 1024 * 1024
+HASH_CACHE_VERSION = 1
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 def generate_file_hash(filepath):
     """Generiert MD5-Hash einer Datei"""
     hash_md5 = hashlib.md5()
     try:
-        with open(filepath, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+        with open(filepath, "rb", buffering=0) as f:
+            for chunk in iter(lambda: f.read(HASH_BUFFER_SIZE), b""):
                 hash_md5.update(chunk)
         return hash_md5.hexdigest()[:8]  # Erste 8 Zeichen
     except FileNotFoundError:
         return str(int(time.time()))[:8]  # Fallback: Timestamp
 
-def create_version_manifest():
+def _compressors():
+    """[(Content-Encoding, Dateiendung, Funktion)] in Bevorzugungsreihenfolge"""
+    compressors = []
+    if brotli is not None:
+        compressors.append(("br", ".br", lambda raw: brotli.compress(raw, quality=11)))
+    # mtime=0: gleicher Inhalt ergibt dieselbe .gz-Datei (keine Git-Diffs)
+    compressors.append(("gzip", ".gz", lambda raw: gzip.compress(raw, compresslevel=9, mtime=0)))
+    return compressors
+
+def precompress_file(filepath, asset_key):
+    """Legt .br/.gz neben einer Text-Datei an
+
+    Gibt {encoding: {"path", "size"}} für die Varianten zurück, die kleiner
+    als das Original sind. Veraltete Geschwister werden entfernt.
+    """
+    if not filepath.endswith(COMPRESSIBLE_EXTENSIONS):
+        return {}
+    try:
+        with open(filepath, "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return {}
+
+    encodings = {}
+    for encoding, suffix, compress in _compressors():
+        target = filepath + suffix
+        compressed = compress(raw) if len(raw) >= MIN_COMPRESS_SIZE else None
+        if compressed is None or len(compressed) >= len(raw):
+            if os.path.exists(target):
+                os.remove(target)
+            continue
+        with open(target, "wb") as f:
+            f.write(compressed)
+        encodings[encoding] = {"path": asset_key + suffix, "size": len(compressed)}
+    return encodings
+
+# ===== ASSETS FINDEN =====
+
+def discover_assets(base_dir=BASE_DIR):
+    """Alle Assets als {Asset-Key: Pfad relativ zu base_dir}, sortiert"""
+    static_dir = os.path.join(base_dir, 'static')
+    excludes = CACHE_SETTINGS['exclude_patterns']
+    assets = {}
+
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for filename in files:
+            if filename.startswith('.'):
+                continue
+            rel_path = os.path.relpath(os.path.join(root, filename), base_dir).replace(os.sep, '/')
+            asset_key = rel_path[len('static/'):]
+            if any(fnmatch.fnmatch(asset_key, pattern) for pattern in excludes):
+                continue
+            assets[asset_key] = rel_path
+
+    assets.update(CACHE_SETTINGS['extra_files'])
+    return dict(sorted(assets.items()))
+
+# ===== HASH-CACHE (SIDECAR) =====
+
+def load_hash_cache(path):
+    """{Pfad: {"size", "mtime_ns", "hash", "encodings"?}} vom letzten Build"""
+    try:
+        with open(path, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != HASH_CACHE_VERSION:
+        return {}
+    return cache.get("files", {})
+
+def save_hash_cache(path, files):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({"version": HASH_CACHE_VERSION, "files": files}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def _cache_hit(cached, st, full_path, asset_key, compress, tried):
+    """Prüft ob Hash und Kompressionsvarianten aus dem Sidecar noch stimmen"""
+    if not cached or cached.get("size") != st.st_size or cached.get("mtime_ns") != st.st_mtime_ns:
+        return False
+    if not compress:
+        return True
+    if cached.get("tried") != tried:
+        return False  # z.B. brotli inzwischen installiert
+    for variant in (cached.get("encodings") or {}).values():
+        suffix = variant["path"][len(asset_key):]
+        try:
+            if os.path.getsize(full_path + suffix) != variant["size"]:
+                return False
+        except OSError:
+            return False
+    return True
+
+def _process_asset(base_dir, asset_key, file_path, cached, tried):
+    """(Sidecar-Eintrag, aus Cache?) für ein Asset"""
+    full_path = os.path.join(base_dir, file_path)
+    compress = file_path.startswith('static/') and file_path.endswith(COMPRESSIBLE_EXTENSIONS)
+    try:
+        st = os.stat(full_path)
+    except FileNotFoundError:
+        return {"hash": generate_file_hash(full_path)}, False
+
+    if _cache_hit(cached, st, full_path, asset_key, compress, tried):
+        return cached, True
+
+    entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "hash": generate_file_hash(full_path)}
+    if compress:
+        entry["tried"] = tried
+        entry["encodings"] = precompress_file(full_path, asset_key)
+    return entry, False
+
+# ===== FINGERPRINTS =====
+
+def fingerprinted_name(asset_key, file_hash):
+    """js/game.js -> js/game.3fa1b2c9.js"""
+    stem, ext = os.path.splitext(asset_key)
+    return f"{stem}.{file_hash}{ext}"
+
+def write_fingerprinted(base_dir, asset_key, entry):
+    """Kopiert ein Asset (und seine .gz/.br) unter seinem Fingerprint nach dist/
+
+    Gibt die geschriebenen bzw. schon vorhandenen Pfade relativ zu dist/
+    zurück. Gleicher Name = gleicher Inhalt, vorhandene Kopien bleiben.
+    """
+    static_dir = os.path.join(base_dir, 'static')
+    dist_dir = os.path.join(static_dir, CACHE_SETTINGS['fingerprint_dir'])
+    name = fingerprinted_name(asset_key, entry["hash"])
+
+    copies = [(asset_key, name)]
+    for variant in (entry.get("encodings") or {}).values():
+        suffix = variant["path"][len(asset_key):]
+        copies.append((variant["path"], name + suffix))
+
+    written = []
+    for source, target in copies:
+        target_path = os.path.join(dist_dir, target)
+        if not os.path.exists(target_path):
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            tmp_path = f"{target_path}.tmp"
+            shutil.copyfile(os.path.join(static_dir, source), tmp_path)
+            os.replace(tmp_path, target_path)
+        written.append(target)
+    return written
+
+def prune_fingerprinted(base_dir, keep, now=None):
+    """Löscht Fingerprints, die länger als die Schonfrist nicht mehr referenziert sind
+
+    Wann eine Datei aus dem Manifest gefallen ist, steht in dist/.retired.json.
+    Gibt die Anzahl gelöschter Dateien zurück.
+    """
+    now = now or time.time()
+    dist_dir = os.path.join(base_dir, 'static', CACHE_SETTINGS['fingerprint_dir'])
+    retired_path = os.path.join(dist_dir, '.retired.json')
+    grace = CACHE_SETTINGS['fingerprint_grace_days'] * 86400
+    try:
+        with open(retired_path, 'r') as f:
+            retired = json.load(f)
+    except (OSError, ValueError):
+        retired = {}
+
+    removed = 0
+    still_retired = {}
+    for root, dirs, files in os.walk(dist_dir):
+        for filename in files:
+            if filename.startswith('.'):
+                continue
+            rel_path = os.path.relpath(os.path.join(root, filename), dist_dir).replace(os.sep, '/')
+            if rel_path in keep:
+                continue
+            retired_at = retired.get(rel_path, now)
+            if now - retired_at >= grace:
+                os.remove(os.path.join(root, filename))
+                removed += 1
+            else:
+                still_retired[rel_path] = retired_at
+
+    if still_retired or os.path.exists(retired_path):
+        with open(retired_path, 'w') as f:
+            json.dump(still_retired, f, indent=1, sort_keys=True)
+    return removed
+
+# ===== MINIFY, BUNDLES & VENDOR =====
+
+# Vor diesen Zeichen (bzw. Schlüsselwörtern) beginnt ein / ein Regex-Literal
+_REGEX_AFTER = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+                   'throw', 'case', 'do', 'else', 'yield', 'await'}
+# Nach der schließenden Klammer von if (...) usw. beginnt eine Anweisung - / ist dort Regex
+_CONTROL_KEYWORDS = {'if', 'while', 'for', 'with'}
+
+def _is_word(char):
+    return char.isalnum() or char in '_$\\' or ord(char) > 127
+
+def _skip_quoted(source, i, quote):
+    """Index hinter dem String-Literal, das bei source[i] == quote beginnt"""
+    i += 1
+    while i < len(source) and source[i] != quote:
+        i += 2 if source[i] == '\\' else 1
+    return i + 1
+
+def minify_js(source):
+    """Konservativer JS-Minifier: Kommentare raus, Whitespace zusammenfassen
+
+    Zeilenumbrüche bleiben (als einer) erhalten, damit automatische
+    Semikolons (ASI) gleich bleiben. Strings, Template-Literale und
+    Regex-Literale werden unverändert übernommen.
+    """
+    out = []
+    i, n = 0, len(source)
+    pending = None          # ' ' oder '\n' zwischen zwei Tokens
+    last = ''               # letztes ausgegebenes Zeichen außer Whitespace
+    word = ''               # letztes ausgegebenes Wort (für Regex-Erkennung)
+    templates = []          # offene ${...} in Template-Literalen: Klammertiefe
+    parens = []             # offene ( - True wenn nach if/while/for/with
+    after_control = False   # letztes ) schloss die Bedingung von if/while/for/with
+
+    def emit(text):
+        nonlocal pending, last
+        if pending and out:
+            if pending == '\n':
+                out.append('\n')
+            elif ((_is_word(last) and _is_word(text[0])) or (last in '+-/' and text[0] in '+-/')
+                  or (text[0] == '.' and word.isdigit())):
+                out.append(' ')  # a b, a + +b, 1 .toString()
+        pending = None
+        out.append(text)
+        last = text[-1]
+
+    def template_end(i):
+        """Kopiert Template-Text ab i bis ` oder ${, gibt (Index, in ${?) zurück"""
+        start = i
+        while i < n:
+            if source[i] == '\\':
+                i += 2
+            elif source[i] == '`':
+                out.append(source[start:i + 1])
+                return i + 1, False
+            elif source.startswith('${', i):
+                out.append(source[start:i + 2])
+                return i + 2, True
+            else:
+                i += 1
+        out.append(source[start:])
+        return n, False
+
+    while i < n:
+        char = source[i]
+        if char in ' \t\r\n':
+            pending = '\n' if char == '\n' or pending == '\n' else (pending or ' ')
+            i += 1
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            i = n if end < 0 else end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            end = n if end < 0 else end + 2
+            if '\n' in source[i:end]:
+                pending = '\n'
+            else:
+                pending = pending or ' '
+            i = end
+        elif char in '"\'':
+            end = _skip_quoted(source, i, char)
+            emit(source[i:end])
+            i, word = end, ''
+        elif char == '`' or (char == '}' and templates and templates[-1] == 0):
+            if char == '`':
+                emit('`')
+                i += 1
+            else:
+                templates.pop()
+                emit('}')
+                i += 1
+            i, opened = template_end(i)
+            if opened:
+                templates.append(0)
+            last, word = '`' if not opened else '{', ''
+        elif char == '/' and (last in _REGEX_AFTER or not last or word in _REGEX_KEYWORDS
+                              or (last == ')' and after_control)):
+            j, in_class = i + 1, False
+            while j < n and (in_class or source[j] != '/'):
+                if source[j] == '\\':
+                    j += 1
+                elif source[j] == '[':
+                    in_class = True
+                elif source[j] == ']':
+                    in_class = False
+                j += 1
+            emit(source[i:j + 1])
+            i, word = j + 1, ''
+        elif _is_word(char):
+            j = i
+            while j < n and _is_word(source[j]):
+                j += 1
+            word = source[i:j]
+            emit(word)
+            i = j
+        else:
+            if templates and char == '{':
+                templates[-1] += 1
+            elif templates and char == '}':
+                templates[-1] -= 1
+            if char == '(':
+                parens.append(word in _CONTROL_KEYWORDS)
+            elif char == ')':
+                after_control = parens.pop() if parens else False
+            emit(char)
+            i, word = i + 1, ''
+    return ''.join(out).strip() + '\n'
+
+def minify_css(source):
+    """CSS-Minifier: Kommentare raus, Whitespace um { } ; , > und nach : weg"""
+    out = []
+    i, n = 0, len(source)
+    pending = False
+    while i < n:
+        char = source[i]
+        if char in ' \t\r\n':
+            pending = True
+            i += 1
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+            pending = True
+        else:
+            if char in '"\'':
+                end = _skip_quoted(source, i, char)
+                token, i = source[i:end], end
+            else:
+                token, i = char, i + 1
+            if pending and out and out[-1][-1] not in '{};,>:' and token not in '{};,>':
+                out.append(' ')
+            if token == '}' and out and out[-1] == ';':
+                out.pop()
+            pending = False
+            out.append(token)
+    return ''.join(out) + '\n'
+
+def minify(asset_key, source):
+    """Minifiziert JS/CSS (rjsmin/rcssmin wenn installiert), *.min.* und vendor/ bleiben"""
+    if '.min.' in asset_key or asset_key.startswith('vendor/'):
+        return source
+    if asset_key.endswith('.js'):
+        return rjsmin.jsmin(source) if rjsmin is not None else minify_js(source)
+    if asset_key.endswith('.css'):
+        return rcssmin.cssmin(source) if rcssmin is not None else minify_css(source)
+    return source
+
+def vendor_integrity(raw):
+    """sha384 im SRI-Format ("sha384-<base64>"), wie in CACHE_SETTINGS['vendor']"""
+    return "sha384-" + base64.b64encode(hashlib.sha384(raw).digest()).decode()
+
+def vendor_source(asset_key):
+    """URL und gepinnter Hash einer Vendor-Datei - steht als "source" im Manifest"""
+    vendor = CACHE_SETTINGS['vendor'][asset_key]
+    return {"url": vendor['url'], "sha384": vendor.get('sha384')}
+
+def vendor_assets(base_dir=BASE_DIR, previous_files=None):
+    """Lädt die CDN-Bibliotheken (CACHE_SETTINGS['vendor']) nach static/vendor/
+
+    Die Dateien werden danach first-party mit "immutable" ausgeliefert -
+    geschrieben wird nur, was dem gepinnten sha384 entspricht. Neu geladen
+    wird, wenn URL oder Hash nicht mehr zur "source" im letzten Manifest
+    (previous_files) passen oder die Datei nicht dem Hash entspricht.
+
+    Ohne gepinnten Hash, ohne Netz oder bei falschem Hash wird die lokale
+    Kopie entfernt - die Templates nehmen dann die CDN-URL
+    (AssetManifest.vendor_url).
+    """
+    missing = 0
+    for asset_key, vendor in CACHE_SETTINGS['vendor'].items():
+        target = os.path.join(base_dir, 'static', asset_key)
+        pinned = vendor.get('sha384')
+        if not pinned:
+            print(f"⚠️  {asset_key}: kein sha384 gepinnt (python3 cache_busting.py --pin-vendor) - CDN")
+            _remove(target)
+            missing += 1
+            continue
+
+        previous = (previous_files or {}).get(asset_key, {})
+        if previous.get("source") == vendor_source(asset_key):
+            try:
+                with open(target, 'rb') as f:
+                    if vendor_integrity(f.read()) == pinned:
+                        continue
+            except FileNotFoundError:
+                pass
+
+        try:
+            with urllib.request.urlopen(vendor['url'], timeout=30) as response:
+                raw = response.read()
+        except (OSError, ValueError) as e:
+            print(f"⚠️  {asset_key} nicht geladen ({vendor['url']}): {e} - CDN")
+            _remove(target)
+            missing += 1
+            continue
+
+        actual = vendor_integrity(raw)
+        if actual != pinned:
+            print(f"❌ {asset_key}: sha384 stimmt nicht ({vendor['url']} liefert {actual}) - CDN")
+            _remove(target)
+            missing += 1
+            continue
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_path = f"{target}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(raw)
+        os.replace(tmp_path, target)
+        print(f"📥 {asset_key} von {vendor['url']} ({len(raw)} Bytes, sha384 geprüft)")
+    return missing
+
+def pin_vendor():
+    """Gibt den sha384 der aktuellen Vendor-URLs zum Eintragen in config.py aus"""
+    for asset_key, vendor in CACHE_SETTINGS['vendor'].items():
+        with urllib.request.urlopen(vendor['url'], timeout=30) as response:
+            raw = response.read()
+        print(f"{asset_key}: 'sha384': '{vendor_integrity(raw)}'")
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def _write_if_changed(path, raw):
+    """Schreibt nur bei neuem Inhalt - mtime bleibt sonst, der Hash-Cache trifft"""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == raw:
+                return
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(raw)
+
+def build_bundles(base_dir=BASE_DIR):
+    """Minifiziert und bündelt die Seiten-Einstiegspunkte (CACHE_SETTINGS['bundles'])
+
+    Schreibt static/bundles/<seite>.min.js/.css und gibt ({Seite: {Art:
+    Asset-Key}}, Größenbericht) zurück. Fehlt eine Quelle (z.B. eine nicht
+    geladene Vendor-Bibliothek), wird das Bündel ausgelassen und die
+    Templates laden die Einzeldateien.
+    """
+    static_dir = os.path.join(base_dir, 'static')
+    bundles, report = {}, {}
+
+    for page, kinds in CACHE_SETTINGS['bundles'].items():
+        for kind, sources in kinds.items():
+            bundle_key = f"bundles/{page}.min.{kind}"
+            try:
+                parts = []
+                for source in sources:
+                    with open(os.path.join(static_dir, source), 'r', encoding='utf-8') as f:
+                        parts.append((source, f.read()))
+            except FileNotFoundError as e:
+                print(f"⚠️  Bündel {bundle_key} ausgelassen: {e.filename} fehlt")
+                bundle_path = os.path.join(static_dir, bundle_key)
+                if os.path.exists(bundle_path):
+                    os.remove(bundle_path)
+                continue
+
+            if kind == 'js':
+                # Führendes ; beendet den Direktiven-Prolog: ein "use strict"
+                # einer Quelle gilt nicht für das ganze Bündel
+                text = ';\n' + ''.join(f"/* {source} */\n{minify(source, code).strip()};\n"
+                                        for source, code in parts)
+            else:
+                text = ''.join(f"/* {source} */\n{minify(source, code).strip()}\n"
+                               for source, code in parts)
+            raw = text.encode('utf-8')
+            _write_if_changed(os.path.join(static_dir, bundle_key), raw)
+
+            bundles.setdefault(page, {})[kind] = bundle_key
+            report[bundle_key] = {
+                "sources": sum(len(code.encode('utf-8')) for _, code in parts),
+                "minified": len(raw),
+                "gzip": len(gzip.compress(raw, compresslevel=9, mtime=0)),
+            }
+    return bundles, report
+
+def size_report(bundle_report, previous=None):
+    """Größenbericht fürs Manifest, druckt Änderungen gegenüber dem letzten Build"""
+    total = {key: sum(entry[key] for entry in bundle_report.values())
+             for key in ("sources", "minified", "gzip")}
+    report = {"bundles": bundle_report, "total": total}
+
+    old = (previous or {}).get("bundles", {})
+    print(f"{'Bündel':<32}{'Quellen':>10}{'minified':>10}{'gzip':>10}{'Δ gzip':>10}")
+    for key, entry in list(bundle_report.items()) + [("Summe", total)]:
+        before = (previous or {}).get("total") if key == "Summe" else old.get(key)
+        delta = f"{entry['gzip'] - before['gzip']:+d}" if before else "neu"
+        print(f"{key:<32}{entry['sources']:>10}{entry['minified']:>10}{entry['gzip']:>10}{delta:>10}")
+    return report
+
+# ===== MANIFEST =====
+
+def build_outputs(manifest):
+    """Erzeugte Dateien (relativ zum Projekt), auf die ein Manifest zeigt
+
+    Der Server macht nur git pull - deploy.sh prüft damit, dass alles davon
+    mit committet ist (python3 cache_busting.py --list-outputs).
+    """
+    dist_dir = CACHE_SETTINGS['fingerprint_dir']
+    generated = set(CACHE_SETTINGS['vendor'])
+    for kinds in (manifest.get("bundles") or {}).values():
+        generated.update(kinds.values())
+
+    outputs = set()
+    for asset_key, entry in manifest.get("files", {}).items():
+        if asset_key in generated:
+            outputs.add(f"static/{asset_key}")
+        encoded = [variant["path"] for variant in (entry.get("encodings") or {}).values()]
+        outputs.update(f"static/{path}" for path in encoded)
+        fingerprinted = entry.get("fingerprinted")
+        if fingerprinted:
+            outputs.add(f"static/{dist_dir}/{fingerprinted}")
+            outputs.update(f"static/{dist_dir}/{fingerprinted}{path[len(asset_key):]}" for path in encoded)
+    return sorted(outputs)
+
+def create_version_manifest(base_dir=BASE_DIR):
     """Erstellt version_manifest.json mit allen Asset-Hashes"""
+    started = time.perf_counter()
+    manifest_path = os.path.join(base_dir, 'static', 'version_manifest.json')
+    try:
+        with open(manifest_path, 'r') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+    previous_report = previous.get("size_report")
 
-    static_files = {
-        # CSS Files
-        'css/game.css': 'static/css/game.css',
-        'css/create_game.css': 'static/css/create_game.css',
-        'css/join.css': 'static/css/join.css',
-
-        # JS Files
-        'js/game.js': 'static/js/game.js',
-        'js/create_game.js': 'static/js/create_game.js',
-        'js/join.js': 'static/js/join.js',
-
-        # Images
-        'suswords.png': 'static/suswords.png',
-        'suswords_splash.png': 'static/suswords_splash.png',
-        'suswords_icon192.png': 'static/suswords_icon192.png',
-        'favicon.ico': 'static/favicon.ico',
-
-        # Audio
-        'suswords.mp3': 'static/suswords.mp3',
-
-        # PWA Files
-        'manifest.json': 'static/manifest.json',
-        'sw.js': 'sw.js'
-    }
+    vendor_assets(base_dir, previous.get("files"))
+    bundles, bundle_report = build_bundles(base_dir)
+    static_files = discover_assets(base_dir)
+    cache_path = CACHE_SETTINGS['hash_cache_file']
+    hash_cache = load_hash_cache(cache_path)
+    tried = [encoding for encoding, _, _ in _compressors()]
+
+    with ThreadPoolExecutor(max_workers=CACHE_SETTINGS['hash_workers']) as pool:
+        results = list(pool.map(
+            lambda item: _process_asset(base_dir, item[0], item[1], hash_cache.get(item[1]), tried),
+            static_files.items()))
 
     version_manifest = {
         "build_time": datetime.now().isoformat(),
         "build_timestamp": int(time.time()),
         "files": {}
     }
+    new_cache = {}
+    fingerprinted = set()
+    reused = 0
 
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-
-    for asset_key, file_path in static_files.items():
-        full_path = os.path.join(base_dir, file_path)
-        file_hash = generate_file_hash(full_path)
-        version_manifest["files"][asset_key] = {
+    for (asset_key, file_path), (cached, hit) in zip(static_files.items(), results):
+        reused += hit
+        if "size" in cached:
+            new_cache[file_path] = cached
+        file_hash = cached["hash"]
+        entry = version_manifest["files"][asset_key] = {
             "hash": file_hash,
             "versioned_path": f"{asset_key}?v={file_hash}"
         }
+        if asset_key in CACHE_SETTINGS['vendor']:
+            entry["source"] = vendor_source(asset_key)
+        if cached.get("encodings"):
+            entry["size"] = cached["size"]
+            entry["encodings"] = cached["encodings"]
+        if file_path.startswith('static/') and "size" in cached:
+            fingerprinted.update(write_fingerprinted(base_dir, asset_key, entry))
+            entry["fingerprinted"] = fingerprinted_name(asset_key, file_hash)
 
-    # Global Version für komplettes Cache-Busting
+    # Global Version für komplettes Cache-Busting (nur Inhalte, nicht die
+    # Kompressionsvarianten - mit/ohne brotli gleiche Version). Hängt nur
+    # von Asset-Keys und Hashes ab, nicht von Build-Zeit oder Reihenfolge.
     global_hash = hashlib.md5(
-        json.dumps(version_manifest["files"], sort_keys=True).encode()
+        json.dumps({key: entry["hash"] for key, entry in version_manifest["files"].items()},
+                   sort_keys=True).encode()
     ).hexdigest()[:8]
 
     version_manifest["global_version"] = global_hash
+    version_manifest["bundles"] = bundles
+    version_manifest["size_report"] = size_report(bundle_report, previous_report)
 
     # Manifest speichern
-    manifest_path = os.path.join(base_dir, 'static', 'version_manifest.json')
     os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
 
     with open(manifest_path, 'w') as f:
         json.dump(version_manifest, f, indent=2)
 
+    pruned = prune_fingerprinted(base_dir, fingerprinted)
+
+    try:
+        save_hash_cache(cache_path, new_cache)
+    except OSError as e:
+        print(f"⚠️  Hash-Cache nicht gespeichert: {e}")
+
     print(f"✅ Version Manifest erstellt: {manifest_path}")
     print(f"🔄 Global Version: {global_hash}")
-    print(f"📁 {len(static_files)} Assets versioniert")
+    print(f"📁 {len(static_files)} Assets versioniert "
+          f"({reused} unverändert, {len(static_files) - reused} neu gehasht, "
+          f"{time.perf_counter() - started:.2f}s)")
+    compressed = sum(1 for entry in version_manifest["files"].values() if entry.get("encodings"))
+    print(f"🗜️  {compressed} Assets vorkomprimiert ({'br + gzip' if brotli is not None else 'nur gzip'})")
+    print(f"🔖 {len(fingerprinted)} Fingerprint-Dateien in static/{CACHE_SETTINGS['fingerprint_dir']}/"
+          f" ({pruned} alte nach Schonfrist gelöscht)")
 
     return version_manifest
 
 if __name__ == "__main__":
-    create_version_manifest()
\ No newline at end of file
+    if "--pin-vendor" in sys.argv[1:]:
+        pin_vendor()
+        sys.exit(0)
+    if "--list-outputs" in sys.argv[1:]:
+        with open(os.path.join(BASE_DIR, 'static', 'version_manifest.json'), 'r') as f:
+            print("\n".join(build_outputs(json.load(f))))
+        sys.exit(0)
+    if "--no-cache" in sys.argv[1:]:
+        # Alles neu hashen und komprimieren
+        try:
+            os.remove(CACHE_SETTINGS['hash_cache_file'])
+        except FileNotFoundError:
+            pass
+    create_version_manifest()
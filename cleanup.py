@@ -1,27 +1,21 @@
 # cleanup.py - Game Cleanup System für SusWords
 
-import json
-import os
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 
-def get_file_last_modified(filepath):
-    """Gibt das letzte Änderungsdatum einer Datei zurück"""
-    try:
-        return os.path.getmtime(filepath)
-    except:
-        return 0
+from core import lifecycle
+from utils.game_store import get_game_store
+
+ACTIVE_STATUSES = ('lobby', 'started')
 
-def is_game_abandoned(game_data, filepath, hours_threshold=24):
+def is_game_abandoned(summary, hours_threshold=24):
     """Prüft ob ein Spiel als abandoned gilt"""
     # Nur aktive Spiele prüfen (lobby oder started)
-    status = game_data.get('status', 'unknown')
-    if status not in ['lobby', 'started']:
+    if summary.get('status', 'unknown') not in ACTIVE_STATUSES:
         return False
 
-    # Letzte Änderung der Datei prüfen
-    last_modified = get_file_last_modified(filepath)
-    hours_since_modified = (time.time() - last_modified) / 3600
+    # Letzte Änderung des Spiels prüfen
+    hours_since_modified = (time.time() - (summary.get('updated_at') or 0)) / 3600
 
     return hours_since_modified > hours_threshold
 
@@ -33,55 +27,44 @@ def cleanup_abandoned_games(dry_run=True, hours_threshold=24):
         dry_run: Wenn True, nur anzeigen was passieren würde
         hours_threshold: Stunden ohne Aktivität bevor Spiel als abandoned gilt
     """
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    games_dir = os.path.join(base_dir, "games")
-
-    if not os.path.exists(games_dir):
-        print(f"❌ Games Verzeichnis nicht gefunden: {games_dir}")
-        return
-
     print(f"🧹 Game Cleanup gestartet (Threshold: {hours_threshold}h)")
     print(f"{'🔍 DRY RUN - ' if dry_run else '🚀 AKTIV - '}Änderungen {'werden NICHT' if dry_run else 'werden'} gespeichert")
     print("=" * 60)
 
-    files = [f for f in os.listdir(games_dir) if f.endswith('.json')]
+    store = get_game_store()
 
     total_games = 0
     abandoned_games = 0
     cleaned_games = 0
 
-    for filename in files:
-        filepath = os.path.join(games_dir, filename)
+    for summary in sorted(store.summaries(), key=lambda s: s['id']):
+        game_id = summary['id']
 
         try:
-            with open(filepath, 'r') as f:
-                game_data = json.load(f)
-
             total_games += 1
-            game_id = game_data.get('id', filename.replace('.json', ''))
-            status = game_data.get('status', 'unknown')
-            players = len(game_data.get('players', {}))
+            status = summary.get('status') or 'unknown'
+            players = summary['player_count']
 
-            last_modified = get_file_last_modified(filepath)
+            last_modified = summary.get('updated_at') or 0
             hours_since = (time.time() - last_modified) / 3600
             last_modified_str = datetime.fromtimestamp(last_modified).strftime('%Y-%m-%d %H:%M:%S')
 
             print(f"📋 {game_id}: Status={status}, Spieler={players}, Letzte Änderung={last_modified_str} ({hours_since:.1f}h)")
 
-            if is_game_abandoned(game_data, filepath, hours_threshold):
+            if is_game_abandoned(summary, hours_threshold):
                 abandoned_games += 1
                 print(f"   🗑️  ABANDONED - {hours_since:.1f}h ohne Aktivität")
 
                 if not dry_run:
                     # Spiel als abandoned markieren und beenden
-                    game_data['status'] = 'finished'
-                    game_data['winner'] = 'abandoned'
-                    game_data['end_reason'] = 'game_abandoned'
-                    game_data['abandoned_at'] = time.time()
-                    game_data['abandoned_after_hours'] = hours_since
+                    def mark_abandoned(game_data):
+                        game_data['status'] = 'finished'
+                        game_data['winner'] = 'abandoned'
+                        game_data['end_reason'] = 'game_abandoned'
+                        game_data['abandoned_at'] = lifecycle.mark_finished(game_data, activity=False)
+                        game_data['abandoned_after_hours'] = hours_since
 
-                    with open(filepath, 'w') as f:
-                        json.dump(game_data, f, indent=2)
+                    store.update_game(game_id, mark_abandoned)
 
                     cleaned_games += 1
                     print(f"   ✅ Spiel als 'finished/abandoned' markiert")
@@ -91,7 +74,7 @@ def cleanup_abandoned_games(dry_run=True, hours_threshold=24):
                 print(f"   ✅ Aktiv")
 
         except Exception as e:
-            print(f"❌ Fehler bei {filename}: {e}")
+            print(f"❌ Fehler bei {game_id}: {e}")
 
     print("=" * 60)
     print(f"📊 ZUSAMMENFASSUNG:")
@@ -105,53 +88,38 @@ def cleanup_abandoned_games(dry_run=True, hours_threshold=24):
 
 def get_cleanup_stats():
     """Gibt Cleanup-Statistiken zurück"""
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    games_dir = os.path.join(base_dir, "games")
-
-    if not os.path.exists(games_dir):
-        return {"error": "Games directory not found"}
-
-    files = [f for f in os.listdir(games_dir) if f.endswith('.json')]
+    try:
+        summaries = get_game_store().summaries()
+    except Exception as e:
+        return {"error": f"Could not read games: {e}"}
 
     stats = {
-        "total_games": 0,
+        "total_games": len(summaries),
         "active_games": 0,
         "abandoned_candidates": 0,
         "already_abandoned": 0,
         "games_by_age": {"<1h": 0, "1-6h": 0, "6-24h": 0, ">24h": 0}
     }
 
-    for filename in files:
-        filepath = os.path.join(games_dir, filename)
+    now = time.time()
+    for summary in summaries:
+        if summary.get('status') in ACTIVE_STATUSES:
+            stats["active_games"] += 1
 
-        try:
-            with open(filepath, 'r') as f:
-                game_data = json.load(f)
-
-            stats["total_games"] += 1
-            status = game_data.get('status', 'unknown')
-
-            if status in ['lobby', 'started']:
-                stats["active_games"] += 1
-
-                last_modified = get_file_last_modified(filepath)
-                hours_since = (time.time() - last_modified) / 3600
+            hours_since = (now - (summary.get('updated_at') or 0)) / 3600
 
-                if hours_since > 24:
-                    stats["abandoned_candidates"] += 1
-                    stats["games_by_age"][">24h"] += 1
-                elif hours_since > 6:
-                    stats["games_by_age"]["6-24h"] += 1
-                elif hours_since > 1:
-                    stats["games_by_age"]["1-6h"] += 1
-                else:
-                    stats["games_by_age"]["<1h"] += 1
-
-            elif game_data.get('end_reason') == 'game_abandoned':
-                stats["already_abandoned"] += 1
+            if hours_since > 24:
+                stats["abandoned_candidates"] += 1
+                stats["games_by_age"][">24h"] += 1
+            elif hours_since > 6:
+                stats["games_by_age"]["6-24h"] += 1
+            elif hours_since > 1:
+                stats["games_by_age"]["1-6h"] += 1
+            else:
+                stats["games_by_age"]["<1h"] += 1
 
-        except Exception as e:
-            continue
+        elif summary.get('end_reason') == 'game_abandoned':
+            stats["already_abandoned"] += 1
 
     return stats
 
@@ -38,6 +38,14 @@ GAME_SETTINGS = {
     'cleanup_threshold_hours': 48,
     'polling_interval_seconds': 3,
 
+    # Live-Updates (Server-Sent Events)
+    'events_heartbeat_seconds': 15,
+    # Jeder offene Stream belegt einen Worker-Thread (PythonAnywhere: feste
+    # Worker-Zahl) - darüber 503, game.js pollt dann /sync. 0 = SSE aus
+    'max_event_streams': 4,
+    'events_retry_ms': 3000,
+    'long_poll_max_wait_seconds': 25,
+
     # UI Timeouts
     'redirect_countdown_seconds': 5,
     'loading_delay_ms': 100,
@@ -49,14 +57,15 @@ GAME_SETTINGS = {
 # Basis-Verzeichnis des Projekts
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Daten-Verzeichnisse
-DATA_DIR = os.path.join(BASE_DIR, "games")
+# Daten-Verzeichnisse (SUSWORDS_DATA_DIR z.B. für Lasttests und Tests)
+DATA_DIR = os.environ.get("SUSWORDS_DATA_DIR") or os.path.join(BASE_DIR, "games")
 STATIC_DIR = os.path.join(BASE_DIR, "static")
 TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
 
 # Dateipfade
 VERSION_MANIFEST_PATH = os.path.join(STATIC_DIR, 'version_manifest.json')
 CLEANUP_LOG_PATH = os.path.join(BASE_DIR, 'cleanup.log')
+STATS_SNAPSHOT_PATH = os.path.join(DATA_DIR, '.stats_snapshot')
 
 # ===== FLASK-KONFIGURATION =====
 
@@ -70,37 +79,70 @@ FLASK_CONFIG = {
 # ===== CACHE-BUSTING EINSTELLUNGEN =====
 
 CACHE_SETTINGS = {
-    # Asset-Dateien für Cache-Busting
-    'static_files': {
-        # CSS Files
-        'css/game.css': 'static/css/game.css',
-        'css/create_game.css': 'static/css/create_game.css',
-        'css/join.css': 'static/css/join.css',
-
-        # JS Files
-        'js/game.js': 'static/js/game.js',
-        'js/create_game.js': 'static/js/create_game.js',
-        'js/join.js': 'static/js/join.js',
-
-        # Images
-        'suswords.png': 'static/suswords.png',
-        'suswords_splash.png': 'static/suswords_splash.png',
-        'suswords_icon192.png': 'static/suswords_icon192.png',
-        'favicon.ico': 'static/favicon.ico',
-
-        # Audio
-        'suswords.mp3': 'static/suswords.mp3',
-
-        # PWA Files
-        'manifest.json': 'static/manifest.json',
+    # Assets unter static/ findet cache_busting.py selbst, hier nur
+    # zusätzliche Dateien außerhalb von static/ (Asset-Key -> Pfad)
+    'extra_files': {
         'sw.js': 'sw.js'
     },
+    # Nicht versionieren (fnmatch auf den Asset-Key)
+    'exclude_patterns': ['version_manifest.json', '*.gz', '*.br', '*.tmp', 'dist/*'],
+
+    # Kopien mit Hash im Dateinamen (static/dist/js/game.3fa1b2c9.js, URL /dist/...)
+    'fingerprint_dir': 'dist',
+    # Alte Fingerprints so lange behalten (Clients mitten im Spiel)
+    'fingerprint_grace_days': 7,
+
+    # Sidecar mit (Größe, mtime, Hash) pro Datei - unveränderte werden übersprungen
+    'hash_cache_file': os.path.join(os.path.dirname(os.path.abspath(__file__)), '.asset_hashes.json'),
+    'hash_workers': 4,
+
+    # Bibliotheken vom CDN, die der Build nach static/ holt (Asset-Key -> Quelle).
+    # sha384 (SRI-Format) pinnt den Inhalt: neue URL -> neuen Hash mit
+    # python3 cache_busting.py --pin-vendor ermitteln. Ohne Hash bleibt es beim CDN
+    'vendor': {
+        'vendor/qrcode.min.js': {'url': 'https://cdn.jsdelivr.net/npm/qrcodejs@1.0.0/qrcode.min.js',
+                                 'sha384': None},
+        'vendor/chart.umd.js': {'url': 'https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.js',
+                                'sha384': None},
+    },
+    # Bündel pro Seite: Quellen werden minifiziert und zu static/bundles/<seite>.min.<art>
+    'bundles': {
+        'create_game': {'css': ['css/create_game.css'],
+                        'js': ['vendor/qrcode.min.js', 'js/create_game.js']},
+        'game': {'css': ['css/game.css'], 'js': ['js/game.js']},
+        'join': {'css': ['css/join.css'], 'js': ['js/join.js']},
+        'stats': {'js': ['vendor/chart.umd.js']},
+    },
 
     # Cache-Headers
     'versioned_max_age': 31536000,  # 1 Jahr für versionierte Assets
     'unversioned_max_age': 300,     # 5 Minuten für unverlierte Assets
 }
 
+# ===== GAME-STORE EINSTELLUNGEN =====
+
+STORE_SETTINGS = {
+    # Speicher-Backend: 'json' (games/*.json), 'sqlite' (WAL-Datenbank) oder
+    # 'eventlog' (Append-only Log pro Spiel, games/*.log)
+    # Umstieg: python3 migrate_games.py [--eventlog]
+    'backend': 'json',
+    'sqlite_path': os.path.join(DATA_DIR, 'games.sqlite3'),
+    # eventlog: alle n Ereignisse einen Snapshot schreiben (begrenzt das Nachspielen)
+    'snapshot_interval': 50,
+
+    # Write-Behind: Änderungen gebündelt im Hintergrund speichern
+    'write_behind': True,
+    'flush_interval_seconds': 0.5,
+    'flush_batch_size': 50,
+
+    # Maximale Anzahl Spiele im Speicher (älteste werden verdrängt)
+    'max_cached_games': 2000,
+
+    # Mehrere WSGI-Worker-Prozesse: fcntl-Locks, synchrones Schreiben
+    'multi_process': False,
+    'fsync_writes': False,
+}
+
 # ===== STATISTIK-EINSTELLUNGEN =====
 
 STATS_SETTINGS = {
@@ -113,6 +155,10 @@ STATS_SETTINGS = {
     'daily_stats': True,
     'weekly_stats': True,
     'monthly_stats': False,
+
+    # Inkrementeller Stats-Aggregator (Snapshot in games/.stats_snapshot)
+    'snapshot_interval_seconds': 30,
+    'aggregator_rebuild_seconds': 60,  # nur bei multi_process: Neuaufbau aus dem Store
 }
 
 # ===== ENTWICKLUNGS-EINSTELLUNGEN =====
@@ -140,6 +186,7 @@ def get_setting(category, key, default=None):
         'game': GAME_SETTINGS,
         'flask': FLASK_CONFIG,
         'cache': CACHE_SETTINGS,
+        'store': STORE_SETTINGS,
         'stats': STATS_SETTINGS,
         'dev': DEV_SETTINGS,
     }
@@ -9,6 +9,8 @@ import random
 import time
 from typing import Dict, List, Optional, Tuple, Any
 
+from core.turn_ring import TurnRing, is_eliminated
+
 SECRET_WORDS = [
     "Ampel", "Ananas", "Badehose", "Ballon", "Banane", "Banjo", "Besen", "Besenstiel", "Bleistift", "Blitz",
     "Brille", "Brunnen", "Buch", "Drachen", "Eimer", "Einhorn", "Eule", "Fernbedienung", "Feuerzeug", "Flasche",
@@ -108,7 +110,7 @@ class GameLogic:
         # Spielreihenfolge festlegen
         random.shuffle(player_ids)
         game_data["turn_order"] = player_ids
-        game_data["current_turn_index"] = 0
+        TurnRing.create(game_data, player_ids)
 
         self.file_manager.save_game(game_id, game_data)
 
@@ -162,13 +164,13 @@ class GameLogic:
         })
 
         # Nächster Spieler
-        self._advance_turn(game_data)
+        next_player_id = self._advance_turn(game_data)
 
         self.file_manager.save_game(game_id, game_data)
 
         return {
             "status": "ok",
-            "next_turn_index": game_data["current_turn_index"]
+            "next_player_id": next_player_id
         }
 
     def get_game_state_for_player(self, game_id: str, player_id: str) -> Dict[str, Any]:
@@ -229,7 +231,6 @@ class GameLogic:
             raise ValueError("Game not found")
 
         players = game_data.get("players", {})
-        eliminated = game_data.get("eliminated_players", [])
 
         return [
             {
@@ -237,7 +238,7 @@ class GameLogic:
                 "name": pdata.get("name", ""),
                 "role": pdata.get("role", "pending"),
                 "is_master": pdata.get("is_master", False),
-                "eliminated": pdata.get("eliminated", False) or pid in eliminated
+                "eliminated": pdata.get("eliminated", False)
             }
             for pid, pdata in players.items()
         ]
@@ -261,6 +262,7 @@ class GameLogic:
         game_data["votes"] = None
         game_data["history"] = []
         game_data["eliminated_players"] = []
+        game_data.pop("turn_ring", None)
 
         # Game-Ende Daten entfernen
         for key in ["winner", "end_reason", "finished_at", "started_at"]:
@@ -294,64 +296,22 @@ class GameLogic:
 
     def _is_player_eliminated(self, game_data: Dict, player_id: str) -> bool:
         """Prüft ob ein Spieler eliminiert ist"""
-        return (game_data["players"][player_id].get("eliminated", False) or
-                player_id in game_data.get("eliminated_players", []))
+        return is_eliminated(game_data, player_id)
 
     def _is_player_turn(self, game_data: Dict, player_id: str) -> bool:
         """Prüft ob ein Spieler an der Reihe ist"""
-        current_index = game_data.get("current_turn_index", 0)
-        turn_order = game_data.get("turn_order", [])
-
-        if not turn_order:
-            return False
-
-        # Aktive Spieler-Reihenfolge
-        active_turn_order = [pid for pid in turn_order
-                           if not self._is_player_eliminated(game_data, pid)]
-
-        if not active_turn_order:
-            return False
-
-        # Index anpassen falls nötig
-        if current_index >= len(active_turn_order):
-            current_index = current_index % len(active_turn_order)
-            game_data["current_turn_index"] = current_index
-
-        current_player_id = active_turn_order[current_index % len(active_turn_order)]
-        return player_id == current_player_id
-
-    def _advance_turn(self, game_data: Dict) -> None:
-        """Geht zum nächsten Spieler über"""
-        current_index = game_data.get("current_turn_index", 0)
-        turn_order = game_data.get("turn_order", [])
+        return TurnRing.of(game_data).is_current(player_id)
 
-        # Aktive Spieler
-        active_turn_order = [pid for pid in turn_order
-                           if not self._is_player_eliminated(game_data, pid)]
-
-        if active_turn_order:
-            game_data["current_turn_index"] = (current_index + 1) % len(active_turn_order)
+    def _advance_turn(self, game_data: Dict) -> Optional[str]:
+        """Geht zum nächsten aktiven Spieler über und gibt dessen ID zurück"""
+        return TurnRing.of(game_data, persist=True).advance()
 
     def _get_current_player_name(self, game_data: Dict) -> Optional[str]:
         """Gibt den Namen des aktuellen Spielers zurück"""
-        current_index = game_data.get("current_turn_index", 0)
-        turn_order = game_data.get("turn_order", [])
-        players = game_data.get("players", {})
-
-        # Aktive Spieler
-        active_turn_order = [pid for pid in turn_order
-                           if not self._is_player_eliminated(game_data, pid)]
-
-        if not active_turn_order:
+        current_player_id = TurnRing.of(game_data).current
+        if not current_player_id:
             return None
-
-        # Index anpassen falls nötig
-        if current_index >= len(active_turn_order):
-            current_index = current_index % len(active_turn_order)
-            game_data["current_turn_index"] = current_index
-
-        current_player_id = active_turn_order[current_index % len(active_turn_order)]
-        return players[current_player_id]["name"] if current_player_id else None
+        return game_data.get("players", {})[current_player_id]["name"]
 
     def _get_vote_info_for_player(self, game_data: Dict, player_id: str) -> Optional[Dict]:
         """Gibt Vote-Informationen für einen Spieler zurück"""
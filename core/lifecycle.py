@@ -0,0 +1,75 @@
+# lifecycle.py - Zeitstempel für Zustandswechsel eines Spiels
+"""
+Jeder Zustandswechsel schreibt seinen Zeitpunkt ins Spiel-Dokument:
+
+    created_at      /create_game
+    started_at      /start_game (bei Restart zurückgesetzt)
+    finished_at     Spielende (Sieg, /end_game, abandoned)
+    last_activity   jede Spieler-Aktion und jeder Zustandswechsel
+    votes.started_at / votes.ended_at und vote_log[] pro Vote
+    history[].at    Zeitpunkt jedes Wortes
+
+Stats, Timeline und Cleanup lesen diese Felder statt Datei-Zeitstempel -
+die stimmen nach jedem Umschreiben (Migration, Backup) nicht mehr.
+Innerhalb eines Spiels sind die Zeitstempel monoton: springt die Uhr zurück,
+wird last_activity wiederverwendet statt in die Vergangenheit zu stempeln.
+"""
+
+import time
+
+def now(game_data):
+    """Aktueller Zeitpunkt, nie früher als die letzte Aktivität des Spiels"""
+    return max(time.time(), game_data.get("last_activity") or 0)
+
+def touch(game_data):
+    """Markiert eine Spieler-Aktion (Join, Ready, Wort, Stimme)"""
+    at = now(game_data)
+    game_data["last_activity"] = at
+    return at
+
+def mark_created(game_data):
+    at = touch(game_data)
+    game_data["created_at"] = at
+    return at
+
+def mark_started(game_data):
+    at = touch(game_data)
+    game_data["started_at"] = at
+    game_data.pop("finished_at", None)
+    game_data["vote_log"] = []
+    return at
+
+def mark_finished(game_data, activity=True):
+    """Stempelt das Spielende
+
+    activity=False für das Bereinigen verlassener Spiele: last_activity
+    bleibt dann der Zeitpunkt der letzten echten Aktion.
+    """
+    at = touch(game_data) if activity else now(game_data)
+    game_data["finished_at"] = at
+    return at
+
+def mark_restarted(game_data):
+    """Zurück in die Lobby - Start, Ende und Vote-Log gelten nicht mehr"""
+    touch(game_data)
+    for key in ("started_at", "finished_at", "vote_log"):
+        game_data.pop(key, None)
+
+def mark_vote_started(game_data):
+    """Gibt den Startzeitpunkt für das neue votes-Objekt zurück"""
+    return touch(game_data)
+
+def mark_vote_ended(game_data, result=None):
+    """Stempelt das Ende des laufenden Votes (einmal pro Vote) und loggt es"""
+    votes = game_data.get("votes")
+    if not votes or votes.get("ended_at"):
+        return None
+
+    at = touch(game_data)
+    votes["ended_at"] = at
+    game_data.setdefault("vote_log", []).append({
+        "started_at": votes.get("started_at"),
+        "ended_at": at,
+        "result": result or votes.get("result")
+    })
+    return at
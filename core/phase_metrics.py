@@ -0,0 +1,144 @@
+# phase_metrics.py - Dauer der Spielphasen als Histogramme
+"""
+Misst aus den Lifecycle-Zeitstempeln (core/lifecycle.py), wie lange die
+einzelnen Phasen eines Spiels dauern:
+
+    lobby_wait       created_at -> started_at
+    first_word       started_at -> erstes Wort
+    turn_time        vorheriges Wort (bzw. Start/Vote-Ende) -> nächstes Wort
+    vote_duration    Vote-Start -> Vote-Ende
+    game_duration    started_at -> finished_at
+
+Gefüttert wird PhaseMetrics vom StatsAggregator bei jedem Commit. Pro
+laufendem Spiel wird nur ein kleiner Cursor gehalten (was schon gezählt
+ist), beendete Spiele fallen heraus - der Speicher bleibt beschränkt.
+Mit den Daten lassen sich Polling-Intervalle und vote_duration_seconds
+an echten Werten ausrichten.
+"""
+
+import threading
+
+from utils.histogram import Histogram
+
+GAME_PHASES = ('lobby_wait', 'first_word', 'turn_time', 'game_duration')
+VOTE_PHASES = ('vote_duration',)
+
+PHASE_LABELS = {
+    'lobby_wait': 'Wartezeit in der Lobby',
+    'first_word': 'Zeit bis zum ersten Wort',
+    'turn_time': 'Bedenkzeit pro Zug',
+    'vote_duration': 'Dauer eines Votes',
+    'game_duration': 'Spieldauer',
+}
+
+
+class PhaseMetrics:
+    """Histogramme pro Phase plus Zähler der Vote-Ergebnisse"""
+
+    def __init__(self, track_game_duration=True, track_vote_outcomes=True):
+        self.track_game_duration = track_game_duration
+        self.track_vote_outcomes = track_vote_outcomes
+
+        phases = (GAME_PHASES if track_game_duration else ()) + (VOTE_PHASES if track_vote_outcomes else ())
+        self.histograms = {phase: Histogram() for phase in phases}
+        self.vote_outcomes = {}
+
+        self._lock = threading.Lock()
+        self._cursors = {}           # game_id -> [started_at, Wörter, Votes] (bereits gezählt)
+
+    def _record(self, phase, start, end):
+        histogram = self.histograms.get(phase)
+        if histogram is not None and start and end and end >= start:
+            histogram.record(end - start)
+
+    def observe(self, game_id, game_data):
+        """Zählt neue Übergänge seit dem letzten Commit dieses Spiels (None = gelöscht)"""
+        with self._lock:
+            if game_data is None:
+                self._cursors.pop(game_id, None)
+                return
+
+            started_at = game_data.get('started_at')
+            cursor = self._cursors.get(game_id)
+            finished = game_data.get('status') == 'finished'
+
+            if cursor is None and (finished or game_data.get('version', 1) > 1):
+                # Spiel mitten im Verlauf zum ersten Mal gesehen (z.B. nach einem
+                # Neustart ohne Snapshot): nur noch Folgendes zählen
+                if not finished:
+                    self._cursors[game_id] = [started_at,
+                                              len(game_data.get('history') or []),
+                                              len(game_data.get('vote_log') or [])]
+                return
+
+            if cursor is None or cursor[0] != started_at:
+                # Neues Spiel, Start oder Restart
+                cursor = self._cursors[game_id] = [started_at, 0, 0]
+                if started_at:
+                    self._record('lobby_wait', game_data.get('created_at'), started_at)
+
+            self._observe_turns(game_data, cursor)
+            self._observe_votes(game_data, cursor)
+
+            if finished:
+                self._record('game_duration', started_at, game_data.get('finished_at'))
+                del self._cursors[game_id]
+
+    def _observe_turns(self, game_data, cursor):
+        history = game_data.get('history') or []
+        if len(history) <= cursor[1]:
+            return
+
+        vote_ends = [vote.get('ended_at') or 0 for vote in game_data.get('vote_log') or []]
+        for i in range(cursor[1], len(history)):
+            at = history[i].get('at')
+            if i == 0:
+                self._record('first_word', cursor[0], at)
+                continue
+            # Bedenkzeit ab dem letzten Wort oder einem danach beendeten Vote
+            previous = history[i - 1].get('at') or 0
+            since = max([previous] + [end for end in vote_ends if end <= (at or 0)])
+            self._record('turn_time', since, at)
+        cursor[1] = len(history)
+
+    def _observe_votes(self, game_data, cursor):
+        vote_log = game_data.get('vote_log') or []
+        for vote in vote_log[cursor[2]:]:
+            self._record('vote_duration', vote.get('started_at'), vote.get('ended_at'))
+            if self.track_vote_outcomes:
+                result = vote.get('result') or 'unknown'
+                self.vote_outcomes[result] = self.vote_outcomes.get(result, 0) + 1
+        cursor[2] = len(vote_log)
+
+    # ===== ABFRAGEN & SNAPSHOT =====
+
+    def summary(self):
+        """Kennzahlen pro Phase (Sekunden) und Vote-Ergebnisse"""
+        with self._lock:
+            outcomes = dict(self.vote_outcomes)
+            active = len(self._cursors)
+        return {
+            'phases': {
+                phase: dict(histogram.summary(), label=PHASE_LABELS[phase])
+                for phase, histogram in self.histograms.items()
+            },
+            'vote_outcomes': outcomes,
+            'tracked_games': active,
+        }
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'histograms': {phase: h.to_dict() for phase, h in self.histograms.items()},
+                'vote_outcomes': dict(self.vote_outcomes),
+                'cursors': dict(self._cursors),
+            }
+
+    def load(self, data):
+        """Übernimmt Histogramme und Cursor aus einem Snapshot"""
+        with self._lock:
+            for phase, histogram in (data.get('histograms') or {}).items():
+                if phase in self.histograms:
+                    self.histograms[phase] = Histogram.from_dict(histogram)
+            self.vote_outcomes = dict(data.get('vote_outcomes') or {})
+            self._cursors = {game_id: list(cursor) for game_id, cursor in (data.get('cursors') or {}).items()}
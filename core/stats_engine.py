@@ -0,0 +1,383 @@
+# stats_engine.py - Zentrale Statistik-Engine für SusWords
+"""
+Eine Stelle für alle Spielstatistiken: Gesamtzahlen, Launch-Stats, Timeline,
+Wochentage und Trend. Der Store wird höchstens einmal gelesen (scan) und in
+eine kompakte spaltenweise Tabelle übertragen, alles Weitere wird aus Tages-
+Buckets berechnet. Der StatsAggregator hält dieselben Buckets inkrementell
+aktuell, sodass /stats im Normalfall gar nicht mehr scannt.
+"""
+
+import time
+from array import array
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+LAUNCH_DATE = date(2025, 5, 20)
+
+ACTIVE_STATUSES = ('lobby', 'started')
+MIN_TIMELINE_DAYS = 7
+MAX_TIMELINE_DAYS = 90
+
+# Ein Spiel als Tupel (so auch im Snapshot des Aggregators)
+# (status, winner, end_reason, player_count, created_at, finished_at)
+STATUS, WINNER, END_REASON, PLAYER_COUNT, CREATED_AT, FINISHED_AT = range(6)
+
+# Felder eines Tages-Buckets:
+#   games/players/active - nach Erstellungstag (active: noch lobby/started)
+#   finished/abandoned   - nach Tag des Spielendes
+BUCKET_FIELDS = ('games', 'players', 'active', 'finished', 'abandoned')
+
+
+# ===== SPALTENWEISE TABELLE =====
+
+class _Category:
+    """Spalte mit wenigen verschiedenen Werten (Status, Gewinner, ...) als Codes
+
+    Gewinner und Ende-Grund kommen vom Client (/end_game) - die Zahl der
+    verschiedenen Werte ist also nicht begrenzt, daher 32-Bit- statt Byte-Codes.
+    """
+
+    def __init__(self):
+        self.codes = array('I')
+        self.values = []
+        self._index = {}
+
+    def append(self, value):
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, i):
+        return self.values[self.codes[i]]
+
+
+class GameTable:
+    """Kompakte Tabelle aller Spiele - eine Spalte pro Feld
+
+    Zeitstempel liegen als double-Arrays vor (0 = unbekannt), Status, Gewinner
+    und Ende-Grund als Codes in die Werteliste. Eine Zeile kostet so rund 40 Bytes statt
+    eines kompletten Spiel-Dicts.
+    """
+
+    COLUMNS = ('id', 'status', 'end_reason', 'winner', 'player_count',
+               'created_at', 'finished_at', 'updated_at')
+
+    def __init__(self):
+        self.ids = []
+        self.status = _Category()
+        self.end_reason = _Category()
+        self.winner = _Category()
+        self.player_count = array('I')
+        self.created_at = array('d')
+        self.finished_at = array('d')
+        self.updated_at = array('d')
+
+    def __len__(self):
+        return len(self.ids)
+
+    def append(self, game_id, status, end_reason, winner, player_count,
+               created_at, finished_at=None, updated_at=None):
+        self.ids.append(game_id)
+        self.status.append(status)
+        self.end_reason.append(end_reason)
+        self.winner.append(winner)
+        self.player_count.append(player_count or 0)
+        self.created_at.append(created_at or 0.0)
+        self.finished_at.append(finished_at or 0.0)
+        self.updated_at.append(updated_at or 0.0)
+
+    def record(self, i):
+        """Zeile i als Statistik-Record"""
+        return (
+            self.status[i],
+            self.winner[i],
+            self.end_reason[i],
+            self.player_count[i],
+            self.created_at[i],
+            self.finished_at[i] or None,
+        )
+
+    def records(self):
+        """(game_id, record, updated_at) für jede Zeile"""
+        for i, game_id in enumerate(self.ids):
+            yield game_id, self.record(i), self.updated_at[i]
+
+    @classmethod
+    def from_summaries(cls, summaries):
+        """Tabelle aus Store-Zusammenfassungen (siehe GameStore.summaries)"""
+        table = cls()
+        for summary in summaries:
+            record = record_from_summary(summary)
+            table.append(summary['id'], record[STATUS], record[END_REASON], record[WINNER],
+                         record[PLAYER_COUNT], record[CREATED_AT], record[FINISHED_AT],
+                         summary.get('updated_at'))
+        return table
+
+    @classmethod
+    def from_games(cls, games):
+        """Tabelle aus kompletten Spiel-Dicts"""
+        table = cls()
+        for game_data in games:
+            record = record_from_game(game_data)
+            table.append(game_data.get('id'), record[STATUS], record[END_REASON], record[WINNER],
+                         record[PLAYER_COUNT], record[CREATED_AT], record[FINISHED_AT])
+        return table
+
+
+def scan(store=None):
+    """Liest den Store genau einmal und gibt die GameTable zurück"""
+    if store is None:
+        from utils.game_store import get_game_store
+        store = get_game_store()
+    return GameTable.from_summaries(store.summaries())
+
+
+# ===== RECORDS =====
+
+def record_from_game(game_data, old=None):
+    """Reduziert ein Spiel auf die Felder, die die Statistik braucht
+
+    Fehlende Zeitstempel (Spiele von vor der Einführung) werden aus dem
+    bisherigen Record übernommen bzw. auf den aktuellen Zeitpunkt gesetzt.
+    """
+    now = time.time()
+    status = game_data.get('status')
+
+    finished_at = None
+    if status == 'finished':
+        finished_at = game_data.get('finished_at') or (old and old[FINISHED_AT]) or now
+
+    return (
+        status,
+        game_data.get('winner'),
+        game_data.get('end_reason'),
+        len(game_data.get('players') or {}),
+        game_data.get('created_at') or (old and old[CREATED_AT]) or now,
+        finished_at,
+    )
+
+def record_from_summary(summary):
+    """Record aus einer Store-Zusammenfassung (Datei-Zeitstempel als Fallback)"""
+    status = summary.get('status')
+    finished_at = None
+    if status == 'finished':
+        finished_at = summary.get('finished_at') or summary.get('updated_at') or time.time()
+
+    return (
+        status,
+        summary.get('winner'),
+        summary.get('end_reason'),
+        summary.get('player_count') or 0,
+        summary.get('created_at') or summary.get('updated_at') or time.time(),
+        finished_at,
+    )
+
+
+# ===== ZÄHLER & TAGES-BUCKETS =====
+
+def empty_totals():
+    return {
+        'total_games': 0,
+        'active_games': 0,
+        'finished_games': 0,
+        'total_players': 0,
+        'impostor_wins': 0,
+        'player_wins': 0,
+        'already_abandoned': 0,
+    }
+
+def day_key(timestamp):
+    """Tages-Bucket (lokale Zeit) für einen Unix-Zeitstempel"""
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
+
+def _bucket(daily, timestamp, field, delta):
+    key = day_key(timestamp)
+    bucket = daily.get(key)
+    if bucket is None:
+        bucket = daily[key] = dict.fromkeys(BUCKET_FIELDS, 0)
+    bucket[field] += delta
+    if not any(bucket.values()):
+        del daily[key]
+
+def apply_record(totals, daily, record, sign=1):
+    """Addiert (sign=1) oder entfernt (sign=-1) ein Spiel in Zählern und Buckets"""
+    status, winner, end_reason, player_count, created_at, finished_at = record
+
+    totals['total_games'] += sign
+    if status not in ('finished', 'abandoned'):
+        totals['active_games'] += sign
+    if status == 'finished':
+        totals['finished_games'] += sign
+        totals['total_players'] += sign * player_count
+        if winner == 'impostor':
+            totals['impostor_wins'] += sign
+        elif winner == 'players':
+            totals['player_wins'] += sign
+    if end_reason == 'game_abandoned':
+        totals['already_abandoned'] += sign
+
+    _bucket(daily, created_at, 'games', sign)
+    _bucket(daily, created_at, 'players', sign * player_count)
+    if status in ACTIVE_STATUSES:
+        _bucket(daily, created_at, 'active', sign)
+    if finished_at is not None:
+        field = 'abandoned' if end_reason == 'game_abandoned' else 'finished'
+        _bucket(daily, finished_at, field, sign)
+
+def aggregate(table):
+    """Ein Durchlauf über die Tabelle -> (totals, daily)"""
+    totals = empty_totals()
+    daily = {}
+    for i in range(len(table)):
+        apply_record(totals, daily, table.record(i))
+    return totals, daily
+
+
+# ===== AUSWERTUNGEN AUS DEN BUCKETS =====
+
+def clamp_days(days):
+    return min(max(int(days), MIN_TIMELINE_DAYS), MAX_TIMELINE_DAYS)
+
+def timeline(daily, days=30, today=None):
+    """Timeline der letzten days Tage (bis einschließlich heute)
+
+    O(days) unabhängig von der Anzahl Spiele - alle Fenster zwischen
+    MIN_TIMELINE_DAYS und MAX_TIMELINE_DAYS kommen aus denselben Buckets.
+    """
+    days = clamp_days(days)
+    today = today or date.today()
+
+    result = []
+    for offset in range(days - 1, -1, -1):
+        day = (today - timedelta(days=offset)).strftime('%Y-%m-%d')
+        bucket = daily.get(day, {})
+        result.append({
+            'date': day,
+            'games': bucket.get('games', 0),
+            'players': bucket.get('players', 0),
+            'finished': bucket.get('finished', 0)
+        })
+    return result
+
+def launch_stats(daily, launch_date=LAUNCH_DATE, today=None):
+    """Launch-spezifische Statistiken (Spiele nach Erstellungstag)"""
+    today = today or date.today()
+    total_days = (today - launch_date).days + 1  # +1 um Launch-Tag mitzuzählen
+
+    # Tägliche Spiel-Counts (nur Spiele seit Launch)
+    daily_counts = {}
+    for day, bucket in daily.items():
+        game_date = datetime.strptime(day, '%Y-%m-%d').date()
+        if game_date >= launch_date and bucket['games'] > 0:
+            daily_counts[game_date] = bucket['games']
+
+    total_games_since_launch = sum(daily_counts.values())
+
+    # Bester Tag finden
+    best_day = {'date': 'N/A', 'games': 0}
+    if daily_counts:
+        best_date = max(daily_counts, key=daily_counts.get)
+        best_day = {
+            'date': best_date.strftime('%d.%m.%Y'),
+            'games': daily_counts[best_date]
+        }
+
+    # Wachstumstrend (letzte 7 Tage)
+    growth_trend = []
+    for i in range(7):
+        day = today - timedelta(days=6-i)
+        if day >= launch_date:
+            growth_trend.append({
+                'date': day.strftime('%d.%m'),
+                'games': daily_counts.get(day, 0)
+            })
+
+    return {
+        'total_days': total_days,
+        'active_days': len(daily_counts),
+        'avg_games_per_day': round(total_games_since_launch / max(total_days, 1), 1),
+        'best_day': best_day,
+        'growth_trend': growth_trend,
+        'total_games_since_launch': total_games_since_launch
+    }
+
+def weekday_stats(timeline_data):
+    """Spiele pro Wochentag (Kurzname wie '%a') über ein Timeline-Fenster"""
+    weekdays = defaultdict(int)
+    for day in timeline_data:
+        weekdays[day['weekday']] += day['total_games']
+    return dict(weekdays)
+
+def trend(timeline_data):
+    """Veränderung der letzten 7 Tage gegenüber den 7 Tagen davor in Prozent"""
+    if len(timeline_data) < 7:
+        return 0
+
+    recent_week = sum(day['total_games'] for day in timeline_data[-7:])
+    if len(timeline_data) >= 14:
+        previous_week = sum(day['total_games'] for day in timeline_data[-14:-7])
+    else:
+        previous_week = recent_week
+
+    if previous_week > 0:
+        return ((recent_week - previous_week) / previous_week) * 100
+    return 0 if recent_week == 0 else 100
+
+def timeline_report(daily, days=30, today=None):
+    """Ausführliche Timeline für das Frontend inklusive Wochentagen, Trend und Peak"""
+    days = clamp_days(days)
+    today = today or date.today()
+
+    timeline_data = []
+    for offset in range(days - 1, -1, -1):  # älteste zuerst
+        day = today - timedelta(days=offset)
+        bucket = daily.get(day.strftime('%Y-%m-%d'), {})
+        timeline_data.append({
+            "date": day.strftime('%Y-%m-%d'),
+            "display_date": day.strftime('%d.%m'),
+            "weekday": day.strftime('%a'),
+            "total_games": bucket.get('games', 0),
+            "finished_games": bucket.get('finished', 0),
+            "active_games": bucket.get('active', 0),
+            "abandoned_games": bucket.get('abandoned', 0),
+            "is_today": day == today,
+            "is_weekend": day.weekday() >= 5  # Samstag=5, Sonntag=6
+        })
+
+    total_games = sum(day["total_games"] for day in timeline_data)
+    trend_percent = trend(timeline_data)
+
+    return {
+        "timeline_data": timeline_data,
+        "summary": {
+            "total_games": total_games,
+            "max_games_per_day": max(day["total_games"] for day in timeline_data),
+            "avg_games_per_day": round(total_games / days, 1),
+            "days_analyzed": days,
+            "trend_percent": round(trend_percent, 1),
+            "trend_direction": "up" if trend_percent > 5 else "down" if trend_percent < -5 else "stable"
+        },
+        "weekday_stats": weekday_stats(timeline_data),
+        "peak_day": max(timeline_data, key=lambda x: x["total_games"])
+    }
+
+def game_stats(totals, daily, launch_date=LAUNCH_DATE, today=None):
+    """Gesamtübersicht für /stats und /debug/stats"""
+    today = today or date.today()
+    impostor_wins = totals['impostor_wins']
+    player_wins = totals['player_wins']
+
+    return {
+        'total_games': totals['total_games'],
+        'active_games': totals['active_games'],
+        'finished_games': totals['finished_games'],
+        'total_players': totals['total_players'],
+        'impostor_wins': impostor_wins,
+        'player_wins': player_wins,
+        'impostor_win_rate': round((impostor_wins / max(impostor_wins + player_wins, 1)) * 100, 1),
+        'timeline': timeline(daily, 30, today),
+        'launch_stats': launch_stats(daily, launch_date, today),
+        'days_since_launch': (today - launch_date).days
+    }
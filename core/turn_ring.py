@@ -0,0 +1,125 @@
+# turn_ring.py - Spielreihenfolge als Ring der aktiven Spieler
+"""
+Statt bei jedem Request active_turn_order aus turn_order, players und
+eliminated_players neu zu filtern, hält das Spiel-Dokument einen Ring:
+
+    "turn_ring": {
+        "current": "a1b2c3d4",
+        "links": {"a1b2c3d4": ["<vorheriger>", "<nächster>"], ...}
+    }
+
+Im Ring stehen nur aktive Spieler, jeder mit seinen beiden Nachbarn. Damit
+sind "wer ist dran", "nächster Spieler" und "Spieler eliminieren" O(1) -
+und eine Elimination verschiebt die Reihenfolge nicht mehr: scheidet der
+aktuelle Spieler aus, ist sein Nachfolger dran, sonst bleibt alles, wie es
+war. Als "eliminiert"-Menge dient das Flag players[pid]["eliminated"];
+turn_order (Sitzordnung) und eliminated_players bleiben für die Clients.
+
+Ältere Spiele ohne turn_ring (turn_order + current_turn_index) werden beim
+ersten Zugriff in einen Ring übersetzt.
+"""
+
+PREV, NEXT = 0, 1
+
+
+class TurnRing:
+    """Sicht auf game_data["turn_ring"] - Änderungen gehen direkt ins Dokument"""
+
+    def __init__(self, data=None):
+        self.data = data if data is not None else {"current": None, "links": {}}
+        self.links = self.data["links"]
+
+    @classmethod
+    def create(cls, game_data, order):
+        """Legt den Ring für ein startendes Spiel an, der Erste in order ist dran"""
+        order = list(order)
+        count = len(order)
+        links = {pid: [order[i - 1], order[(i + 1) % count]] for i, pid in enumerate(order)}
+        ring = cls({"current": order[0] if order else None, "links": links})
+        game_data["turn_ring"] = ring.data
+        game_data.pop("current_turn_index", None)
+        return ring
+
+    @classmethod
+    def of(cls, game_data, persist=False):
+        """Ring eines Spiels (leer, falls es noch keine Reihenfolge gibt)
+
+        Lesende Routes verändern das Dokument nicht: ein aus Alt-Feldern
+        übersetzter Ring wird nur mit persist=True gespeichert.
+        """
+        data = game_data.get("turn_ring")
+        if data is not None:
+            return cls(data)
+
+        ring = cls(_from_legacy(game_data))
+        if persist and ring.links:
+            game_data["turn_ring"] = ring.data
+            game_data.pop("current_turn_index", None)
+        return ring
+
+    # ===== ABFRAGEN =====
+
+    @property
+    def current(self):
+        """ID des Spielers, der dran ist (None ohne aktive Spieler)"""
+        return self.data["current"]
+
+    def __len__(self):
+        return len(self.links)
+
+    def __contains__(self, player_id):
+        return player_id in self.links
+
+    def __iter__(self):
+        """Aktive Spieler in Zugreihenfolge, beginnend beim aktuellen"""
+        player_id = self.current
+        for _ in range(len(self.links)):
+            yield player_id
+            player_id = self.links[player_id][NEXT]
+
+    def is_current(self, player_id):
+        return player_id is not None and player_id == self.current
+
+    # ===== ÄNDERUNGEN =====
+
+    def advance(self):
+        """Nächster aktiver Spieler ist dran, gibt dessen ID zurück"""
+        if self.current is not None:
+            self.data["current"] = self.links[self.current][NEXT]
+        return self.current
+
+    def remove(self, player_id):
+        """Nimmt einen Spieler aus dem Ring (mehrfacher Aufruf ist harmlos)
+
+        War er dran, rückt sein Nachfolger auf seinen Platz.
+        """
+        link = self.links.pop(player_id, None)
+        if link is None:
+            return
+        if not self.links:
+            self.data["current"] = None
+            return
+
+        previous, following = link
+        self.links[previous][NEXT] = following
+        self.links[following][PREV] = previous
+        if self.data["current"] == player_id:
+            self.data["current"] = following
+
+
+def is_eliminated(game_data, player_id):
+    """Eliminiert-Flag eines Spielers (O(1) statt Suche in eliminated_players)"""
+    return game_data.get("players", {}).get(player_id, {}).get("eliminated", False)
+
+def _from_legacy(game_data):
+    """Ring aus turn_order + current_turn_index (Index in die aktiven Spieler)"""
+    players = game_data.get("players", {})
+    eliminated = set(game_data.get("eliminated_players", []))
+    active = [pid for pid in game_data.get("turn_order", [])
+              if pid in players and not players[pid].get("eliminated", False) and pid not in eliminated]
+    if not active:
+        return {"current": None, "links": {}}
+
+    start = game_data.get("current_turn_index", 0) % len(active)
+    order = active[start:] + active[:start]
+    return TurnRing.create({}, order).data
@@ -7,6 +7,8 @@ Verwaltet alle Vote-bezogenen Funktionen
 import time
 from typing import Dict, List, Optional, Any
 
+from core.turn_ring import TurnRing, is_eliminated
+
 class VotingSystem:
     """Verwaltet das Abstimmungssystem"""
 
@@ -93,11 +95,8 @@ class VotingSystem:
         total_votes = len(votes_data["votes"]) + 1  # +1 für die gerade abgegebene Stimme
 
         # Aktive Spieler zählen (ohne Suspect)
-        active_players = [pid for pid, p in game_data["players"].items()
-                         if not p.get("eliminated", False)
-                         and pid not in game_data.get("eliminated_players", [])
-                         and pid != votes_data["suspect"]]
-        total_possible_votes = len(active_players)
+        active_players = TurnRing.of(game_data)
+        total_possible_votes = len(active_players) - (votes_data["suspect"] in active_players)
 
         self.file_manager.save_game(game_id, game_data)
 
@@ -123,13 +122,10 @@ class VotingSystem:
         if not votes or "suspect" not in votes or not votes.get("suspect"):
             return {"active": False}
 
-        # Aktive Spieler zählen
-        active_players = [pid for pid, p in game_data["players"].items()
-                         if not p.get("eliminated", False)
-                         and pid not in game_data.get("eliminated_players", [])
-                         and pid != votes.get("suspect")]
+        # Aktive Spieler zählen (ohne Suspect)
+        active_players = TurnRing.of(game_data)
 
-        votes_needed = len(active_players)
+        votes_needed = len(active_players) - (votes.get("suspect") in active_players)
         votes_cast = len(votes.get("votes", {}))
 
         # Kann der Spieler abstimmen?
@@ -271,11 +267,11 @@ class VotingSystem:
         if vote_counts["up"] > vote_counts["down"]:
             # Spieler eliminieren
             suspect_id = votes_data["suspect"]
-            if suspect_id not in game_data.get("eliminated_players", []):
-                if "eliminated_players" not in game_data:
-                    game_data["eliminated_players"] = []
-                game_data["eliminated_players"].append(suspect_id)
+            if not is_eliminated(game_data, suspect_id):
+                game_data.setdefault("eliminated_players", []).append(suspect_id)
                 game_data["players"][suspect_id]["eliminated"] = True
+            # Aus dem Ring nehmen - war er dran, ist sein Nachfolger dran
+            self._update_turn_after_elimination(game_data, suspect_id)
 
             # Spiel-Ende prüfen
             if suspect_id == game_data.get("impostorId"):
@@ -286,13 +282,10 @@ class VotingSystem:
                 votes_data["result"] = "impostor_eliminated"
             else:
                 # Prüfen ob nur noch Impostor + 1 Spieler übrig
-                active_players = [pid for pid, p in game_data["players"].items()
-                                if not p.get("eliminated", False) and
-                                pid not in game_data.get("eliminated_players", [])]
+                active_players = TurnRing.of(game_data)
 
                 # Impostor noch im Spiel?
-                impostor_id = game_data.get("impostorId")
-                impostor_still_in_game = (impostor_id in active_players)
+                impostor_still_in_game = game_data.get("impostorId") in active_players
 
                 if impostor_still_in_game and len(active_players) <= 2:
                     game_data["status"] = "finished"
@@ -302,75 +295,20 @@ class VotingSystem:
                     votes_data["result"] = "impostor_wins"
                 else:
                     votes_data["result"] = "player_eliminated"
-                    # Spielreihenfolge aktualisieren
-                    self._update_turn_after_elimination(game_data, suspect_id)
         else:
             votes_data["result"] = "vote_failed"
 
     def _update_turn_after_elimination(self, game_data: Dict, eliminated_player_id: str) -> None:
-        """Aktualisiert die Spielreihenfolge nach einer Elimination"""
-        current_index = game_data.get("current_turn_index", 0)
-        turn_order = game_data.get("turn_order", [])
-
-        # Aktive Spieler nach Elimination
-        active_turn_order = [pid for pid in turn_order
-                           if not game_data["players"].get(pid, {}).get("eliminated", False)
-                           and pid not in game_data.get("eliminated_players", [])]
-
-        if active_turn_order:
-            # Aktueller Spieler
-            if current_index < len(turn_order):
-                current_player_id = turn_order[current_index]
-            else:
-                current_player_id = turn_order[0] if turn_order else None
-
-            # Wenn aktueller Spieler eliminiert wurde
-            if current_player_id not in active_turn_order or current_player_id == eliminated_player_id:
-                # Nächsten aktiven Spieler finden
-                current_idx_in_original = -1
-                for i, pid in enumerate(turn_order):
-                    if pid == current_player_id:
-                        current_idx_in_original = i
-                        break
-
-                # Nächsten aktiven Spieler suchen
-                next_idx_in_original = (current_idx_in_original + 1) % len(turn_order)
-                attempts = 0
-                while attempts < len(turn_order):
-                    next_player_id = turn_order[next_idx_in_original]
-                    if next_player_id in active_turn_order:
-                        game_data["current_turn_index"] = next_idx_in_original
-                        break
-                    next_idx_in_original = (next_idx_in_original + 1) % len(turn_order)
-                    attempts += 1
+        """Aktualisiert die Spielreihenfolge nach einer Elimination (O(1) im Turn-Ring)"""
+        TurnRing.of(game_data, persist=True).remove(eliminated_player_id)
 
     def _is_player_eliminated(self, game_data: Dict, player_id: str) -> bool:
         """Prüft ob ein Spieler eliminiert ist"""
-        return (game_data["players"][player_id].get("eliminated", False) or
-                player_id in game_data.get("eliminated_players", []))
+        return is_eliminated(game_data, player_id)
 
     def _is_player_turn(self, game_data: Dict, player_id: str) -> bool:
         """Prüft ob ein Spieler an der Reihe ist"""
-        current_index = game_data.get("current_turn_index", 0)
-        turn_order = game_data.get("turn_order", [])
-
-        if not turn_order:
-            return False
-
-        # Aktive Spieler-Reihenfolge
-        active_turn_order = [pid for pid in turn_order
-                           if not self._is_player_eliminated(game_data, pid)]
-
-        if not active_turn_order:
-            return False
-
-        # Index anpassen falls nötig
-        if current_index >= len(active_turn_order):
-            current_index = current_index % len(active_turn_order)
-            game_data["current_turn_index"] = current_index
-
-        current_player_id = active_turn_order[current_index % len(active_turn_order)]
-        return player_id == current_player_id
+        return TurnRing.of(game_data).is_current(player_id)
 
     def _add_vote_result_info(self, response_data: Dict, game_data: Dict, player_id: str) -> None:
         """Fügt zusätzliche Informationen zum Vote-Ergebnis hinzu"""
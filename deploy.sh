@@ -40,6 +40,18 @@ echo "📝 Committe Änderungen..."
 git add .
 git commit -m "🚀 Deploy v$VERSION - $(date '+%Y-%m-%d %H:%M:%S')" || echo "ℹ️  Keine neuen Änderungen"
 
+# 5b. Build-Ausgaben prüfen - der Server macht nur git pull, alles worauf
+#     das Manifest zeigt (dist/, bundles/, vendor/, .gz/.br) muss committet sein
+echo "🔍 Prüfe Build-Ausgaben..."
+MISSING=$(python3 cache_busting.py --list-outputs | while read -r OUTPUT; do
+    git ls-files --error-unmatch -- "$OUTPUT" > /dev/null 2>&1 || echo "$OUTPUT"
+done)
+if [ -n "$MISSING" ]; then
+    echo "❌ Nicht committete Build-Ausgaben (.gitignore?):"
+    echo "$MISSING"
+    exit 1
+fi
+
 # 6. Push zu GitHub (automatische Branch-Erkennung)
 echo "⬆️  Pushe zu GitHub..."
 if [ "$CURRENT_BRANCH" = "main" ]; then
@@ -0,0 +1,81 @@
+# migrate_games.py - Einmalige Migration games/*.json -> SQLite oder Event-Log
+
+import os
+import sys
+
+from config import DATA_DIR, STORE_SETTINGS
+from utils.storage_backends import EventLogBackend, JsonFileBackend, SqliteBackend
+
+def migrate_games(db_path=None, dry_run=False, eventlog=False):
+    """
+    Importiert alle games/*.json in die SQLite-Datenbank oder das Event-Log
+
+    Bereits importierte Spiele werden überschrieben (beim Event-Log als
+    weiteres Ereignis angehängt), die Migration kann also gefahrlos mehrfach
+    laufen. Die JSON-Dateien bleiben unverändert.
+
+    Args:
+        db_path: Ziel-Datenbank (Standard: STORE_SETTINGS['sqlite_path'])
+        dry_run: Wenn True, nur anzeigen was importiert würde
+        eventlog: Wenn True, nach games/*.log statt nach SQLite importieren
+    """
+    db_path = db_path or STORE_SETTINGS['sqlite_path']
+    source = JsonFileBackend(DATA_DIR)
+    if eventlog:
+        target_name = f"{DATA_DIR}/*.log"
+        target = None if dry_run else EventLogBackend(
+            DATA_DIR, snapshot_interval=STORE_SETTINGS['snapshot_interval'])
+    else:
+        target_name = db_path
+        target = None if dry_run else SqliteBackend(db_path)
+
+    print(f"📦 Migration {DATA_DIR}/*.json -> {target_name}")
+    print(f"{'🔍 DRY RUN - ' if dry_run else '🚀 AKTIV - '}Änderungen {'werden NICHT' if dry_run else 'werden'} gespeichert")
+    print("=" * 60)
+
+    imported = 0
+    failed = 0
+
+    for game_id in sorted(source.list_ids()):
+        try:
+            game_data, _ = source.read(game_id)
+            if game_data is None:
+                continue
+
+            # Zeitstempel der Datei übernehmen, damit Stats und Cleanup stimmen
+            summary = source.summary(game_id)
+            if not game_data.get('created_at'):
+                game_data = dict(game_data, created_at=summary['created_at'])
+
+            if target is not None and eventlog:
+                if not game_data.get('last_activity'):
+                    game_data = dict(game_data, last_activity=summary['updated_at'])
+                target.write(game_id, game_data)
+            elif target is not None:
+                target.write(game_id, game_data, updated_at=summary['updated_at'])
+
+            imported += 1
+            print(f"✅ {game_id}: Status={summary['status']}, Spieler={summary['player_count']}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ Fehler bei {game_id}: {e}")
+
+    if target is not None:
+        target.close()
+
+    print("=" * 60)
+    print(f"📊 {'Würden importiert werden' if dry_run else 'Importiert'}: {imported}, Fehler: {failed}")
+
+    if not dry_run and imported:
+        backend = 'eventlog' if eventlog else 'sqlite'
+        print(f"\n💡 Backend aktivieren: STORE_SETTINGS['backend'] = '{backend}' in config.py")
+
+    return imported, failed
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    db_path = None
+    if "--db" in args:
+        db_path = os.path.abspath(args[args.index("--db") + 1])
+
+    migrate_games(db_path=db_path, dry_run="--dry-run" in args, eventlog="--eventlog" in args)
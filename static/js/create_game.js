@@ -170,8 +170,25 @@ async function createGame() {
 
 async function refreshLobby() {
   try {
-    const res = await fetch(`/players_in_game/${gameId}`);
-    const data = await res.json();
+    // Spielerliste und Spielstatus in einem Request - /sync kennt nur
+    // Spieler des Spiels, ohne gültige player_id nur die Spielerliste
+    let sync = null;
+    if (playerId) {
+      const res = await fetch(`/sync/${gameId}/${playerId}`);
+      if (res.ok) {
+        sync = await res.json();
+      }
+    }
+    let data;
+    if (sync) {
+      data = sync.players;
+    } else {
+      const res = await fetch(`/players_in_game/${gameId}`);
+      if (!res.ok) {
+        throw new Error(`HTTP ${res.status}`);
+      }
+      data = await res.json();
+    }
 
     const playerListContainer = document.getElementById("playerList");
     playerListContainer.innerHTML = "";
@@ -205,8 +222,7 @@ async function refreshLobby() {
     }
 
     // Check if game started
-    const state = await fetch(`/game_state/${gameId}/${playerId}`).then(r => r.json());
-    if (state.game_status === "started") {
+    if (sync && sync.state.game_status === "started") {
       window.location.href = `/game?game_id=${gameId}&player_id=${playerId}`;
     }
   } catch (error) {
@@ -6,6 +6,7 @@ let playerName = "";
 let isImpostor = false;
 let isPolling = false;
 let gamePollingInterval = null;
+let gameEvents = null;
 let lastGameState = null;
 let connectionStatus = "connected";
 let retryAttempts = 0;
@@ -71,7 +72,7 @@ async function initGame() {
   try {
     await lookupOwnPlayerName();
     await monitorGame();
-    startGamePolling();
+    startLiveUpdates();
     setupEventListeners();
     setupMutationObserver();
   } catch (err) {
@@ -132,6 +133,62 @@ function startGamePolling() {
   gamePollingInterval = setInterval(monitorGame, 3000);
 }
 
+function stopGamePolling() {
+  if (gamePollingInterval) clearInterval(gamePollingInterval);
+  gamePollingInterval = null;
+}
+
+function isLiveConnected() {
+  return gameEvents !== null && gameEvents.readyState === EventSource.OPEN;
+}
+
+// Server-Sent Events: Server schickt jede neue Spielversion, Polling nur als Fallback
+function startLiveUpdates() {
+  if (!window.EventSource) {
+    startGamePolling();
+    return;
+  }
+
+  gameEvents = new EventSource(`/events/${gameId}/${playerId}`);
+
+  gameEvents.addEventListener("state", async (event) => {
+    stopGamePolling();
+    retryAttempts = 0;
+
+    try {
+      await applySync(JSON.parse(event.data));
+      updateConnectionStatus("connected");
+    } catch (err) {
+      console.error("Fehler beim Verarbeiten des Live-Updates:", err);
+      updateConnectionStatus("error");
+    }
+  });
+
+  // Verbunden: verpasste Versionen liefert der Server per Last-Event-ID nach
+  gameEvents.onopen = () => stopGamePolling();
+
+  gameEvents.addEventListener("gone", () => {
+    stopLiveUpdates();
+    updateConnectionStatus("error");
+  });
+
+  gameEvents.onerror = () => {
+    // EventSource verbindet sich selbst neu (mit Last-Event-ID) - bis dahin pollen
+    if (!gamePollingInterval) startGamePolling();
+    if (gameEvents && gameEvents.readyState === EventSource.CLOSED) {
+      gameEvents = null;
+    }
+  };
+}
+
+function stopLiveUpdates() {
+  stopGamePolling();
+  if (gameEvents) {
+    gameEvents.close();
+    gameEvents = null;
+  }
+}
+
 function updateConnectionStatus(status) {
   const statusElem = document.getElementById("connectionStatus");
   connectionStatus = status;
@@ -156,11 +213,11 @@ function updateConnectionStatus(status) {
 async function lookupOwnPlayerName() {
   try {
     updateConnectionStatus("polling");
-    const res = await fetch(`/players_in_game/${gameId}`);
+    const res = await fetch(`/sync/${gameId}/${playerId}`);
     if (!res.ok) throw new Error(`Server-Fehler: ${res.status}`);
 
     const data = await res.json();
-    const player = data.players.find(p => p.player_id === playerId);
+    const player = data.players.players.find(p => p.player_id === playerId);
 
     if (!player) {
       throw new Error("Spieler nicht im Spiel gefunden");
@@ -194,55 +251,14 @@ async function monitorGame() {
   updateConnectionStatus("polling");
 
   try {
-    const res = await fetch(`/game_state/${gameId}/${playerId}`);
+    // Spielzustand, Spielerliste und Vote-Status in einem Request
+    const res = await fetch(`/sync/${gameId}/${playerId}`);
     if (!res.ok) throw new Error(`Server-Fehler: ${res.status}`);
 
-    const data = await res.json();
-
-    if (data.game_status === "finished") {
-      showGameOverScreen(data);
-      clearInterval(gamePollingInterval);
-      clearVotingTimers();
-      updateConnectionStatus("connected");
-      return;
-    }
-
-    if (data.status === "eliminated") {
-      document.getElementById("gameSection").innerHTML =
-        `<div id='errorMessage'>${data.message || "Du wurdest aus dem Spiel entfernt!"}</div>`;
-      clearInterval(gamePollingInterval);
-      clearVotingTimers();
-      updateConnectionStatus("connected");
-      return;
-    }
-
-    if (!data || data.error) {
-      throw new Error(data?.error || "Unbekannter Serverfehler");
-    }
-
-    lastGameState = data;
-
-    try {
-      const playersRes = await fetch(`/players_in_game/${gameId}`);
-      if (!playersRes.ok) throw new Error(`Fehler beim Laden der Spielerliste: ${playersRes.status}`);
-      const playersData = await playersRes.json();
-
-      updateGameUI(data, playersData);
-
-      if (data.active_vote && currentVotePhase === null) {
-        await handleActiveVote(data.active_vote);
-      } else if (!data.active_vote && currentVotePhase !== null) {
-        clearVotingTimers();
-        hideVotingOverlay();
-      }
+    await applySync(await res.json());
 
-      updateConnectionStatus("connected");
-      retryAttempts = 0;
-    } catch (playersErr) {
-      console.error("Fehler beim Laden der Spielerliste:", playersErr);
-      updateGameUI(data, { players: [] });
-      updateConnectionStatus("error");
-    }
+    updateConnectionStatus("connected");
+    retryAttempts = 0;
   } catch (err) {
     console.error("Fehler beim Aktualisieren des Spielstatus:", err);
     document.getElementById("status").innerHTML =
@@ -263,6 +279,56 @@ async function monitorGame() {
   }
 }
 
+// Ergebnis von /sync bzw. Live-Event anwenden
+async function applySync(update) {
+  const data = update.state;
+
+  if (handleGameEnd(data)) return;
+
+  if (!data || data.error) {
+    throw new Error(data?.error || "Unbekannter Serverfehler");
+  }
+
+  lastGameState = data;
+  await applyGameUpdate(data, update.players);
+
+  if (update.vote && currentVotePhase === VOTE_PHASES.VOTING) {
+    await handleVoteStatus(update.vote);
+  }
+}
+
+function handleGameEnd(data) {
+  if (data.game_status === "finished") {
+    showGameOverScreen(data);
+    stopLiveUpdates();
+    clearVotingTimers();
+    updateConnectionStatus("connected");
+    return true;
+  }
+
+  if (data.status === "eliminated") {
+    document.getElementById("gameSection").innerHTML =
+      `<div id='errorMessage'>${data.message || "Du wurdest aus dem Spiel entfernt!"}</div>`;
+    stopLiveUpdates();
+    clearVotingTimers();
+    updateConnectionStatus("connected");
+    return true;
+  }
+
+  return false;
+}
+
+async function applyGameUpdate(data, playersData) {
+  updateGameUI(data, playersData);
+
+  if (data.active_vote && currentVotePhase === null) {
+    await handleActiveVote(data.active_vote);
+  } else if (!data.active_vote && currentVotePhase !== null) {
+    clearVotingTimers();
+    hideVotingOverlay();
+  }
+}
+
 async function handleActiveVote(voteData) {
   console.log("[VOTE] Active vote detected:", voteData);
 
@@ -322,7 +388,8 @@ async function startVoteTimer() {
     timeLeft--;
     updateTimerDisplay(timeLeft);
 
-    if (timeLeft % 5 === 0) {
+    // Mit Live-Updates kommt der Vote-Status per Event
+    if (timeLeft % 5 === 0 && !isLiveConnected()) {
       await checkVoteStatus();
     }
 
@@ -358,28 +425,31 @@ function updateTimerDisplay(seconds) {
 
 async function checkVoteStatus() {
   try {
-    const res = await fetch(`/vote_status/${gameId}/${playerId}`);
+    const res = await fetch(`/sync/${gameId}/${playerId}`);
     if (!res.ok) {
       console.warn("[VOTE] Vote status check failed:", res.status);
       return;
     }
 
-    const voteData = await res.json();
+    const data = await res.json();
+    await handleVoteStatus(data.vote);
+  } catch (err) {
+    console.error("[VOTE] Error checking vote status:", err);
+  }
+}
 
-    if (!voteData.active) {
-      clearVotingTimers();
-      hideVotingOverlay();
-      return;
-    }
+async function handleVoteStatus(voteData) {
+  if (!voteData.active) {
+    clearVotingTimers();
+    hideVotingOverlay();
+    return;
+  }
 
-    updateVoteProgress(voteData);
+  updateVoteProgress(voteData);
 
-    if (voteData.result) {
-      clearVotingTimers();
-      await showVoteResults(voteData);
-    }
-  } catch (err) {
-    console.error("[VOTE] Error checking vote status:", err);
+  if (voteData.result) {
+    clearVotingTimers();
+    await showVoteResults(voteData);
   }
 }
 
@@ -1063,7 +1133,7 @@ document.addEventListener("visibilitychange", () => {
 });
 
 window.addEventListener("beforeunload", (e) => {
-  if (gamePollingInterval) clearInterval(gamePollingInterval);
+  stopLiveUpdates();
   clearVotingTimers();
   cleanupObservers();
 
@@ -1,97 +1,224 @@
-// sw.js - Minimaler, stabiler Service Worker für SusWords
+// sw.js - Service Worker für SusWords: Precache aus dem Version-Manifest
+//
+// - Install: liest die global_version aus static/version_manifest.json, lädt
+//   die App-Shell (Start, Erstellen, Beitreten, Spiel) in den Cache
+//   suswords-<global_version> und dazu nur die versionierten Assets
+//   (/dist/... bzw. /static/...?v=), die diese Seiten einbinden - keine
+//   Screenshots, Audio oder Einzeldateien, die in Bündeln stecken.
+//   Unveränderte Assets werden aus dem Cache der Vorversion kopiert.
+// - Versionierte Assets: Cache-first (ihr Inhalt ändert sich nie)
+// - HTML: Navigation Preload bzw. Netzwerk, offline die gecachte Shell
+//   (nur Aufrufe ohne Query-Parameter landen im Cache)
+// - API-Calls gehen immer ans Netzwerk
+// - Activate: löscht alle Caches anderer global_versions
+
+const CACHE_PREFIX = 'suswords-';
+const MANIFEST_URL = '/static/version_manifest.json';
+const APP_SHELL = ['/', '/create', '/join', '/game'];
+
+// index.html registriert /sw.js?v=<global_version>; ohne v wird beim Install nachgesehen
+let globalVersion = new URLSearchParams(location.search).get('v');
+
+function cacheName(version) {
+  return CACHE_PREFIX + version;
+}
+
+async function fetchManifest() {
+  const response = await fetch(MANIFEST_URL, { cache: 'no-store' });
+  if (!response.ok) {
+    throw new Error(`Manifest HTTP ${response.status}`);
+  }
+  return response.json();
+}
+
+// Audio/Video (z.B. suswords.mp3, 2,5 MB) nicht vorab laden - das spielt
+// die Seite ohnehin per Stream ab
+const PRECACHE_SKIP = /\.(mp3|ogg|wav|mp4|webm)$/;
+
+// Versionierte Assets, die eine Shell-Seite per src/href einbindet
+function referencedAssets(html) {
+  const urls = new Set();
+  for (const match of html.matchAll(/(?:src|href)=["']([^"']+)["']/g)) {
+    const url = new URL(match[1], location.origin);
+    if (url.origin === location.origin && isVersionedAsset(url) && !PRECACHE_SKIP.test(url.pathname)) {
+      urls.add(url.pathname + url.search);
+    }
+  }
+  return urls;
+}
 
-const CACHE_NAME = 'suswords-v' + (new URLSearchParams(location.search).get('v') || Date.now());
+async function currentCache() {
+  if (!globalVersion) {
+    const manifest = await fetchManifest();
+    globalVersion = manifest.global_version;
+  }
+  return caches.open(cacheName(globalVersion));
+}
 
-// Install Event - Sofort aktivieren
+// Install Event - Precache, dann sofort aktivieren
 self.addEventListener('install', (event) => {
-  console.log('[SW] Installing minimal Service Worker...');
-  event.waitUntil(self.skipWaiting());
+  console.log('[SW] Installing Service Worker...');
+  event.waitUntil(
+    (async () => {
+      try {
+        const manifest = await fetchManifest();
+        globalVersion = manifest.global_version || globalVersion;
+        const cache = await caches.open(cacheName(globalVersion));
+
+        // Shell-Seiten laden und ihre Assets einsammeln
+        const assets = new Set();
+        const shell = await Promise.allSettled(APP_SHELL.map(async (url) => {
+          const response = await fetch(url, { cache: 'no-cache' });
+          if (!response.ok) {
+            throw new Error(`${url}: HTTP ${response.status}`);
+          }
+          await cache.put(url, response.clone());
+          referencedAssets(await response.text()).forEach(asset => assets.add(asset));
+        }));
+
+        // Einzeln laden: ein fehlendes Asset soll den Install nicht abbrechen.
+        // Versionierte URLs ändern ihren Inhalt nie - was ein alter
+        // suswords-*-Cache schon hat, wird nur kopiert
+        let copied = 0;
+        const results = await Promise.allSettled([...assets].map(async (url) => {
+          if (await cache.match(url)) {
+            return;
+          }
+          const previous = await caches.match(url);
+          if (previous) {
+            await cache.put(url, previous);
+            copied++;
+            return;
+          }
+          const response = await fetch(url, { cache: 'no-cache' });
+          if (!response.ok) {
+            throw new Error(`${url}: HTTP ${response.status}`);
+          }
+          await cache.put(url, response);
+        }));
+
+        const failed = [...shell, ...results].filter(result => result.status === 'rejected');
+        const total = APP_SHELL.length + assets.size;
+        console.log(`[SW] Precached ${total - failed.length}/${total} URLs for ${globalVersion} (${copied} copied)`);
+        failed.forEach(result => console.warn('[SW] Precache failed:', result.reason.message));
+      } catch (error) {
+        // Ohne Manifest trotzdem installieren - dann wird beim Abruf gecacht
+        console.warn('[SW] Precache skipped:', error.message);
+      }
+      await self.skipWaiting();
+    })()
+  );
 });
 
-// Activate Event - Übernehme sofort alle Tabs
+// Activate Event - Navigation Preload an, alte Versionen aufräumen, Tabs übernehmen
 self.addEventListener('activate', (event) => {
-  console.log('[SW] Activating minimal Service Worker...');
+  console.log('[SW] Activating Service Worker...');
   event.waitUntil(
     (async () => {
-      // Alle Clients übernehmen
-      await clients.claim();
-
-      // Alte Caches aufräumen
-      const cacheNames = await caches.keys();
-      const oldCaches = cacheNames.filter(name =>
-        name.startsWith('suswords-') && name !== CACHE_NAME
-      );
+      if (self.registration.navigationPreload) {
+        await self.registration.navigationPreload.enable();
+      }
 
-      if (oldCaches.length > 0) {
-        console.log('[SW] Cleaning old caches:', oldCaches);
-        await Promise.all(oldCaches.map(name => caches.delete(name)));
+      if (globalVersion) {
+        const current = cacheName(globalVersion);
+        const cacheNames = await caches.keys();
+        const oldCaches = cacheNames.filter(name => name.startsWith(CACHE_PREFIX) && name !== current);
+        if (oldCaches.length > 0) {
+          console.log('[SW] Cleaning old caches:', oldCaches);
+          await Promise.all(oldCaches.map(name => caches.delete(name)));
+        }
       }
+
+      await clients.claim();
     })()
   );
 });
 
-// Fetch Event - Einfache, robuste Strategie
+function isVersionedAsset(url) {
+  return url.pathname.startsWith('/dist/') ||
+         (url.pathname.startsWith('/static/') && url.searchParams.has('v'));
+}
+
+function isStaticAsset(url) {
+  return url.pathname.startsWith('/static/') && url.pathname !== MANIFEST_URL;
+}
+
+// Versionierte Assets: Cache-first, beim ersten Abruf nachladen
+async function cacheFirst(request) {
+  const cached = await caches.match(request);
+  if (cached) {
+    return cached;
+  }
+  const response = await fetch(request);
+  if (response.ok && response.type === 'basic') {
+    try {
+      const cache = await currentCache();
+      await cache.put(request, response.clone());
+    } catch (cacheError) {
+      // Cache-Fehler ignorieren, nicht crashen
+      console.warn('[SW] Cache failed:', cacheError.message);
+    }
+  }
+  return response;
+}
+
+// Unversionierte Assets: sofort aus dem Cache, im Hintergrund aktualisieren
+async function staleWhileRevalidate(event) {
+  const cached = await caches.match(event.request);
+  const update = fetch(event.request).then(async (response) => {
+    if (response.ok && response.type === 'basic') {
+      const cache = await currentCache();
+      await cache.put(event.request, response.clone());
+    }
+    return response;
+  });
+  if (cached) {
+    event.waitUntil(update.catch(() => {}));
+    return cached;
+  }
+  return update;
+}
+
+// HTML: Preload-Response bzw. Netzwerk, offline die gecachte Shell
+async function navigate(event) {
+  const url = new URL(event.request.url);
+  try {
+    const response = (await event.preloadResponse) || await fetch(event.request);
+    // Nur die Shell ohne Parameter: /game?game_id=...&player_id=... enthält
+    // serverseitig ein bestimmtes Spiel und gehört nicht in die Offline-Shell
+    if (response.ok && !url.search && APP_SHELL.includes(url.pathname)) {
+      const copy = response.clone();
+      event.waitUntil(currentCache().then(cache => cache.put(url.pathname, copy)).catch(() => {}));
+    }
+    return response;
+  } catch (networkError) {
+    console.log('[SW] Network failed, serving app shell for:', url.pathname);
+    const cached = await caches.match(event.request, { ignoreSearch: true }) ||
+                   await caches.match(url.pathname, { ignoreSearch: true });
+    if (cached) {
+      return cached;
+    }
+    throw networkError;
+  }
+}
+
 self.addEventListener('fetch', (event) => {
   const request = event.request;
   const url = new URL(request.url);
 
-  // Nur HTTP/HTTPS und GET requests behandeln
-  if (!url.protocol.startsWith('http') || request.method !== 'GET') {
+  // Nur GET auf die eigene Origin behandeln
+  if (request.method !== 'GET' || url.origin !== location.origin) {
     return;
   }
 
-  // API Calls nicht cachen (immer fresh)
-  if (url.pathname.includes('/api/') ||
-      url.pathname.includes('/game_state/') ||
-      url.pathname.includes('/vote_') ||
-      url.pathname.includes('/debug') ||
-      url.pathname.includes('/create_game') ||
-      url.pathname.includes('/join_game')) {
-    return;
+  if (request.mode === 'navigate') {
+    event.respondWith(navigate(event));
+  } else if (isVersionedAsset(url)) {
+    event.respondWith(cacheFirst(request));
+  } else if (isStaticAsset(url)) {
+    event.respondWith(staleWhileRevalidate(event));
   }
-
-  // Einfache Strategie: Network-first mit Cache-Fallback
-  event.respondWith(
-    (async () => {
-      try {
-        // Versuche Netzwerk zuerst
-        const networkResponse = await fetch(request);
-
-        // NUR erfolgreiche, komplette Responses cachen
-        if (networkResponse.ok &&
-            networkResponse.status === 200 &&
-            networkResponse.type === 'basic') {
-
-          // Versionierte Assets länger cachen
-          if (url.searchParams.has('v')) {
-            try {
-              const cache = await caches.open(CACHE_NAME);
-              await cache.put(request, networkResponse.clone());
-              console.log('[SW] Cached versioned asset:', url.pathname);
-            } catch (cacheError) {
-              // Cache-Fehler ignorieren, nicht crashen
-              console.warn('[SW] Cache failed:', cacheError.message);
-            }
-          }
-        }
-
-        return networkResponse;
-
-      } catch (networkError) {
-        // Netzwerk fehlgeschlagen - versuche Cache
-        console.log('[SW] Network failed, trying cache for:', url.pathname);
-
-        const cachedResponse = await caches.match(request);
-        if (cachedResponse) {
-          console.log('[SW] Serving from cache:', url.pathname);
-          return cachedResponse;
-        }
-
-        // Kein Cache verfügbar - Fehler weiterreichen
-        throw networkError;
-      }
-    })()
-  );
+  // Alles andere (API, SSE, /version, Manifest) geht direkt ans Netzwerk
 });
 
 // Message Handler für Version-Updates
@@ -99,7 +226,7 @@ self.addEventListener('message', (event) => {
   if (event.data && event.data.type === 'CHECK_VERSION') {
     event.ports[0].postMessage({
       type: 'VERSION_INFO',
-      version: CACHE_NAME
+      version: globalVersion ? cacheName(globalVersion) : null
     });
   }
 
@@ -108,4 +235,4 @@ self.addEventListener('message', (event) => {
   }
 });
 
-console.log('[SW] Minimal Service Worker loaded successfully with cache:', CACHE_NAME);
\ No newline at end of file
+console.log('[SW] Service Worker loaded, version:', globalVersion || '(from manifest)');
@@ -0,0 +1,21 @@
+# conftest.py - Gemeinsame Fixtures für die SusWords-Tests
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Vor dem ersten Import von config/app: Spiele nicht in games/ ablegen
+os.environ.setdefault("SUSWORDS_DATA_DIR", tempfile.mkdtemp(prefix="suswords-tests-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    import app as app_module
+    return app_module
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
@@ -0,0 +1,56 @@
+# test_asset_manifest.py - URLs aus dem Manifest, auch ohne deployte Build-Ausgaben
+import json
+import os
+
+from utils.asset_manifest import AssetManifest
+
+MANIFEST = {
+    "global_version": "abc12345",
+    "files": {
+        "js/game.js": {"hash": "3fa1b2c9", "versioned_path": "js/game.js?v=3fa1b2c9",
+                       "fingerprinted": "js/game.3fa1b2c9.js"},
+        "vendor/qrcode.min.js": {"hash": "11111111", "versioned_path": "vendor/qrcode.min.js?v=11111111",
+                                 "fingerprinted": "vendor/qrcode.min.11111111.js"},
+        "bundles/game.min.js": {"hash": "22222222", "versioned_path": "bundles/game.min.js?v=22222222",
+                                "fingerprinted": "bundles/game.min.22222222.js"},
+    },
+    "bundles": {"game": {"js": "bundles/game.min.js"}},
+}
+CDN = "https://cdn.example/qrcode.min.js"
+
+
+def make_manifest(tmp_path, files):
+    static_dir = tmp_path / "static"
+    for name in files:
+        path = static_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+    (static_dir / "version_manifest.json").write_text(json.dumps(MANIFEST))
+    return AssetManifest(os.path.join(str(static_dir), "version_manifest.json"),
+                         bundle_sources={"game": {"js": ["vendor/qrcode.min.js", "js/game.js"]}},
+                         vendor={"vendor/qrcode.min.js": {"url": CDN}})
+
+
+def test_full_build_uses_fingerprints_and_bundles(tmp_path):
+    manifest = make_manifest(tmp_path, ["js/game.js", "dist/js/game.3fa1b2c9.js",
+                                        "bundles/game.min.js", "dist/bundles/game.min.22222222.js",
+                                        "vendor/qrcode.min.js", "dist/vendor/qrcode.min.11111111.js"])
+    assert manifest.url("js/game.js") == "/dist/js/game.3fa1b2c9.js"
+    assert manifest.bundle_urls("game", "js") == ["/dist/bundles/game.min.22222222.js"]
+    assert manifest.vendor_url("vendor/qrcode.min.js") == "/dist/vendor/qrcode.min.11111111.js"
+
+
+def test_missing_fingerprinted_copy_falls_back_to_source(tmp_path):
+    manifest = make_manifest(tmp_path, ["js/game.js"])
+    assert manifest.url("js/game.js") == "/static/js/game.js?v=3fa1b2c9"
+    assert manifest.url("static/js/game.js") == "/static/js/game.js?v=3fa1b2c9"
+
+
+def test_missing_bundle_and_vendor_fall_back_to_sources_and_cdn(tmp_path):
+    manifest = make_manifest(tmp_path, ["js/game.js"])
+    assert manifest.bundle_urls("game", "js") == [CDN, "/static/js/game.js?v=3fa1b2c9"]
+
+
+def test_bundle_without_fingerprint_copy_is_served_from_static(tmp_path):
+    manifest = make_manifest(tmp_path, ["js/game.js", "bundles/game.min.js"])
+    assert manifest.bundle_urls("game", "js") == ["/static/bundles/game.min.js?v=22222222"]
@@ -0,0 +1,159 @@
+# test_cache_busting.py - Build-Schritte aus cache_busting.py
+import io
+import os
+import shutil
+import subprocess
+
+import pytest
+
+import cache_busting
+from config import CACHE_SETTINGS
+
+LIBRARY = b"/* lib v1 */ function qr(){}\n"
+UPDATED = b"/* lib v2 */ function qr(){}\n"
+
+
+# ===== VENDOR =====
+
+@pytest.fixture
+def cdn(monkeypatch):
+    """Ersetzt das CDN: {URL: Inhalt}, zählt Abrufe"""
+    served, calls = {}, []
+
+    def urlopen(url, timeout=None):
+        calls.append(url)
+        if url not in served:
+            raise OSError("offline")
+        return io.BytesIO(served[url])
+
+    monkeypatch.setattr(cache_busting.urllib.request, "urlopen", urlopen)
+    return served, calls
+
+def pin(monkeypatch, url, raw):
+    vendor = {"vendor/qr.js": {"url": url, "sha384": cache_busting.vendor_integrity(raw) if raw else None}}
+    monkeypatch.setitem(CACHE_SETTINGS, "vendor", vendor)
+
+def previous_files():
+    return {"vendor/qr.js": {"source": cache_busting.vendor_source("vendor/qr.js")}}
+
+
+def test_vendor_file_is_verified_before_writing(tmp_path, monkeypatch, cdn):
+    served, _ = cdn
+    served["https://cdn/qr.js"] = LIBRARY
+    pin(monkeypatch, "https://cdn/qr.js", LIBRARY)
+    assert cache_busting.vendor_assets(str(tmp_path)) == 0
+    assert (tmp_path / "static" / "vendor" / "qr.js").read_bytes() == LIBRARY
+
+def test_tampered_download_is_not_written(tmp_path, monkeypatch, cdn):
+    served, _ = cdn
+    served["https://cdn/qr.js"] = LIBRARY + b"alert(1)\n"
+    pin(monkeypatch, "https://cdn/qr.js", LIBRARY)
+    assert cache_busting.vendor_assets(str(tmp_path)) == 1
+    assert not (tmp_path / "static" / "vendor" / "qr.js").exists()
+
+def test_unpinned_library_stays_on_the_cdn(tmp_path, monkeypatch, cdn):
+    served, calls = cdn
+    served["https://cdn/qr.js"] = LIBRARY
+    target = tmp_path / "static" / "vendor" / "qr.js"
+    target.parent.mkdir(parents=True)
+    target.write_bytes(LIBRARY)
+    pin(monkeypatch, "https://cdn/qr.js", None)
+    assert cache_busting.vendor_assets(str(tmp_path)) == 1
+    assert not target.exists() and calls == []
+
+def test_unchanged_source_is_not_downloaded_again(tmp_path, monkeypatch, cdn):
+    served, calls = cdn
+    served["https://cdn/qr.js"] = LIBRARY
+    pin(monkeypatch, "https://cdn/qr.js", LIBRARY)
+    cache_busting.vendor_assets(str(tmp_path))
+    cache_busting.vendor_assets(str(tmp_path), previous_files())
+    assert calls == ["https://cdn/qr.js"]
+
+def test_changed_url_downloads_again(tmp_path, monkeypatch, cdn):
+    served, calls = cdn
+    served["https://cdn/qr.js"] = LIBRARY
+    served["https://cdn/v2/qr.js"] = UPDATED
+    pin(monkeypatch, "https://cdn/qr.js", LIBRARY)
+    cache_busting.vendor_assets(str(tmp_path))
+    previous = previous_files()
+
+    pin(monkeypatch, "https://cdn/v2/qr.js", UPDATED)
+    assert cache_busting.vendor_assets(str(tmp_path), previous) == 0
+    assert (tmp_path / "static" / "vendor" / "qr.js").read_bytes() == UPDATED
+    assert calls == ["https://cdn/qr.js", "https://cdn/v2/qr.js"]
+
+def test_changed_url_with_stale_hash_falls_back_to_cdn(tmp_path, monkeypatch, cdn):
+    served, _ = cdn
+    served["https://cdn/qr.js"] = LIBRARY
+    served["https://cdn/v2/qr.js"] = UPDATED
+    pin(monkeypatch, "https://cdn/qr.js", LIBRARY)
+    cache_busting.vendor_assets(str(tmp_path))
+    previous = previous_files()
+
+    # Nur die URL geändert, Hash vergessen: nicht die alte Datei behalten
+    monkeypatch.setitem(CACHE_SETTINGS["vendor"]["vendor/qr.js"], "url", "https://cdn/v2/qr.js")
+    assert cache_busting.vendor_assets(str(tmp_path), previous) == 1
+    assert not (tmp_path / "static" / "vendor" / "qr.js").exists()
+
+
+# ===== MINIFIER =====
+
+NODE = shutil.which("node")
+needs_node = pytest.mark.skipif(NODE is None, reason="node nicht installiert")
+
+# Jedes Snippet gibt etwas aus - minifiziert muss dieselbe Ausgabe herauskommen
+JS_CASES = {
+    "strings": "var s = 'a // kein Kommentar' + \"b /* auch keiner */ c\" + 'it\\'s';\nconsole.log(s)",
+    "comments": "// Zeile\nvar a = 1; /* Block */ var b = 2 /* mehrzeilig\n*/\nconsole.log(a + b)",
+    "templates": "var x = 2;\nconsole.log(`a ${x}  b ${ `innen ${x + 1}` } c ${ {k: 1}.k } // kein Kommentar`)",
+    "regex": "var r = /a\\/b[/]c/g, t = 'x'.replace(/x/, '/*y*/');\nconsole.log(r.source, t, /'/.test(\"'\"))",
+    "regex_after_keyword": "function f(s) { return /^a  b$/.test(s) }\nconsole.log(f('a  b'), typeof /x/)",
+    "regex_after_if": "var s = 'a  b';\nif (s) /a  b/.test(s) && console.log('ok')",
+    "division": "var a = 10, b = 2, g = 5;\nconsole.log(a / b / g, a/b/g, (a) / b)",
+    "plus_minus": "var a = 1, b = 2;\nconsole.log(a + +b, a - -b, a+ ++b, a - --b, a++ + b)",
+    "number_member": "console.log(1 .toString(), 1.5.toFixed(1))",
+    "asi_return": "function f() {\n  return\n  42\n}\nconsole.log(f())",
+    "asi_increment": "var a = 1\nvar b = a\n++b\nconsole.log(a, b)",
+    "asi_iife": "var a = 1\nvar c = (function () { return 3 })()\nconsole.log(a, c)",
+}
+
+def run_node(code):
+    result = subprocess.run([NODE, "-e", code], capture_output=True, text=True, timeout=30)
+    return result.returncode, result.stdout
+
+@needs_node
+@pytest.mark.parametrize("name", sorted(JS_CASES))
+def test_minify_js_keeps_behaviour(name):
+    source = JS_CASES[name]
+    minified = cache_busting.minify_js(source)
+    assert len(minified) <= len(source)
+    assert run_node(minified) == run_node(source)
+
+def test_minify_js_strips_comments_and_whitespace():
+    assert cache_busting.minify_js("// a\nvar  x = 1 ;  /* b */ f( x )\n\n\n") == "var x=1;f(x)\n"
+
+def test_minify_css():
+    source = ("/* Kommentar */\n.a  >  .b ,\n.c :hover {\n  margin : 0  auto ;\n"
+              "  content: \"a  { b }\";\n  width: calc(100%  -  2px);\n}\n")
+    # Leerzeichen vor : bleibt - in Selektoren (.c :hover) ist es bedeutsam
+    assert cache_busting.minify_css(source) == \
+        '.a>.b,.c :hover{margin :0 auto;content:"a  { b }";width:calc(100% - 2px)}\n'
+
+@needs_node
+def test_minified_sources_and_bundles_parse(tmp_path):
+    static_dir = os.path.join(cache_busting.BASE_DIR, "static")
+    shutil.copytree(static_dir, tmp_path / "static",
+                    ignore=shutil.ignore_patterns("dist", "bundles", "*.gz", "*.br", "*.mp3", "*.png"))
+    bundles, _ = cache_busting.build_bundles(str(tmp_path))
+    scripts = [tmp_path / "static" / kinds["js"] for kinds in bundles.values() if "js" in kinds]
+    assert scripts
+
+    for name in os.listdir(os.path.join(static_dir, "js")):
+        with open(os.path.join(static_dir, "js", name), encoding="utf-8") as f:
+            minified = tmp_path / f"{name}.min.js"
+            minified.write_text(cache_busting.minify_js(f.read()), encoding="utf-8")
+            scripts.append(minified)
+
+    for script in scripts:
+        result = subprocess.run([NODE, "--check", str(script)], capture_output=True, text=True, timeout=30)
+        assert result.returncode == 0, f"{script.name}: {result.stderr}"
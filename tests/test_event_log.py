@@ -0,0 +1,109 @@
+# test_event_log.py - Diff/Fold und EventLogBackend
+import copy
+import os
+
+from utils import event_log
+from utils.storage_backends import EventLogBackend
+
+
+def game_states():
+    """Aufeinanderfolgende Stände eines Spiels (jeweils eigene Kopie)"""
+    game_data = {"id": "ABCD", "status": "lobby", "players": {}, "votes": None,
+                 "history": [], "eliminated_players": [], "version": 1}
+    states = [copy.deepcopy(game_data)]
+
+    def step(change):
+        change(game_data)
+        game_data["version"] += 1
+        states.append(copy.deepcopy(game_data))
+
+    for player_id, name in (("p1", "Anna"), ("p2", "Ben"), ("p3", "Cem")):
+        step(lambda g: g["players"].__setitem__(player_id, {"name": name, "role": "pending",
+                                                           "vote": None, "ready": False}))
+    step(lambda g: [p.__setitem__("ready", True) for p in g["players"].values()])
+    step(lambda g: g.update(status="started", word="Wolke", turn_ring={"current": "p1", "links": {}}))
+    for player_id in ("p1", "p2", "p3", "p1"):
+        step(lambda g: g["history"].append({"player_id": player_id, "word": f"Wort-{len(g['history'])}"}))
+    step(lambda g: g.__setitem__("votes", {"suspect": "p2", "votes": {}, "status": "active"}))
+    step(lambda g: g["votes"]["votes"].__setitem__("p1", "up"))
+    step(lambda g: g["eliminated_players"].append("p2"))
+    step(lambda g: g.__setitem__("votes", None))
+    step(lambda g: g.pop("word"))
+    step(lambda g: g.update(status="finished", winner="players"))
+    return states
+
+
+def write_all(backend, states):
+    for state in states:
+        backend.write("ABCD", copy.deepcopy(state))
+
+
+# ===== DIFF & APPLY =====
+
+def test_diff_apply_round_trip():
+    states = game_states()
+    for old, new in zip(states, states[1:]):
+        ops = event_log.diff(old, new)
+        assert event_log.apply(copy.deepcopy(old), ops) == new
+
+def test_diff_appends_history_instead_of_rewriting():
+    old = {"history": [{"player_id": "p1", "word": "a"}]}
+    new = {"history": [{"player_id": "p1", "word": "a"}, {"player_id": "p2", "word": "b"}]}
+    assert event_log.diff(old, new) == [["a", ["history"], [{"player_id": "p2", "word": "b"}]]]
+    assert event_log.classify(event_log.diff(old, new)) == ["word"]
+
+def test_apply_rejects_unknown_operation():
+    try:
+        event_log.apply({}, [["x", ["a"], 1]])
+    except ValueError:
+        return
+    raise AssertionError("unknown operation accepted")
+
+
+# ===== BACKEND =====
+
+def test_read_returns_last_written_state(tmp_path):
+    states = game_states()
+    write_all(EventLogBackend(str(tmp_path)), states)
+    # Neue Instanz: kein Cache, alles aus der Datei
+    assert EventLogBackend(str(tmp_path)).read("ABCD")[0] == states[-1]
+
+def test_torn_tail_is_ignored_and_truncated(tmp_path):
+    states = game_states()
+    write_all(EventLogBackend(str(tmp_path)), states[:-1])
+    path = os.path.join(str(tmp_path), "ABCD.log")
+    with open(path, "ab") as f:
+        f.write(b'{"seq": 99, "ops": [["s", ["stat')  # Absturz mitten im Schreiben
+
+    backend = EventLogBackend(str(tmp_path))
+    assert backend.read("ABCD")[0] == states[-2]
+
+    backend.write("ABCD", copy.deepcopy(states[-1]))
+    with open(path, "rb") as f:
+        assert b'"seq": 99' not in f.read()
+    assert EventLogBackend(str(tmp_path)).read("ABCD")[0] == states[-1]
+
+def test_snapshot_plus_replay_matches_full_replay(tmp_path):
+    states = game_states()
+    backend = EventLogBackend(str(tmp_path), snapshot_interval=4)
+    write_all(backend, states)
+    assert os.path.exists(os.path.join(str(tmp_path), "ABCD.snap"))
+
+    from_snapshot = EventLogBackend(str(tmp_path), snapshot_interval=4).read("ABCD")[0]
+    assert from_snapshot == backend.replay("ABCD") == states[-1]
+
+def test_replay_until_seq(tmp_path):
+    states = game_states()
+    backend = EventLogBackend(str(tmp_path))
+    write_all(backend, states)
+    # Ein Ereignis pro write(): seq n ist der n-te Stand
+    for seq, state in enumerate(states, start=1):
+        assert backend.replay("ABCD", seq) == state
+    assert backend.replay("MISSING") is None
+
+def test_unchanged_write_appends_nothing(tmp_path):
+    states = game_states()
+    backend = EventLogBackend(str(tmp_path))
+    write_all(backend, states)
+    stamp = backend.stamp("ABCD")
+    assert backend.write("ABCD", copy.deepcopy(states[-1])) == stamp
@@ -0,0 +1,31 @@
+# test_event_streams.py - SSE-Streams sind auf max_event_streams begrenzt
+from config import GAME_SETTINGS
+
+
+def test_streams_beyond_limit_get_503(app_module, client, monkeypatch):
+    monkeypatch.setitem(GAME_SETTINGS, "max_event_streams", 2)
+    game_id = client.post("/create_game", json={}).get_json()["game_id"]
+    player_id = client.post("/join_game", json={"game_id": game_id, "name": "Anna"}).get_json()["player_id"]
+    url = f"/events/{game_id}/{player_id}"
+
+    streams = [client.get(url, buffered=False) for _ in range(2)]
+    assert [response.status_code for response in streams] == [200, 200]
+
+    rejected = client.get(url)
+    assert rejected.status_code == 503
+    assert "Retry-After" in rejected.headers
+
+    # Ein geschlossener Stream gibt seinen Platz frei
+    streams.pop().close()
+    reopened = client.get(url, buffered=False)
+    assert reopened.status_code == 200
+    for response in streams + [reopened]:
+        response.close()
+    assert app_module.event_streams == 0
+
+
+def test_zero_disables_event_streams(client, monkeypatch):
+    monkeypatch.setitem(GAME_SETTINGS, "max_event_streams", 0)
+    game_id = client.post("/create_game", json={}).get_json()["game_id"]
+    player_id = client.post("/join_game", json={"game_id": game_id, "name": "Anna"}).get_json()["player_id"]
+    assert client.get(f"/events/{game_id}/{player_id}").status_code == 503
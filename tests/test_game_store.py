@@ -0,0 +1,29 @@
+# test_game_store.py - Cache und Locks des GameStores
+from utils.game_store import GameStore
+
+
+def make_store(tmp_path, **kwargs):
+    return GameStore(str(tmp_path), write_behind=False, **kwargs)
+
+
+def test_game_locks_follow_the_cache(tmp_path):
+    store = make_store(tmp_path, max_cached_games=2)
+    for game_id in ("AAAA", "BBBB", "CCCC"):
+        store.create_game(game_id, {"id": game_id, "players": {}})
+    # AAAA wurde verdrängt, sein Lock mit ihm
+    assert set(store._game_locks) == {"BBBB", "CCCC"}
+
+    store.delete("BBBB")
+    assert set(store._game_locks) == {"CCCC"}
+
+    store.update_game("AAAA", lambda game_data: None)  # lädt AAAA wieder
+    store.create_game("DDDD", {"id": "DDDD", "players": {}})  # verdrängt CCCC
+    assert set(store._game_locks) == {"AAAA", "DDDD"}
+
+
+def test_lock_survives_while_held(tmp_path):
+    store = make_store(tmp_path, max_cached_games=1)
+    with store.locked("AAAA"):
+        store.create_game("BBBB", {"id": "BBBB", "players": {}})
+        assert "AAAA" in store._game_locks
+    assert "AAAA" not in store._game_locks
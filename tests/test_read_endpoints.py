@@ -0,0 +1,113 @@
+# test_read_endpoints.py - Lesende Endpoints dürfen nichts schreiben
+"""
+game_state, vote_status und vote_time_remaining werden von jedem Client
+im Sekundentakt gepollt. Sie dürfen weder einen Commit im GameStore
+auslösen noch das Backend beschreiben - auch nicht, wenn die Vote-Deadline
+schon abgelaufen ist (das Vote beendet der Vote-Scheduler).
+"""
+
+import pytest
+
+from core.turn_ring import TurnRing
+
+
+@pytest.fixture
+def io_counter(app_module, monkeypatch):
+    """Zählt Commits (Listener) und Backend-Schreibvorgänge des GameStores"""
+    store = app_module.game_store
+    counts = {"commits": 0, "writes": 0}
+
+    def on_commit(game_id, game_data):
+        counts["commits"] += 1
+    store.add_listener(on_commit)
+
+    backend_write = store.backend.write
+    def counting_write(game_id, game_data):
+        counts["writes"] += 1
+        return backend_write(game_id, game_data)
+    monkeypatch.setattr(store.backend, "write", counting_write)
+
+    yield counts
+    store._listeners.remove(on_commit)
+
+
+@pytest.fixture
+def started_game(client):
+    """Gestartetes Spiel mit drei Spielern: (game_id, [player_ids])"""
+    game_id = client.post("/create_game", json={}).get_json()["game_id"]
+    player_ids = [client.post("/join_game", json={"game_id": game_id, "name": name}).get_json()["player_id"]
+                  for name in ("Anna", "Ben", "Cem")]
+    for player_id in player_ids:
+        client.post("/player_ready", json={"game_id": game_id, "player_id": player_id})
+    return game_id, player_ids
+
+
+def poll_all(client, game_id, player_ids):
+    """Ein Polling-Durchgang aller Clients über die lesenden Endpoints"""
+    for player_id in player_ids:
+        for url in (f"/game_state/{game_id}/{player_id}",
+                    f"/vote_status/{game_id}/{player_id}",
+                    f"/vote_time_remaining/{game_id}"):
+            response = client.get(url)
+            assert response.status_code == 200, url
+
+def assert_no_io(app_module, client, io_counter, game_id, player_ids):
+    store = app_module.game_store
+    store.flush()
+    before = dict(io_counter)
+    poll_all(client, game_id, player_ids)
+    poll_all(client, game_id, player_ids)
+    store.flush()
+    assert io_counter == before
+
+
+def test_reads_do_not_write(app_module, client, io_counter, started_game):
+    store = app_module.game_store
+    game_id, player_ids = started_game
+    assert store.get(game_id)["status"] == "started"
+
+    # Vor dem Vote
+    assert_no_io(app_module, client, io_counter, game_id, player_ids)
+
+    # Während des Votes
+    initiator = TurnRing.of(store.get(game_id)).current
+    suspect = next(player_id for player_id in player_ids if player_id != initiator)
+    response = client.post("/start_vote", json={"game_id": game_id, "initiator_id": initiator,
+                                                "suspect_id": suspect})
+    assert response.status_code == 200
+    client.post("/cast_vote", json={"game_id": game_id, "voter_id": initiator, "vote": "up"})
+    store.flush()
+    assert io_counter["commits"] >= 2 and io_counter["writes"] >= 1  # Zähler greifen
+    assert_no_io(app_module, client, io_counter, game_id, player_ids)
+
+    # Deadline abgelaufen, der Scheduler hat das Vote aber noch nicht beendet
+    def expire(game_data):
+        game_data["votes"]["started_at"] -= game_data["votes"]["duration"] + 1
+    store.update_game(game_id, expire)
+    assert app_module.is_vote_expired(store.get(game_id))
+    assert_no_io(app_module, client, io_counter, game_id, player_ids)
+    assert store.get(game_id)["votes"]["status"] == "active"
+
+    # Nach dem Vote (beendet durch den Scheduler-Callback)
+    app_module.on_vote_deadline(game_id)
+    assert store.get(game_id)["votes"]["status"] != "active"
+    assert_no_io(app_module, client, io_counter, game_id, player_ids)
+
+
+def test_recreated_game_gets_new_etag(app_module, client, started_game):
+    store = app_module.game_store
+    game_id, player_ids = started_game
+    url = f"/players_in_game/{game_id}"
+    etag = client.get(url).headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    # Gleiche ID, wieder bei Version 1 - darf nicht als unverändert gelten
+    old = store.get(game_id)
+    store.delete(game_id)
+    game_data = {"id": game_id, "status": "lobby", "players": {}, "votes": None,
+                 "history": [], "eliminated_players": [],
+                 "created_at": old["created_at"] + 1, "version": old["version"] - 1}
+    store.create_game(game_id, game_data)
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json() == {"players": []}
@@ -0,0 +1,168 @@
+# asset_manifest.py - Version-Manifest einmal laden statt pro Asset
+"""
+static/version_manifest.json (erzeugt von cache_busting.py) wird einmal
+geparst und als fertige Tabelle Asset -> URL gehalten. Templates rufen
+versioned_url() pro Asset auf - das ist jetzt ein dict-Zugriff statt
+open() + json.load(). Dazu kommen die vorkomprimierten Varianten (.br/.gz)
+je Asset für versioned_static.
+
+Hat ein Asset eine Kopie mit Hash im Dateinamen (cache_busting.py,
+"fingerprinted"), zeigt die URL auf /<dist>/js/game.3fa1b2c9.js statt auf
+/static/js/game.js?v=3fa1b2c9 - manche Proxies cachen keine Query-Strings.
+
+Seiten laden ihre Skripte und Styles über bundle_urls(): das minifizierte
+Bündel aus dem Manifest, sonst (Build ohne Bündel) die Einzeldateien -
+Vendor-Bibliotheken, die noch nicht lokal liegen, dann vom CDN.
+
+Fehlt eine Build-Ausgabe auf der Platte (dist/-Kopie, Bündel, Vendor-Datei),
+fällt die URL auf die Quelldatei mit ?v=<hash>, die Einzeldateien bzw. das
+CDN zurück - ein Manifest ohne seine Ausgaben darf keine 404 erzeugen.
+
+Neu geladen wird nur, wenn sich die mtime der Datei ändert (höchstens
+einmal pro check_interval Sekunden geprüft) oder nach reload(), z.B. per
+SIGHUP nach einem Deploy.
+"""
+
+import json
+import os
+import threading
+import time
+
+# Reihenfolge, in der vorkomprimierte Varianten bevorzugt werden
+PREFERRED_ENCODINGS = ("br", "gzip")
+
+
+class AssetManifest:
+    """Vorberechnete versionierte URLs aus dem Version-Manifest"""
+
+    def __init__(self, path, dist_dir="dist", bundle_sources=None, vendor=None, check_interval=1.0):
+        self.path = path
+        self.static_dir = os.path.dirname(path)
+        self.dist_dir = dist_dir
+        self.bundle_sources = bundle_sources or {}   # Seite -> {Art: [Asset-Keys]}
+        self.vendor = vendor or {}                   # Asset-Key -> {"url": CDN-URL}
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._checked_at = None
+        self._reload_requested = False
+
+        self.urls = {}               # "css/game.css" und "static/css/game.css" -> URL
+        # Pfad unter static/ -> [("br", "css/game.css.br"), ("gzip", ...)], auch für dist/...
+        self.encodings = {}
+        self.bundles = {}            # Seite -> {"js": "bundles/game.min.js", ...}
+        self.version = None
+        self.build_time = None
+        self.build_timestamp = None
+
+    # ===== ABFRAGEN =====
+
+    def url(self, asset_path):
+        """Versionierte URL eines Assets (unbekannte bekommen die globale Version)"""
+        self.refresh()
+        url = self.urls.get(asset_path.lstrip('/'))
+        if url is not None:
+            return url
+        return f"/{asset_path.lstrip('/')}?v={self.version}"
+
+    def vendor_url(self, asset_key):
+        """Lokale URL einer Vendor-Bibliothek, solange sie nicht gebaut ist die CDN-URL"""
+        self.refresh()
+        if asset_key in self.urls or asset_key not in self.vendor:
+            return self.url(asset_key)
+        return self.vendor[asset_key]["url"]
+
+    def bundle_urls(self, page, kind):
+        """URLs, die eine Seite für kind ('js'/'css') laden muss"""
+        self.refresh()
+        bundle = self.bundles.get(page, {}).get(kind)
+        if bundle:
+            return [self.url(bundle)]
+        return [self.vendor_url(source) for source in self.bundle_sources.get(page, {}).get(kind, ())]
+
+    def encodings_for(self, filename):
+        """Vorkomprimierte Varianten einer Datei unter static/, beste zuerst"""
+        self.refresh()
+        return self.encodings.get(filename, ())
+
+    def info(self):
+        """Version und Build-Zeit für /version und die Templates"""
+        self.refresh()
+        return {
+            "version": self.version,
+            "build_time": self.build_time,
+            "build_timestamp": self.build_timestamp
+        }
+
+    # ===== NEU LADEN =====
+
+    def reload(self):
+        """Lädt beim nächsten Zugriff neu (signal-sicher: setzt nur ein Flag)"""
+        self._reload_requested = True
+
+    def refresh(self):
+        """Lädt das Manifest, falls angefordert oder die Datei sich geändert hat"""
+        now = time.monotonic()
+        if (not self._reload_requested and self._checked_at is not None
+                and now - self._checked_at < self.check_interval):
+            return
+
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime == self._mtime and not self._reload_requested and self.version is not None:
+                return
+            self._reload_requested = False
+            self._load(mtime)
+
+    def _load(self, mtime):
+        try:
+            with open(self.path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            if mtime is not None:
+                print(f"Warning: Could not load version manifest: {e}")
+            manifest = {}
+
+        # Ohne Manifest: Zeitstempel als Version, damit Clients trotzdem neu laden
+        version = manifest.get("global_version") or str(int(time.time()))[:8]
+        urls, encodings = {}, {}
+        for asset, entry in manifest.get("files", {}).items():
+            fingerprinted = entry.get("fingerprinted")
+            if fingerprinted and not self._on_disk(f"{self.dist_dir}/{fingerprinted}"):
+                fingerprinted = None  # Kopie nicht deployt: Quelldatei mit ?v=
+            if not fingerprinted and asset != "sw.js" and not self._on_disk(asset):
+                continue  # z.B. Vendor-Datei nicht geladen: vendor_url() nimmt das CDN
+            if fingerprinted:
+                url = f"/{self.dist_dir}/{fingerprinted}"
+            else:
+                prefix = "/" if asset == "sw.js" else "/static/"
+                url = prefix + entry.get("versioned_path", f"{asset}?v={entry.get('hash', version)}")
+            urls[asset] = url
+            urls[f"static/{asset}"] = url
+
+            variants = entry.get("encodings") or {}
+            if variants:
+                ordered = [(encoding, variants[encoding]["path"])
+                           for encoding in PREFERRED_ENCODINGS if encoding in variants]
+                encodings[asset] = ordered
+                if fingerprinted:
+                    encodings[f"{self.dist_dir}/{fingerprinted}"] = [
+                        (encoding, f"{self.dist_dir}/{fingerprinted}{path[len(asset):]}")
+                        for encoding, path in ordered]
+
+        self.urls = urls
+        self.encodings = encodings
+        # Nur Bündel, die auch auf der Platte liegen - sonst die Einzeldateien
+        self.bundles = {page: {kind: bundle for kind, bundle in kinds.items() if bundle in urls}
+                        for page, kinds in (manifest.get("bundles") or {}).items()}
+        self.version = version
+        self.build_time = manifest.get("build_time") or time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.build_timestamp = manifest.get("build_timestamp") or int(time.time())
+        self._mtime = mtime
+
+    def _on_disk(self, static_path):
+        return os.path.isfile(os.path.join(self.static_dir, static_path))
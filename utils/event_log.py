@@ -0,0 +1,98 @@
+# event_log.py - Spiel-Änderungen als Ereignisse (Diff und Fold)
+"""
+Statt das ganze Spiel-Dokument neu zu schreiben, wird pro Speichern nur
+festgehalten, was sich geändert hat:
+
+    {"seq": 12, "at": 1718000000.0, "types": ["word"],
+     "ops": [["a", ["history"], [{"player_id": "a1b2c3d4", "word": "gelb"}]],
+             ["s", ["turn_ring", "current"], "e5f6a7b8"],
+             ["s", ["version"], 12]]}
+
+Operationen (path = Schlüssel vom Dokument aus):
+
+    ["s", path, value]    Wert setzen (auch ganze Objekte, path [] = Dokument)
+    ["d", path]           Schlüssel entfernen
+    ["a", path, items]    Liste verlängern (history, eliminated_players, ...)
+
+diff() vergleicht zwei Stände rekursiv über Objekte, gewachsene Listen
+werden als "a" erfasst - ein Wort kostet also einen History-Eintrag, nicht
+die ganze History. apply() spielt ein Ereignis auf einen Stand auf, der
+aktuelle Stand ist der Fold über alle Ereignisse.
+
+Die Typen (classify) dienen dem Audit-Trail, für den Fold zählen nur ops.
+"""
+
+# Reihenfolge = Reihenfolge in "types"
+EVENT_TYPES = ("create", "join", "ready", "start", "word", "vote_start",
+               "vote_cast", "vote_result", "end", "update")
+
+
+def diff(old, new, path=()):
+    """Operationen, die old in new überführen"""
+    ops = []
+    for key, value in new.items():
+        if key not in old:
+            ops.append(["s", [*path, key], value])
+            continue
+        previous = old[key]
+        if previous is value or previous == value:
+            continue
+        if isinstance(previous, dict) and isinstance(value, dict):
+            ops.extend(diff(previous, value, (*path, key)))
+        elif (isinstance(previous, list) and isinstance(value, list)
+              and len(value) > len(previous) and value[:len(previous)] == previous):
+            ops.append(["a", [*path, key], value[len(previous):]])
+        else:
+            ops.append(["s", [*path, key], value])
+    for key in old:
+        if key not in new:
+            ops.append(["d", [*path, key]])
+    return ops
+
+def apply(state, ops):
+    """Spielt ops auf state auf (verändert state) und gibt den neuen Stand zurück"""
+    for op in ops:
+        kind, path = op[0], op[1]
+        if not path:
+            state = op[2]
+            continue
+        target = state
+        for key in path[:-1]:
+            target = target[key]
+        if kind == "s":
+            target[path[-1]] = op[2]
+        elif kind == "a":
+            target[path[-1]].extend(op[2])
+        elif kind == "d":
+            target.pop(path[-1], None)
+        else:
+            raise ValueError(f"Unknown event operation {kind!r}")
+    return state
+
+def classify(ops, created=False):
+    """Ereignistypen einer Änderung (join, word, vote_cast, ...)"""
+    if created:
+        return ["create"]
+
+    types = set()
+    for op in ops:
+        kind, path = op[0], op[1]
+        head = path[0] if path else None
+        value = op[2] if kind != "d" else None
+        if head == "players" and len(path) == 2 and kind == "s":
+            types.add("join")
+        elif head == "players" and path[-1] == "ready":
+            types.add("ready")
+        elif head == "status" and value == "started":
+            types.add("start")
+        elif head == "status" and value == "finished":
+            types.add("end")
+        elif head == "history" and kind == "a":
+            types.add("word")
+        elif head == "votes" and len(path) == 1 and isinstance(value, dict):
+            types.add("vote_start" if value.get("status") == "active" else "vote_result")
+        elif head == "votes" and len(path) >= 2 and path[1] == "votes":
+            types.add("vote_cast")
+        elif head == "votes" and len(path) == 2 and path[1] in ("status", "result"):
+            types.add("vote_result")
+    return [name for name in EVENT_TYPES if name in types] or ["update"]
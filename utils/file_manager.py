@@ -1,7 +1,8 @@
 import os
-import json
 import time
 from config import DATA_DIR
+from core import lifecycle
+from utils.game_store import get_game_store
 
 def ensure_data_dir():
     """Stellt sicher, dass das Daten-Verzeichnis existiert"""
@@ -10,34 +11,21 @@ def ensure_data_dir():
 
 def game_exists(game_id):
     """Prüft ob ein Spiel existiert"""
-    ensure_data_dir()
-    filepath = os.path.join(DATA_DIR, f"{game_id}.json")
-    return os.path.exists(filepath)
+    return get_game_store().exists(game_id)
 
 def load_game(game_id):
-    """Lädt Spieldaten aus JSON-Datei"""
-    ensure_data_dir()
-    filepath = os.path.join(DATA_DIR, f"{game_id}.json")
+    """Lädt eine veränderbare Kopie der Spieldaten aus dem Game Store"""
+    game_data = get_game_store().checkout(game_id)
 
-    if not os.path.exists(filepath):
+    if game_data is None:
         raise FileNotFoundError(f"Game {game_id} not found")
 
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Invalid JSON in game {game_id}: {e}")
-    except Exception as e:
-        raise IOError(f"Error reading game {game_id}: {e}")
+    return game_data
 
 def save_game(game_id, game_data):
-    """Speichert Spieldaten in JSON-Datei"""
-    ensure_data_dir()
-    filepath = os.path.join(DATA_DIR, f"{game_id}.json")
-
+    """Übergibt Spieldaten an den Game Store (Speichern im Hintergrund)"""
     try:
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(game_data, f, ensure_ascii=False, indent=2)
+        get_game_store().put(game_id, game_data)
     except Exception as e:
         raise IOError(f"Error saving game {game_id}: {e}")
 
@@ -59,61 +47,36 @@ def save_game_safe(game_id, game_data):
         return False
 
 def delete_game(game_id):
-    """Löscht eine Spiel-Datei"""
-    ensure_data_dir()
-    filepath = os.path.join(DATA_DIR, f"{game_id}.json")
-
-    if os.path.exists(filepath):
-        try:
-            os.remove(filepath)
-            return True
-        except Exception as e:
-            print(f"Error deleting game {game_id}: {e}")
-            return False
-    return False
-
-def list_all_games():
-    """Gibt alle Spiel-IDs zurück"""
-    ensure_data_dir()
-    games = []
-
+    """Löscht ein Spiel aus Game Store und Datenträger"""
     try:
-        for filename in os.listdir(DATA_DIR):
-            if filename.endswith('.json'):
-                game_id = filename[:-5]  # Remove .json
-                games.append(game_id)
+        return get_game_store().delete(game_id)
     except Exception as e:
-        print(f"Error listing games: {e}")
+        print(f"Error deleting game {game_id}: {e}")
+        return False
 
-    return games
+def list_all_games():
+    """Gibt alle Spiel-IDs zurück"""
+    return get_game_store().list_ids()
 
 def load_all_games():
-    """Lädt alle Spiele für Stats/Cleanup"""
-    games = []
-
-    for game_id in list_all_games():
-        game_data = load_game_safe(game_id)
-        if game_data:
-            games.append(game_data)
+    """Lädt alle Spiele für Stats/Cleanup (nur lesend verwenden)"""
+    return list(get_game_store().iter_games())
 
-    return games
+def _age_hours(summary, now=None):
+    return ((now or time.time()) - (summary.get('updated_at') or 0)) / 3600
 
 def get_game_file_age(game_id):
-    """Gibt das Alter einer Spiel-Datei in Stunden zurück"""
-    ensure_data_dir()
-    filepath = os.path.join(DATA_DIR, f"{game_id}.json")
-
-    if not os.path.exists(filepath):
-        return None
-
+    """Gibt das Alter (seit der letzten Änderung) eines Spiels in Stunden zurück"""
     try:
-        file_time = os.path.getmtime(filepath)
-        current_time = time.time()
-        age_hours = (current_time - file_time) / 3600
-        return age_hours
+        summary = get_game_store().backend.summary(game_id)
     except Exception:
         return None
 
+    if summary is None:
+        return None
+
+    return _age_hours(summary)
+
 def get_games_by_age():
     """Kategorisiert Spiele nach Alter"""
     games_by_age = {
@@ -123,10 +86,10 @@ def get_games_by_age():
         '>24h': []
     }
 
-    for game_id in list_all_games():
-        age = get_game_file_age(game_id)
-        if age is None:
-            continue
+    now = time.time()
+    for summary in get_game_store().summaries():
+        game_id = summary['id']
+        age = _age_hours(summary, now)
 
         if age < 1:
             games_by_age['<1h'].append(game_id)
@@ -142,38 +105,41 @@ def get_games_by_age():
 def cleanup_old_games(hours_threshold=24, dry_run=True):
     """Bereinigt alte Spiele"""
     cleaned_games = []
+    store = get_game_store()
 
-    for game_id in list_all_games():
-        age = get_game_file_age(game_id)
-        if age is None or age <= hours_threshold:
-            continue
-
-        game_data = load_game_safe(game_id)
-        if not game_data:
-            continue
+    # Nur unfertige Spiele bereinigen (beim SQLite-Backend per Index gefiltert)
+    candidates = store.summaries(statuses=['lobby', 'started'],
+                                 updated_before=time.time() - hours_threshold * 3600)
 
-        # Nur unfertige Spiele bereinigen
-        if game_data.get('status') in ['finished', 'abandoned']:
-            continue
+    for summary in candidates:
+        game_id = summary['id']
+        age = _age_hours(summary)
 
         if dry_run:
             cleaned_games.append({
                 'game_id': game_id,
                 'age_hours': age,
-                'status': game_data.get('status', 'unknown')
+                'status': summary.get('status') or 'unknown'
             })
         else:
             # Spiel als abandoned markieren
-            game_data['status'] = 'finished'
-            game_data['end_reason'] = 'game_abandoned'
-            game_data['winner'] = 'abandoned'
-
-            if save_game_safe(game_id, game_data):
-                cleaned_games.append({
-                    'game_id': game_id,
-                    'age_hours': age,
-                    'status': 'cleaned'
-                })
+            def mark_abandoned(game_data):
+                game_data['status'] = 'finished'
+                game_data['end_reason'] = 'game_abandoned'
+                game_data['winner'] = 'abandoned'
+                lifecycle.mark_finished(game_data, activity=False)
+
+            try:
+                store.update_game(game_id, mark_abandoned)
+            except Exception as e:
+                print(f"Error: Could not save game {game_id}: {e}")
+                continue
+
+            cleaned_games.append({
+                'game_id': game_id,
+                'age_hours': age,
+                'status': 'cleaned'
+            })
 
     return cleaned_games
 
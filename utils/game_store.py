@@ -0,0 +1,446 @@
+# game_store.py - In-Memory Game Store für SusWords
+"""
+Hält laufende Spiele als geparste Objekte im Prozess-Speicher.
+Änderungen laufen als Transaktion unter einem Spiel-Lock und werden
+asynchron (Write-Behind) in das konfigurierte Backend geschrieben
+(games/*.json oder SQLite, siehe utils/storage_backends.py).
+"""
+
+import atexit
+import copy
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from collections import OrderedDict
+
+from config import DATA_DIR, STORE_SETTINGS
+from utils.storage_backends import JsonFileBackend, create_backend, summarize_game
+
+try:
+    import fcntl
+except ImportError:  # Windows: nur Thread-Locks
+    fcntl = None
+
+
+class GameNotFoundError(LookupError):
+    """Das angeforderte Spiel existiert nicht"""
+
+
+class GameStore:
+    """Autoritativer Spielzustand im Speicher mit Write-Behind Persistenz
+
+    get() liefert den gecachten Zustand und darf nur lesend verwendet werden.
+    Änderungen laufen über update_game(), das eine Kopie unter dem Spiel-Lock
+    verändert und danach atomar übernimmt.
+
+    Jeder Commit erhöht game_data["version"] und weckt Threads, die in
+    wait_for_change() auf dieses Spiel warten (SSE-Streams, Long-Polls).
+
+    Mit multi_process=True (mehrere WSGI-Worker) werden Spiele zusätzlich per
+    fcntl gesperrt, synchron geschrieben und gecachte Stände per Stempel
+    gegen das Backend geprüft.
+    """
+
+    def __init__(self, data_dir=DATA_DIR, write_behind=True, flush_interval=0.5,
+                 batch_size=50, max_cached_games=2000, multi_process=False,
+                 fsync_writes=False, backend=None):
+        self.data_dir = data_dir
+        self.backend = backend or JsonFileBackend(data_dir, fsync_writes=fsync_writes)
+        self.multi_process = multi_process
+        self.write_behind = write_behind and not multi_process
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_cached_games = max_cached_games
+        self.fsync_writes = fsync_writes
+
+        self._games = OrderedDict()  # game_id -> game_data (LRU-Reihenfolge)
+        self._stamps = {}            # game_id -> Änderungsstempel des Backends
+        self._dirty = set()
+        self._in_flight = {}         # game_id -> Stand, den flush() gerade schreibt
+        self._deleted = set()
+        self._game_locks = {}        # game_id -> [RLock, Anzahl Threads in locked()]
+        self._changed = {}           # game_id -> Condition für wartende Leser
+        self._listeners = []         # fn(game_id, game_data) nach jedem Commit
+        self._waiting = {}           # game_id -> Anzahl wartender Leser
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        self._flush_thread = None
+        self._running = False
+
+        self._lock_dir = os.path.join(self.data_dir, ".locks")
+        os.makedirs(self.data_dir, exist_ok=True)
+        if self.multi_process:
+            os.makedirs(self._lock_dir, exist_ok=True)
+
+    # ===== LESEN =====
+
+    def get(self, game_id, cache=True):
+        """Gibt den Spielzustand zurück (nur lesend!) oder None"""
+        stamp = self._stat(game_id) if self.multi_process else None
+        with self._lock:
+            if game_id in self._deleted:
+                return None
+            game_data = self._games.get(game_id)
+            if game_data is not None and self._is_current(game_id, stamp):
+                self._games.move_to_end(game_id)
+                return game_data
+
+        game_data, stamp = self.backend.read(game_id)
+        if game_data is None or not cache:
+            return game_data
+
+        with self._lock:
+            # Ein paralleles Update hat Vorrang vor dem gerade gelesenen Stand
+            if game_id in self._games and (not self.multi_process or game_id in self._dirty):
+                return self._games[game_id]
+            if game_id in self._deleted:
+                return None
+            self._games[game_id] = game_data
+            self._stamps[game_id] = stamp
+            self._evict()
+        return game_data
+
+    def checkout(self, game_id):
+        """Gibt eine veränderbare Kopie des Spielzustands zurück oder None"""
+        game_data = self.get(game_id)
+        return copy.deepcopy(game_data) if game_data is not None else None
+
+    def exists(self, game_id):
+        """Prüft ob ein Spiel existiert"""
+        if not self.multi_process:
+            with self._lock:
+                if game_id in self._deleted:
+                    return False
+                if game_id in self._games:
+                    return True
+        return self.backend.exists(game_id)
+
+    def list_ids(self):
+        """Gibt alle Spiel-IDs zurück (Datenträger und noch nicht geschriebene)"""
+        game_ids = set(self.backend.list_ids())
+        with self._lock:
+            game_ids.update(self._dirty)
+            game_ids.update(self._in_flight)
+            game_ids.difference_update(self._deleted)
+        return sorted(game_ids)
+
+    def iter_games(self):
+        """Iteriert über alle Spiele ohne den Cache zu verdrängen (nur lesend!)"""
+        for game_id in self.list_ids():
+            try:
+                game_data = self.get(game_id, cache=False)
+            except ValueError as e:
+                print(f"Warning: Could not load game {game_id}: {e}")
+                continue
+            if game_data is not None:
+                yield game_data
+
+    def summaries(self, statuses=None, updated_before=None):
+        """Kompakte Zusammenfassungen aller Spiele für Stats und Cleanup
+
+        Das Backend filtert (bei SQLite über Indizes), noch nicht
+        geschriebene Änderungen werden aus dem Speicher ergänzt.
+        """
+        with self._lock:
+            pending = dict(self._in_flight)
+            pending.update((game_id, self._games[game_id]) for game_id in self._dirty
+                           if game_id in self._games)
+            deleted = set(self._deleted)
+
+        now = time.time()
+        result = [summary for summary in self.backend.summaries(statuses, updated_before)
+                  if summary["id"] not in pending and summary["id"] not in deleted]
+        for game_id, game_data in pending.items():
+            summary = summarize_game(game_id, game_data, created_at=now, updated_at=now)
+            if statuses is not None and summary["status"] not in statuses:
+                continue
+            if updated_before is not None and now >= updated_before:
+                continue
+            result.append(summary)
+        return result
+
+    def wait_for_change(self, game_id, since, timeout):
+        """Wartet bis das Spiel eine neuere Version als since hat
+
+        Gibt den aktuellen Zustand zurück (nur lesend!) - nach einer Änderung
+        sofort, sonst nach timeout Sekunden. None wenn das Spiel nicht existiert.
+        Im multi_process-Modus wird zusätzlich jede Sekunde nachgesehen, da
+        Commits anderer Prozesse hier niemanden wecken.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            game_data = self.get(game_id)
+            if game_data is None or game_data.get("version", 0) > since:
+                return game_data
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return game_data
+
+            with self._lock:
+                # Commit zwischen get() und Lock? Dann nicht schlafen
+                if self._games.get(game_id) is not game_data:
+                    continue
+                changed = self._changed.get(game_id)
+                if changed is None:
+                    changed = self._changed[game_id] = threading.Condition(self._lock)
+                self._waiting[game_id] = self._waiting.get(game_id, 0) + 1
+                try:
+                    changed.wait(min(remaining, 1.0) if self.multi_process else remaining)
+                finally:
+                    self._waiting[game_id] -= 1
+                    if not self._waiting[game_id]:
+                        del self._waiting[game_id]
+                        del self._changed[game_id]
+
+    def waiting_clients(self):
+        """Anzahl der Threads, die gerade in wait_for_change() warten"""
+        with self._lock:
+            return sum(self._waiting.values())
+
+    def add_listener(self, fn):
+        """Registriert fn(game_id, game_data) für jeden Commit
+
+        Läuft synchron unter dem Spiel-Lock (pro Spiel in Commit-Reihenfolge),
+        game_data ist nur lesend zu verwenden und bei delete() None.
+        """
+        self._listeners.append(fn)
+
+    # ===== SCHREIBEN =====
+
+    def update_game(self, game_id, fn):
+        """Führt fn(game_data) als atomare Read-Modify-Write Transaktion aus
+
+        fn bekommt eine veränderbare Kopie und darf sie anpassen. Läuft fn
+        ohne Exception durch, wird die Kopie übernommen und der Rückgabewert
+        von fn zurückgegeben. Wirft fn, bleibt der gespeicherte Stand
+        unverändert. Existiert das Spiel nicht, wird GameNotFoundError geworfen.
+        """
+        with self.locked(game_id):
+            current = self.get(game_id)
+            if current is None:
+                raise GameNotFoundError(game_id)
+
+            game_data = copy.deepcopy(current)
+            result = fn(game_data)
+            self._commit(game_id, game_data)
+        return result
+
+    def create_game(self, game_id, game_data):
+        """Legt ein neues Spiel an, schlägt fehl wenn die ID bereits vergeben ist"""
+        with self.locked(game_id):
+            if self.exists(game_id):
+                raise FileExistsError(f"Game {game_id} already exists")
+            self._commit(game_id, game_data)
+
+    def put(self, game_id, game_data):
+        """Übernimmt einen kompletten Spielzustand (ohne Read-Modify-Write)"""
+        with self.locked(game_id):
+            self._commit(game_id, game_data)
+
+    def delete(self, game_id):
+        """Entfernt ein Spiel aus Speicher und Datenträger"""
+        with self.locked(game_id):
+            with self._lock:
+                self._games.pop(game_id, None)
+                self._stamps.pop(game_id, None)
+                self._dirty.discard(game_id)
+                self._deleted.add(game_id)
+                self._notify(game_id)
+
+            with self._flush_lock:
+                existed = self.backend.delete(game_id)
+                with self._lock:
+                    self._deleted.discard(game_id)
+            self._call_listeners(game_id, None)
+        return existed
+
+    @contextmanager
+    def locked(self, game_id):
+        """Sperrt ein Spiel für diesen Thread (und andere Prozesse)
+
+        Der Lock eines Spiels lebt nur, solange es im Cache liegt oder ein
+        Thread ihn hält bzw. auf ihn wartet - sonst wüchse _game_locks mit
+        jeder Spiel-ID.
+        """
+        with self._lock:
+            entry = self._game_locks.get(game_id)
+            if entry is None:
+                entry = self._game_locks[game_id] = [threading.RLock(), 0]
+            entry[1] += 1
+
+        try:
+            with entry[0]:
+                if not self.multi_process or fcntl is None:
+                    yield
+                    return
+
+                fd = os.open(os.path.join(self._lock_dir, f"{game_id}.lock"),
+                             os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                    yield
+                finally:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                    os.close(fd)
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0 and game_id not in self._games:
+                    self._game_locks.pop(game_id, None)
+
+    def flush(self):
+        """Schreibt alle geänderten Spiele auf den Datenträger
+
+        Bis backend.write() zurückkehrt, gilt ein Spiel als "in flight": es
+        wird nicht verdrängt und bleibt in list_ids(), sonst läse get() den
+        alten Stand aus dem Backend.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending = [(game_id, self._games[game_id]) for game_id in self._dirty
+                           if game_id in self._games]
+                self._dirty.clear()
+                self._in_flight.update(pending)
+
+            for game_id, game_data in pending:
+                try:
+                    stamp = self.backend.write(game_id, game_data)
+                except (OSError, sqlite3.Error) as e:
+                    print(f"Error: Could not save game {game_id}: {e}")
+                    with self._lock:
+                        self._in_flight.pop(game_id, None)
+                        if game_id not in self._deleted:
+                            # Ungeschriebener Stand zurück in den Cache (neuere Commits haben Vorrang)
+                            self._games.setdefault(game_id, game_data)
+                            self._dirty.add(game_id)
+                    continue
+                with self._lock:
+                    self._in_flight.pop(game_id, None)
+                    if self._games.get(game_id) is game_data:
+                        self._stamps[game_id] = stamp
+            return len(pending)
+
+    # ===== HINTERGRUND-THREAD =====
+
+    def start(self):
+        """Startet den Write-Behind Thread"""
+        if self._running or not self.write_behind:
+            return
+        self._running = True
+        self._flush_thread = threading.Thread(target=self._flush_loop,
+                                              name="game-store-flush", daemon=True)
+        self._flush_thread.start()
+
+    def close(self):
+        """Stoppt den Write-Behind Thread und schreibt alle offenen Änderungen"""
+        with self._lock:
+            self._running = False
+            self._wakeup.notify()
+        if self._flush_thread is not None:
+            self._flush_thread.join(timeout=5)
+            self._flush_thread = None
+        self.flush()
+        self.backend.close()
+
+    def _flush_loop(self):
+        while True:
+            with self._lock:
+                if self._running and len(self._dirty) < self.batch_size:
+                    self._wakeup.wait(self.flush_interval)
+                if not self._running:
+                    return
+            self.flush()
+
+    # ===== INTERNE HILFSFUNKTIONEN =====
+
+    def _commit(self, game_id, game_data):
+        """Übernimmt einen neuen Stand - nur unter locked(game_id) aufrufen"""
+        game_data["version"] = game_data.get("version", 0) + 1
+        with self._lock:
+            self._games[game_id] = game_data
+            self._games.move_to_end(game_id)
+            self._deleted.discard(game_id)
+            self._dirty.add(game_id)
+            if len(self._dirty) >= self.batch_size:
+                self._wakeup.notify()
+            self._evict()
+            self._notify(game_id)
+
+        self._call_listeners(game_id, game_data)
+
+        if not self.write_behind or not self._running:
+            self.flush()
+
+    def _call_listeners(self, game_id, game_data):
+        for fn in self._listeners:
+            try:
+                fn(game_id, game_data)
+            except Exception as e:
+                print(f"Error: Game store listener failed for {game_id}: {e}")
+
+    def _notify(self, game_id):
+        """Weckt wartende Leser eines Spiels - nur unter self._lock aufrufen"""
+        changed = self._changed.get(game_id)
+        if changed is not None:
+            changed.notify_all()
+
+    def _stat(self, game_id):
+        return self.backend.stamp(game_id)
+
+    def _is_current(self, game_id, stamp):
+        """Prüft ob der gecachte Stand noch dem Backend entspricht"""
+        if not self.multi_process or game_id in self._dirty or game_id in self._in_flight:
+            return True
+        return stamp is not None and self._stamps.get(game_id) == stamp
+
+    def _drop_game_lock(self, game_id):
+        """Entfernt einen unbenutzten Spiel-Lock - nur unter self._lock aufrufen"""
+        entry = self._game_locks.get(game_id)
+        if entry is not None and entry[1] == 0:
+            del self._game_locks[game_id]
+
+    def _evict(self):
+        """Verdrängt die am längsten unbenutzten, bereits gespeicherten Spiele
+
+        Geänderte und gerade geschriebene (in flight) Spiele bleiben im Cache.
+        """
+        overflow = len(self._games) - self.max_cached_games
+        if overflow <= 0:
+            return
+        for game_id in list(self._games.keys()):
+            if overflow <= 0:
+                break
+            if game_id not in self._dirty and game_id not in self._in_flight:
+                del self._games[game_id]
+                self._stamps.pop(game_id, None)
+                self._drop_game_lock(game_id)
+                overflow -= 1
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_game_store():
+    """Gibt die prozessweite GameStore-Instanz zurück"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = GameStore(
+                    backend=create_backend(STORE_SETTINGS, DATA_DIR),
+                    write_behind=STORE_SETTINGS['write_behind'],
+                    flush_interval=STORE_SETTINGS['flush_interval_seconds'],
+                    batch_size=STORE_SETTINGS['flush_batch_size'],
+                    max_cached_games=STORE_SETTINGS['max_cached_games'],
+                    multi_process=STORE_SETTINGS['multi_process'],
+                    fsync_writes=STORE_SETTINGS['fsync_writes'],
+                )
+                store.start()
+                atexit.register(store.close)
+                _store = store
+    return _store
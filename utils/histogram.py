@@ -0,0 +1,115 @@
+# histogram.py - Histogramme mit festen Buckets (HDR-Stil)
+"""
+Log-lineare Buckets: jede Zweierpotenz zwischen lowest und highest wird in
+precision gleich breite Teile zerlegt. Der Speicher ist fest (ein Zähler pro
+Bucket), der relative Fehler eines Perzentils liegt unter 1/precision -
+bei precision=16 also unter ~6%, egal ob 50 ms oder 50 Minuten.
+"""
+
+import math
+import threading
+
+
+class Histogram:
+    """Zählt Werte (z.B. Sekunden) in festen Buckets, thread-sicher"""
+
+    def __init__(self, lowest=0.01, highest=86400.0, precision=16):
+        self.lowest = lowest
+        self.highest = highest
+        self.precision = precision
+        self.octaves = max(1, math.ceil(math.log2(highest / lowest)))
+
+        # Index 0: < lowest, letzter Index: >= highest
+        self.counts = [0] * (self.octaves * precision + 2)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    def _index(self, value):
+        if value < self.lowest:
+            return 0
+        mantissa, exponent = math.frexp(value / self.lowest)  # value/lowest = m * 2^e, m in [0.5, 1)
+        octave = exponent - 1
+        if octave >= self.octaves:
+            return len(self.counts) - 1
+        sub = int((mantissa * 2 - 1) * self.precision)
+        return 1 + octave * self.precision + sub
+
+    def upper_bound(self, index):
+        """Obere Grenze eines Buckets (für Perzentile und Prometheus 'le')"""
+        if index == 0:
+            return self.lowest
+        if index >= len(self.counts) - 1:
+            return math.inf
+        octave, sub = divmod(index - 1, self.precision)
+        return self.lowest * (2 ** octave) * (1 + (sub + 1) / self.precision)
+
+    def record(self, value, count=1):
+        if value is None or value < 0:
+            return
+        index = self._index(value)
+        with self._lock:
+            self.counts[index] += count
+            self.count += count
+            self.total += value * count
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, p):
+        """Wert unter dem p Prozent der Messungen liegen (None ohne Messungen)"""
+        with self._lock:
+            if not self.count:
+                return None
+            target = max(1, math.ceil(self.count * p / 100))
+            seen = 0
+            for index, n in enumerate(self.counts):
+                seen += n
+                if seen >= target:
+                    return min(self.upper_bound(index), self.max)
+        return self.max
+
+    def buckets(self):
+        """[(obere Grenze, Anzahl)] der belegten Buckets"""
+        with self._lock:
+            return [(self.upper_bound(i), n) for i, n in enumerate(self.counts) if n]
+
+    def summary(self):
+        """Kennzahlen für Templates und JSON-APIs"""
+        with self._lock:
+            count, total, vmin, vmax = self.count, self.total, self.min, self.max
+
+        return {
+            'count': count,
+            'mean': round(total / count, 3) if count else None,
+            'min': vmin,
+            'max': vmax,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+        }
+
+    def to_dict(self):
+        """Kompakte Form für Snapshots: nur belegte Buckets"""
+        with self._lock:
+            return {
+                'lowest': self.lowest,
+                'highest': self.highest,
+                'precision': self.precision,
+                'counts': {str(i): n for i, n in enumerate(self.counts) if n},
+                'total': self.total,
+                'min': self.min,
+                'max': self.max,
+            }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data['lowest'], data['highest'], data['precision'])
+        for index, n in data.get('counts', {}).items():
+            histogram.counts[int(index)] = n
+            histogram.count += n
+        histogram.total = data.get('total', 0.0)
+        histogram.min = data.get('min')
+        histogram.max = data.get('max')
+        return histogram
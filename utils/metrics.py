@@ -0,0 +1,160 @@
+# metrics.py - Request- und I/O-Metriken im Prometheus-Textformat
+"""
+Misst pro Flask-Endpoint Anzahl und Latenz der Requests sowie die Spielstand-
+I/O der Storage-Backends (json load/dump, gelesene/geschriebene Bytes).
+Die I/O wird dem Endpoint zugeordnet, in dessen Request sie passiert -
+Write-Behind-Flushes im Hintergrund laufen unter endpoint="background".
+
+Bewusst ohne prometheus_client: ein Lock, ein paar dict-Zugriffe und ein
+bisect pro Request. Zusätzliche Werte (aktive Spiele, wartende Long-Poll-
+Clients) werden erst beim Abruf von /metrics über Gauge-Callbacks gelesen.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, request
+
+# Latenz-Buckets in Sekunden (obere Grenzen, 'le')
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+BACKGROUND = "background"
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+
+class Metrics:
+    """Prozessweite Zähler, Histogramme und Gauges"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        self._requests = {}          # (endpoint, method, status) -> Anzahl
+        self._latency = {}           # endpoint -> [bucket counts..., +Inf, sum]
+        self._io = {}                # (endpoint, op) -> [Anzahl, Bytes]
+        self._gauges = {}            # name -> (help, callback)
+
+    # ===== REQUESTS =====
+
+    def current_endpoint(self):
+        return getattr(self._local, "endpoint", None) or BACKGROUND
+
+    def start_request(self, endpoint):
+        self._local.endpoint = endpoint or "unmatched"
+
+    def clear_request(self):
+        self._local.endpoint = None
+
+    def finish_request(self, method, status, seconds):
+        endpoint = self.current_endpoint()
+
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            key = (endpoint, method, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+            latency = self._latency.get(endpoint)
+            if latency is None:
+                latency = self._latency[endpoint] = [0] * (len(self.buckets) + 1) + [0.0]
+            latency[index] += 1
+            latency[-1] += seconds
+
+    # ===== STORAGE-I/O =====
+
+    def record_io(self, op, nbytes):
+        """Ein json load ('read') oder dump ('write') mit nbytes Bytes"""
+        key = (self.current_endpoint(), op)
+        with self._lock:
+            entry = self._io.get(key)
+            if entry is None:
+                entry = self._io[key] = [0, 0]
+            entry[0] += 1
+            entry[1] += nbytes
+
+    # ===== GAUGES =====
+
+    def gauge(self, name, help_text, callback):
+        """Registriert einen Wert, der erst beim Scrape per callback() gelesen wird"""
+        self._gauges[name] = (help_text, callback)
+
+    # ===== EXPOSITION =====
+
+    def render(self):
+        """Alle Metriken im Prometheus-Textformat (Version 0.0.4)"""
+        with self._lock:
+            requests = dict(self._requests)
+            latency = {endpoint: list(values) for endpoint, values in self._latency.items()}
+            io = {key: list(values) for key, values in self._io.items()}
+
+        lines = [
+            "# HELP suswords_http_requests_total HTTP requests by endpoint, method and status.",
+            "# TYPE suswords_http_requests_total counter",
+        ]
+        for (endpoint, method, status), count in sorted(requests.items()):
+            lines.append(f"suswords_http_requests_total{_labels(endpoint=endpoint, method=method, status=status)} {count}")
+
+        lines += [
+            "# HELP suswords_http_request_duration_seconds Time until the response is returned by the view.",
+            "# TYPE suswords_http_request_duration_seconds histogram",
+        ]
+        for endpoint, values in sorted(latency.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), values):
+                cumulative += count
+                lines.append(f"suswords_http_request_duration_seconds_bucket{_labels(endpoint=endpoint, le=bound)} {cumulative}")
+            lines.append(f"suswords_http_request_duration_seconds_sum{_labels(endpoint=endpoint)} {values[-1]:.6f}")
+            lines.append(f"suswords_http_request_duration_seconds_count{_labels(endpoint=endpoint)} {cumulative}")
+
+        for op, verb in (("read", "json.load"), ("write", "json.dump")):
+            lines += [
+                f"# HELP suswords_store_{op}s_total Game documents parsed/serialized ({verb}) by endpoint.",
+                f"# TYPE suswords_store_{op}s_total counter",
+            ]
+            lines += [f"suswords_store_{op}s_total{_labels(endpoint=endpoint)} {values[0]}"
+                      for (endpoint, key_op), values in sorted(io.items()) if key_op == op]
+            lines += [
+                f"# HELP suswords_store_{op}_bytes_total Bytes of game documents {op} by endpoint.",
+                f"# TYPE suswords_store_{op}_bytes_total counter",
+            ]
+            lines += [f"suswords_store_{op}_bytes_total{_labels(endpoint=endpoint)} {values[1]}"
+                      for (endpoint, key_op), values in sorted(io.items()) if key_op == op]
+
+        for name, (help_text, callback) in sorted(self._gauges.items()):
+            try:
+                value = callback()
+            except Exception as e:
+                print(f"Warning: Metric {name} failed: {e}")
+                continue
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+def install_request_hooks(app, registry=metrics):
+    """before/after_request-Hooks für Request-Anzahl und Latenz"""
+
+    @app.before_request
+    def _metrics_start():
+        g._metrics_started = time.perf_counter()
+        registry.start_request(request.endpoint)
+
+    @app.after_request
+    def _metrics_finish(response):
+        started = g.pop("_metrics_started", None)
+        if started is not None:
+            registry.finish_request(request.method, response.status_code,
+                                    time.perf_counter() - started)
+        return response
+
+    @app.teardown_request
+    def _metrics_teardown(exc):
+        # Auch nach unbehandelten Fehlern: folgende I/O nicht diesem Request zuordnen
+        registry.clear_request()
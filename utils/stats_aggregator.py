@@ -0,0 +1,294 @@
+# stats_aggregator.py - Inkrementelle Spielstatistiken für SusWords
+"""
+Hält die Zähler für /stats und /debug/stats im Speicher aktuell, statt bei
+jedem Aufruf alle Spiele zu lesen. Der Game Store meldet jeden Commit, der
+Aggregator zieht den alten Stand des Spiels von den Zählern ab und addiert
+den neuen. Ein kompakter Snapshot auf der Platte erspart beim Neustart den
+kompletten Scan - neu aufgebaut wird nur nach einem Absturz.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+
+from config import STATS_SETTINGS, STATS_SNAPSHOT_PATH, STORE_SETTINGS
+from core import stats_engine
+from core.phase_metrics import PhaseMetrics
+from core.stats_engine import ACTIVE_STATUSES, STATUS
+from utils.game_store import get_game_store
+
+SNAPSHOT_FORMAT = 2
+
+
+class StatsAggregator:
+    """Laufende Zähler über alle Spiele
+
+    Hält pro Spiel einen Record (siehe core.stats_engine) und dieselben
+    totals/daily-Buckets, die stats_engine.aggregate() aus einem Scan liefert.
+    """
+
+    def __init__(self, store, snapshot_path, save_interval=30, rebuild_interval=None, phases=None):
+        self.store = store
+        self.phases = phases or PhaseMetrics()
+        self.snapshot_path = snapshot_path
+        self.save_interval = save_interval
+        self.rebuild_interval = rebuild_interval
+
+        self._lock = threading.Lock()
+        self._records = {}           # game_id -> record
+        self._activity = {}          # game_id -> letzte Änderung (nur aktive Spiele)
+        self._totals = stats_engine.empty_totals()
+        self._daily = {}
+        self._dirty = False
+        self._touched = None         # während rebuild(): per Commit aktualisierte IDs
+        self._last_rebuild = 0
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ===== ZÄHLER =====
+
+    def _set(self, game_id, record, updated_at):
+        """Ersetzt den Stand eines Spiels (None = gelöscht) - nur unter self._lock"""
+        old = self._records.get(game_id)
+        if old != record:
+            if old is not None:
+                stats_engine.apply_record(self._totals, self._daily, old, -1)
+            if record is not None:
+                stats_engine.apply_record(self._totals, self._daily, record, 1)
+                self._records[game_id] = record
+            else:
+                self._records.pop(game_id, None)
+            self._dirty = True
+
+        if record is not None and record[STATUS] in ACTIVE_STATUSES:
+            self._activity[game_id] = updated_at
+        else:
+            self._activity.pop(game_id, None)
+
+    def on_commit(self, game_id, game_data):
+        """Listener für den Game Store: create, start, Ende, abandoned, delete"""
+        self.phases.observe(game_id, game_data)
+
+        with self._lock:
+            self._dirty = True  # mindestens die Phasen-Histogramme haben sich geändert
+            if self._touched is not None:
+                self._touched.add(game_id)
+
+            if game_data is None:
+                self._set(game_id, None, None)
+                return
+
+            record = stats_engine.record_from_game(game_data, self._records.get(game_id))
+            self._set(game_id, record, game_data.get('last_activity') or time.time())
+
+    # ===== AUFBAU & SNAPSHOT =====
+
+    def rebuild(self):
+        """Baut alle Zähler mit einem Scan (stats_engine.scan) neu auf
+
+        Schlägt der Scan fehl, bleiben die bisherigen Zähler stehen (False).
+        """
+        with self._lock:
+            self._touched = set()
+
+        try:
+            table = stats_engine.scan(self.store)
+        except Exception as e:
+            with self._lock:
+                self._touched = None
+            print(f"Warning: Stats rebuild failed: {e}")
+            return False
+
+        with self._lock:
+            touched, self._touched = self._touched, None
+            records = {gid: self._records[gid] for gid in touched if gid in self._records}
+            activity = {gid: self._activity[gid] for gid in touched if gid in self._activity}
+
+            self._records = {}
+            self._activity = {}
+            self._totals = stats_engine.empty_totals()
+            self._daily = {}
+
+            for game_id, record, updated_at in table.records():
+                if game_id in touched:
+                    continue  # während des Scans geändert - Listener-Stand ist neuer
+                self._set(game_id, record, updated_at)
+
+            for game_id, record in records.items():
+                self._set(game_id, record, activity.get(game_id, time.time()))
+
+            self._dirty = True
+            self._last_rebuild = time.time()
+        return True
+
+    def load_snapshot(self):
+        """Lädt den Snapshot - nur wenn er beim letzten Beenden sauber geschrieben wurde"""
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if snapshot.get('format') != SNAPSHOT_FORMAT:
+            return False
+
+        # Phasen-Histogramme lassen sich nicht aus dem Store rekonstruieren -
+        # auch aus einem unsauberen Snapshot übernehmen (max. save_interval fehlt)
+        self.phases.load(snapshot.get('phases') or {})
+
+        if not snapshot.get('clean'):
+            return False
+
+        with self._lock:
+            self._records = {}
+            self._activity = {}
+            self._totals = stats_engine.empty_totals()
+            self._daily = {}
+            for game_id, (record, updated_at) in snapshot.get('games', {}).items():
+                self._set(game_id, tuple(record), updated_at)
+            self._dirty = False
+        return True
+
+    def save_snapshot(self, clean=False):
+        """Schreibt den Snapshot atomar; clean=True nur beim geordneten Beenden"""
+        with self._lock:
+            games = {}
+            for game_id, record in self._records.items():
+                games[game_id] = [record, self._activity.get(game_id, 0)]
+            self._dirty = False
+
+        snapshot = {
+            'format': SNAPSHOT_FORMAT,
+            'clean': clean,
+            'saved_at': time.time(),
+            'games': games,
+            'phases': self.phases.to_dict(),
+        }
+
+        tmp_path = f"{self.snapshot_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, separators=(',', ':'))
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            with self._lock:
+                self._dirty = True
+            print(f"Warning: Could not save stats snapshot: {e}")
+
+    # ===== HINTERGRUND-THREAD =====
+
+    def start(self):
+        """Snapshot laden (oder neu aufbauen) und Listener registrieren"""
+        self.store.add_listener(self.on_commit)
+
+        if self.load_snapshot():
+            # Ab jetzt gilt der Snapshot als unsauber bis zum geordneten close()
+            self.save_snapshot(clean=False)
+        elif self.rebuild():
+            self.save_snapshot(clean=False)
+
+        self._thread = threading.Thread(target=self._run, name="stats-aggregator", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stoppt den Thread und schreibt den Snapshot als sauber"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.save_snapshot(clean=True)
+
+    def _run(self):
+        while not self._stop.wait(self.save_interval):
+            try:
+                # Andere Worker-Prozesse melden ihre Commits nicht hierher
+                if self.rebuild_interval and time.time() - self._last_rebuild >= self.rebuild_interval:
+                    self.rebuild()
+                if self._dirty:
+                    self.save_snapshot(clean=False)
+            except Exception as e:
+                print(f"Warning: Stats aggregator update failed: {e}")
+
+    # ===== ABFRAGEN (O(1) bzw. O(Tage)) =====
+
+    def timeline(self, days=30):
+        """Timeline der letzten days Tage aus den Tages-Buckets"""
+        with self._lock:
+            return stats_engine.timeline(self._daily, days)
+
+    def totals(self):
+        """Kopie der globalen Zähler"""
+        with self._lock:
+            return dict(self._totals)
+
+    def daily_buckets(self):
+        """Kopie der Tages-Buckets {'YYYY-MM-DD': {Feld: n}} (siehe BUCKET_FIELDS)"""
+        with self._lock:
+            return {day: dict(bucket) for day, bucket in self._daily.items()}
+
+    def phase_stats(self):
+        """Histogramm-Kennzahlen der Spielphasen (siehe core/phase_metrics)"""
+        return self.phases.summary()
+
+    def cleanup_stats(self, now=None):
+        """Cleanup-Statistiken - iteriert nur über die aktiven Spiele"""
+        now = now or time.time()
+        games_by_age = {'<1h': 0, '1-6h': 0, '6-24h': 0, '>24h': 0}
+        abandoned_candidates = 0
+
+        with self._lock:
+            activity = list(self._activity.values())
+            totals = dict(self._totals)
+
+        for updated_at in activity:
+            hours_since = (now - (updated_at or 0)) / 3600
+            if hours_since > 24:
+                abandoned_candidates += 1
+                games_by_age['>24h'] += 1
+            elif hours_since > 6:
+                games_by_age['6-24h'] += 1
+            elif hours_since > 1:
+                games_by_age['1-6h'] += 1
+            else:
+                games_by_age['<1h'] += 1
+
+        return {
+            'total_games': totals['total_games'],
+            'active_games': len(activity),
+            'abandoned_candidates': abandoned_candidates,
+            'already_abandoned': totals['already_abandoned'],
+            'games_by_age': games_by_age,
+        }
+
+
+_aggregator = None
+_aggregator_lock = threading.Lock()
+
+def get_stats_aggregator():
+    """Gibt die prozessweite StatsAggregator-Instanz zurück"""
+    global _aggregator
+    if _aggregator is None:
+        with _aggregator_lock:
+            if _aggregator is None:
+                rebuild_interval = None
+                if STORE_SETTINGS['multi_process']:
+                    rebuild_interval = STATS_SETTINGS['aggregator_rebuild_seconds']
+
+                aggregator = StatsAggregator(
+                    get_game_store(),
+                    STATS_SNAPSHOT_PATH,
+                    save_interval=STATS_SETTINGS['snapshot_interval_seconds'],
+                    rebuild_interval=rebuild_interval,
+                    phases=PhaseMetrics(
+                        track_game_duration=STATS_SETTINGS['track_game_duration'],
+                        track_vote_outcomes=STATS_SETTINGS['track_vote_outcomes'],
+                    ),
+                )
+                aggregator.start()
+                atexit.register(aggregator.close)
+                _aggregator = aggregator
+    return _aggregator
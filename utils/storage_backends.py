@@ -0,0 +1,556 @@
+# storage_backends.py - Persistenz-Backends für den Game Store
+"""
+Austauschbare Speicher-Backends hinter utils/game_store.py:
+
+- JsonFileBackend: ein JSON-Dokument pro Spiel in games/<id>.json
+- SqliteBackend:   eine SQLite-Datenbank (WAL) mit indizierten Spalten
+                   und dem kompletten Spiel als JSON-Dokument
+- EventLogBackend: pro Spiel ein Append-only Log der Änderungen
+                   (games/<id>.log) plus periodischer Snapshot
+
+Jedes Backend liefert neben den Dokumenten kompakte Zusammenfassungen
+(summaries), damit Stats und Cleanup nicht jedes Spiel parsen müssen.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from utils import event_log
+from utils.metrics import metrics
+
+
+def summarize_game(game_id, game_data, created_at=None, updated_at=None):
+    """Erstellt die kompakte Zusammenfassung eines Spiels"""
+    return {
+        "id": game_id,
+        "status": game_data.get("status"),
+        "winner": game_data.get("winner"),
+        "end_reason": game_data.get("end_reason"),
+        "player_count": len(game_data.get("players") or {}),
+        "created_at": game_data.get("created_at") or created_at,
+        "finished_at": game_data.get("finished_at"),
+        # Letzte Spieler-Aktivität (core/lifecycle), sonst Schreibzeitpunkt
+        "updated_at": game_data.get("last_activity") or updated_at,
+    }
+
+
+def _matches(summary, statuses, updated_before):
+    if statuses is not None and summary["status"] not in statuses:
+        return False
+    if updated_before is not None and (summary["updated_at"] or 0) >= updated_before:
+        return False
+    return True
+
+
+class JsonFileBackend:
+    """Ein JSON-Dokument pro Spiel in games/<id>.json"""
+
+    name = "json"
+
+    def __init__(self, data_dir, fsync_writes=False):
+        self.data_dir = data_dir
+        self.fsync_writes = fsync_writes
+        os.makedirs(self.data_dir, exist_ok=True)
+
+    def read(self, game_id):
+        """Gibt (game_data, stamp) zurück oder (None, None)"""
+        try:
+            with open(self._path(game_id), "rb") as f:
+                st = os.fstat(f.fileno())
+                raw = f.read()
+            metrics.record_io("read", len(raw))
+            game_data = json.loads(raw)
+        except FileNotFoundError:
+            return None, None
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid JSON in game {game_id}: {e}")
+        return game_data, (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def stamp(self, game_id):
+        """Günstiger Änderungsstempel für den Cache-Abgleich"""
+        try:
+            st = os.stat(self._path(game_id))
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def write(self, game_id, game_data):
+        """Schreibt atomar: Temp-Datei im selben Verzeichnis, dann rename"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.data_dir, prefix=f".{game_id}.", suffix=".tmp")
+        try:
+            raw = json.dumps(game_data).encode("utf-8")
+            metrics.record_io("write", len(raw))
+            with os.fdopen(fd, "wb") as f:
+                f.write(raw)
+                f.flush()
+                if self.fsync_writes:
+                    os.fsync(f.fileno())
+                st = os.fstat(f.fileno())
+            os.replace(tmp_path, self._path(game_id))
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def delete(self, game_id):
+        try:
+            os.remove(self._path(game_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def exists(self, game_id):
+        return os.path.exists(self._path(game_id))
+
+    def list_ids(self):
+        try:
+            return [filename[:-5] for filename in os.listdir(self.data_dir)
+                    if filename.endswith('.json')]
+        except OSError as e:
+            print(f"Error listing games: {e}")
+            return []
+
+    def summary(self, game_id):
+        game_data, _ = self.read(game_id)
+        if game_data is None:
+            return None
+        return self._summarize_file(game_id, game_data)
+
+    def summaries(self, statuses=None, updated_before=None):
+        """Zusammenfassungen aller Spiele (ohne Index: parst jede Datei)"""
+        result = []
+        for game_id in self.list_ids():
+            try:
+                summary = self.summary(game_id)
+            except (ValueError, OSError) as e:
+                print(f"Warning: Could not load game {game_id}: {e}")
+                continue
+            if summary is not None and _matches(summary, statuses, updated_before):
+                result.append(summary)
+        return result
+
+    def close(self):
+        pass
+
+    def _path(self, game_id):
+        return os.path.join(self.data_dir, f"{game_id}.json")
+
+    def _summarize_file(self, game_id, game_data):
+        if game_data.get("created_at") and game_data.get("last_activity"):
+            # Zeitstempel im Dokument - kein stat() nötig
+            return summarize_game(game_id, game_data)
+        try:
+            st = os.stat(self._path(game_id))
+            created, modified = st.st_ctime, st.st_mtime
+        except OSError:
+            created = modified = time.time()
+        return summarize_game(game_id, game_data,
+                              created_at=min(created, modified), updated_at=modified)
+
+
+class SqliteBackend:
+    """Alle Spiele in einer SQLite-Datenbank im WAL-Modus"""
+
+    name = "sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS games (
+            id TEXT PRIMARY KEY,
+            status TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            player_count INTEGER NOT NULL DEFAULT 0,
+            rev INTEGER NOT NULL DEFAULT 1,
+            doc TEXT NOT NULL  -- komplettes Spiel als JSON
+        );
+        CREATE INDEX IF NOT EXISTS idx_games_status ON games(status);
+        CREATE INDEX IF NOT EXISTS idx_games_created_at ON games(created_at);
+        CREATE INDEX IF NOT EXISTS idx_games_updated_at ON games(updated_at);
+        CREATE INDEX IF NOT EXISTS idx_games_player_count ON games(player_count);
+    """
+
+    def __init__(self, db_path, fsync_writes=False):
+        self.db_path = db_path
+        self.fsync_writes = fsync_writes
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn().executescript(self.SCHEMA)
+
+    def read(self, game_id):
+        row = self._conn().execute(
+            "SELECT doc, rev, updated_at FROM games WHERE id = ?", (game_id,)).fetchone()
+        if row is None:
+            return None, None
+        metrics.record_io("read", len(row[0]))
+        try:
+            return json.loads(row[0]), (row[1], row[2])
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in game {game_id}: {e}")
+
+    def stamp(self, game_id):
+        row = self._conn().execute(
+            "SELECT rev, updated_at FROM games WHERE id = ?", (game_id,)).fetchone()
+        return tuple(row) if row else None
+
+    def write(self, game_id, game_data, updated_at=None):
+        # updated_at = letzte Aktivität, damit der Cleanup-Index dazu passt
+        now = updated_at or game_data.get("last_activity") or time.time()
+        doc = json.dumps(game_data)
+        metrics.record_io("write", len(doc))
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                """INSERT INTO games (id, status, created_at, updated_at, player_count, doc)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(id) DO UPDATE SET
+                       status = excluded.status,
+                       updated_at = excluded.updated_at,
+                       player_count = excluded.player_count,
+                       rev = games.rev + 1,
+                       doc = excluded.doc""",
+                (game_id, game_data.get("status"), game_data.get("created_at") or now, now,
+                 len(game_data.get("players") or {}), doc))
+            row = conn.execute(
+                "SELECT rev, updated_at FROM games WHERE id = ?", (game_id,)).fetchone()
+        return tuple(row)
+
+    def delete(self, game_id):
+        conn = self._conn()
+        with conn:
+            return conn.execute("DELETE FROM games WHERE id = ?", (game_id,)).rowcount > 0
+
+    def exists(self, game_id):
+        return self.stamp(game_id) is not None
+
+    def list_ids(self):
+        return [row[0] for row in self._conn().execute("SELECT id FROM games")]
+
+    def summary(self, game_id):
+        rows = self._query_summaries("WHERE id = ?", (game_id,))
+        return rows[0] if rows else None
+
+    def summaries(self, statuses=None, updated_before=None):
+        """Zusammenfassungen über die indizierten Spalten"""
+        clauses, params = [], []
+        if statuses is not None:
+            clauses.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params.extend(statuses)
+        if updated_before is not None:
+            clauses.append("updated_at < ?")
+            params.append(updated_before)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query_summaries(where, params)
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _query_summaries(self, where, params):
+        rows = self._conn().execute(
+            f"""SELECT id, status, json_extract(doc, '$.winner'), json_extract(doc, '$.end_reason'),
+                       player_count, created_at, updated_at, json_extract(doc, '$.finished_at')
+                FROM games {where}""", params).fetchall()
+        return [{
+            "id": row[0],
+            "status": row[1],
+            "winner": row[2],
+            "end_reason": row[3],
+            "player_count": row[4],
+            "created_at": row[5],
+            "finished_at": row[7],
+            "updated_at": row[6],
+        } for row in rows]
+
+    def _conn(self):
+        """Eine Verbindung pro Thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={'FULL' if self.fsync_writes else 'NORMAL'}")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+
+class EventLogBackend:
+    """Append-only Ereignis-Log pro Spiel in games/<id>.log
+
+    Jedes write() hängt nur die Änderung gegenüber dem zuletzt geschriebenen
+    Stand als eine JSON-Zeile an (siehe utils/event_log.py) - die Kosten
+    wachsen nicht mehr mit der Länge der History. Der Stand ist der Fold über
+    das Log; alle snapshot_interval Ereignisse wird er zusätzlich als
+    games/<id>.snap gespeichert, damit read() nur den Rest nachspielt.
+
+    Das Log bleibt vollständig (Audit-Trail, siehe events() und replay()).
+    Mit Write-Behind fasst ein Ereignis alle Commits seit dem letzten Flush
+    zusammen; ein Ereignis pro Mutation gibt es mit write_behind=False.
+    Ein beim Absturz halb geschriebenes Ende wird beim Lesen ignoriert und
+    vor dem nächsten Anhängen abgeschnitten.
+    """
+
+    name = "eventlog"
+
+    def __init__(self, data_dir, snapshot_interval=50, fsync_writes=False, max_cached_games=2000):
+        self.data_dir = data_dir
+        self.snapshot_interval = snapshot_interval
+        self.fsync_writes = fsync_writes
+        self.max_cached_games = max_cached_games
+        # game_id -> (Stand, seq, Stempel) des zuletzt gelesenen/geschriebenen Stands
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(self.data_dir, exist_ok=True)
+
+    def read(self, game_id):
+        """Gibt (game_data, stamp) zurück oder (None, None)
+
+        game_data ist nur lesend zu verwenden - es dient dem nächsten
+        write() als Vergleichsstand.
+        """
+        cached = self._cached(game_id)
+        if cached is not None and cached[2] == self.stamp(game_id):
+            return cached[0], cached[2]
+
+        state, seq, stamp = self._load(game_id)
+        if state is None:
+            return None, None
+        self._remember(game_id, state, seq, stamp)
+        return state, stamp
+
+    def stamp(self, game_id):
+        """(Inode, Größe) des Logs - es wird nur angehängt"""
+        try:
+            st = os.stat(self._path(game_id))
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size)
+
+    def write(self, game_id, game_data):
+        """Hängt die Änderung gegenüber dem letzten Stand an das Log an"""
+        cached = self._cached(game_id)
+        if cached is None or cached[2] != self.stamp(game_id):
+            cached = self._load(game_id)
+        previous, seq, stamp = cached
+
+        if previous is None:
+            ops, types = [["s", [], game_data]], event_log.classify(None, created=True)
+        else:
+            ops = event_log.diff(previous, game_data)
+            if not ops:
+                return stamp
+            types = event_log.classify(ops)
+
+        seq += 1
+        event = {"seq": seq, "at": time.time(), "types": types, "ops": ops}
+        raw = (json.dumps(event) + "\n").encode("utf-8")
+        metrics.record_io("write", len(raw))
+
+        fd = os.open(self._path(game_id), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            if stamp is not None and os.fstat(fd).st_size > stamp[1]:
+                os.ftruncate(fd, stamp[1])  # halb geschriebenes Ende verwerfen
+            os.write(fd, raw)
+            if self.fsync_writes:
+                os.fsync(fd)
+            st = os.fstat(fd)
+        finally:
+            os.close(fd)
+
+        stamp = (st.st_ino, st.st_size)
+        if seq % self.snapshot_interval == 0:
+            self._write_snapshot(game_id, game_data, seq, st.st_size)
+        self._remember(game_id, game_data, seq, stamp)
+        return stamp
+
+    def delete(self, game_id):
+        with self._lock:
+            self._states.pop(game_id, None)
+        try:
+            os.remove(self._snapshot_path(game_id))
+        except FileNotFoundError:
+            pass
+        try:
+            os.remove(self._path(game_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def exists(self, game_id):
+        return os.path.exists(self._path(game_id))
+
+    def list_ids(self):
+        try:
+            return [filename[:-4] for filename in os.listdir(self.data_dir)
+                    if filename.endswith('.log')]
+        except OSError as e:
+            print(f"Error listing games: {e}")
+            return []
+
+    def summary(self, game_id):
+        game_data, _ = self.read(game_id)
+        if game_data is None:
+            return None
+        if game_data.get("created_at") and game_data.get("last_activity"):
+            return summarize_game(game_id, game_data)
+        try:
+            st = os.stat(self._path(game_id))
+            created, modified = st.st_ctime, st.st_mtime
+        except OSError:
+            created = modified = time.time()
+        return summarize_game(game_id, game_data,
+                              created_at=min(created, modified), updated_at=modified)
+
+    def summaries(self, statuses=None, updated_before=None):
+        """Zusammenfassungen aller Spiele (ohne Index: Fold über jedes Log)"""
+        result = []
+        for game_id in self.list_ids():
+            try:
+                summary = self.summary(game_id)
+            except (ValueError, OSError) as e:
+                print(f"Warning: Could not load game {game_id}: {e}")
+                continue
+            if summary is not None and _matches(summary, statuses, updated_before):
+                result.append(summary)
+        return result
+
+    def close(self):
+        with self._lock:
+            self._states.clear()
+
+    # ===== AUDIT-TRAIL =====
+
+    def events(self, game_id):
+        """Alle Ereignisse eines Spiels in Reihenfolge (ohne halb geschriebenes Ende)"""
+        try:
+            with open(self._path(game_id), "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    yield self._parse(game_id, line)
+        except FileNotFoundError:
+            return
+
+    def replay(self, game_id, until_seq=None):
+        """Stand eines Spiels nach Ereignis until_seq (Standard: alle), None ohne Log"""
+        state = None
+        for event in self.events(game_id):
+            if until_seq is not None and event["seq"] > until_seq:
+                break
+            state = event_log.apply(state, event["ops"])
+        return state
+
+    # ===== INTERNE HILFSFUNKTIONEN =====
+
+    def _load(self, game_id):
+        """(Stand, seq, Stempel) aus Snapshot + Rest des Logs, (None, 0, None) ohne Log"""
+        try:
+            f = open(self._path(game_id), "rb")
+        except FileNotFoundError:
+            return None, 0, None
+
+        with f:
+            st = os.fstat(f.fileno())
+            state, seq, offset = None, 0, 0
+            snapshot = self._read_snapshot(game_id)
+            if snapshot is not None and snapshot["offset"] <= st.st_size:
+                state, seq, offset = snapshot["state"], snapshot["seq"], snapshot["offset"]
+                f.seek(offset)
+
+            replayed = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                event = self._parse(game_id, line)
+                state = event_log.apply(state, event["ops"])
+                seq = event["seq"]
+                replayed += len(line)
+            metrics.record_io("read", replayed)
+
+        # Stempel = gelesene Bytes, nicht Dateigröße: ein paralleles Anhängen
+        # darf nicht als bereits bekannt gelten
+        return state, seq, (st.st_ino, offset + replayed)
+
+    def _parse(self, game_id, line):
+        try:
+            return json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid event in game {game_id}: {e}")
+
+    def _read_snapshot(self, game_id):
+        try:
+            with open(self._snapshot_path(game_id), "rb") as f:
+                raw = f.read()
+            metrics.record_io("read", len(raw))
+            return json.loads(raw)
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            print(f"Warning: Ignoring invalid snapshot of game {game_id}: {e}")
+            return None
+
+    def _write_snapshot(self, game_id, game_data, seq, offset):
+        """Schreibt den Snapshot atomar (Temp-Datei, dann rename)"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.data_dir, prefix=f".{game_id}.", suffix=".tmp")
+        try:
+            raw = json.dumps({"seq": seq, "offset": offset, "state": game_data}).encode("utf-8")
+            metrics.record_io("write", len(raw))
+            with os.fdopen(fd, "wb") as f:
+                f.write(raw)
+                if self.fsync_writes:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self._snapshot_path(game_id))
+        except OSError as e:
+            # Ohne Snapshot wird nur länger nachgespielt
+            print(f"Warning: Could not write snapshot of game {game_id}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _cached(self, game_id):
+        with self._lock:
+            cached = self._states.get(game_id)
+            if cached is not None:
+                self._states.move_to_end(game_id)
+            return cached
+
+    def _remember(self, game_id, state, seq, stamp):
+        with self._lock:
+            current = self._states.get(game_id)
+            if current is not None and current[1] > seq:
+                return  # ein paralleles write() war schneller
+            self._states[game_id] = (state, seq, stamp)
+            self._states.move_to_end(game_id)
+            while len(self._states) > self.max_cached_games:
+                self._states.popitem(last=False)
+
+    def _path(self, game_id):
+        return os.path.join(self.data_dir, f"{game_id}.log")
+
+    def _snapshot_path(self, game_id):
+        return os.path.join(self.data_dir, f"{game_id}.snap")
+
+
+def create_backend(settings, data_dir):
+    """Erzeugt das in STORE_SETTINGS konfigurierte Backend"""
+    backend = settings.get('backend', 'json')
+    if backend == 'sqlite':
+        return SqliteBackend(settings['sqlite_path'], fsync_writes=settings.get('fsync_writes', False))
+    if backend == 'json':
+        return JsonFileBackend(data_dir, fsync_writes=settings.get('fsync_writes', False))
+    if backend == 'eventlog':
+        return EventLogBackend(data_dir, snapshot_interval=settings.get('snapshot_interval', 50),
+                               fsync_writes=settings.get('fsync_writes', False),
+                               max_cached_games=settings.get('max_cached_games', 2000))
+    raise ValueError(f"Unknown storage backend: {backend}")
@@ -0,0 +1,105 @@
+# vote_scheduler.py - Deadline-Scheduler für SusWords
+"""
+Führt Aufgaben zu einem festen Zeitpunkt in einem Hintergrund-Thread aus.
+Wird für das Beenden abgelaufener Votes verwendet, damit kein lesender
+Request mehr Spielstände schreiben muss.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+
+class DeadlineScheduler:
+    """Heap von Deadlines, pro Schlüssel (z.B. Game-ID) höchstens eine aktiv
+
+    schedule() ersetzt eine bestehende Deadline desselben Schlüssels, veraltete
+    Heap-Einträge werden beim Abarbeiten übersprungen. callback(key) läuft im
+    Scheduler-Thread und muss selbst prüfen ob noch etwas zu tun ist.
+    """
+
+    def __init__(self, callback, name="deadline-scheduler", retry_seconds=1.0):
+        self.callback = callback
+        self.name = name
+        self.retry_seconds = retry_seconds
+
+        self._heap = []              # (deadline, seq, key)
+        self._deadlines = {}         # key -> aktuelle Deadline
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread = None
+        self._running = False
+
+    def schedule(self, key, deadline):
+        """Plant callback(key) für den Unix-Zeitpunkt deadline"""
+        with self._lock:
+            self._deadlines[key] = deadline
+            heapq.heappush(self._heap, (deadline, next(self._seq), key))
+            # Nur wecken wenn die neue Deadline die nächste ist
+            if self._heap[0][2] == key:
+                self._wakeup.notify()
+
+    def cancel(self, key):
+        """Verwirft die geplante Deadline eines Schlüssels"""
+        with self._lock:
+            self._deadlines.pop(key, None)
+
+    def pending(self):
+        """Anzahl der geplanten Deadlines"""
+        with self._lock:
+            return len(self._deadlines)
+
+    def start(self):
+        """Startet den Scheduler-Thread"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stoppt den Scheduler-Thread (geplante Deadlines verfallen)"""
+        with self._lock:
+            self._running = False
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            with self._lock:
+                key = self._next_due()
+                if key is None:
+                    return
+
+            try:
+                self.callback(key)
+            except Exception as e:
+                print(f"Error: {self.name} callback for {key} failed: {e}")
+                self.schedule(key, time.time() + self.retry_seconds)
+
+    def _next_due(self):
+        """Wartet auf die nächste fällige Deadline - nur unter self._lock aufrufen"""
+        while self._running:
+            if not self._heap:
+                self._wakeup.wait()
+                continue
+
+            deadline, _, key = self._heap[0]
+            if self._deadlines.get(key) != deadline:
+                heapq.heappop(self._heap)  # ersetzt oder abgebrochen
+                continue
+
+            remaining = deadline - time.time()
+            if remaining > 0:
+                self._wakeup.wait(remaining)
+                continue
+
+            heapq.heappop(self._heap)
+            del self._deadlines[key]
+            return key
+        return None